@@ -19,7 +19,6 @@
 # ================================================================================================ #
 """Includes fixtures, classes and functions supporting testing."""
 import pytest
-from pyspark.sql import SparkSession
 from sklearn.datasets import load_iris
 
 from deepctr.dal import STAGES
@@ -27,7 +26,8 @@ from deepctr.dal.source import Source
 
 from deepctr.dal.file import File
 from deepctr.dal.context import SourceDBContext, FileDBContext
-from deepctr.data.database import ConnectionFactory, Database
+from deepctr.data.database import ConnectionFactory, ConnectionPool, Database
+from deepctr.data.local import SparkSessionProvider
 from deepctr.utils.database import parse_sql
 
 CONNECTION = {
@@ -86,8 +86,7 @@ def spark_dataframe():
     data = load_iris(return_X_y=False, as_frame=True)
     df = data["data"]
     df.columns = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
-    spark = SparkSession.builder.master("local[18]").appName("Spark DataFrame").getOrCreate()
-    spark.sparkContext.setLogLevel("ERROR")
+    spark = SparkSessionProvider().get_session()
     return spark.createDataFrame(df)
 
 
@@ -114,6 +113,13 @@ def connection():
     connection.close()
 
 
+@pytest.fixture(scope="module")
+def pool(connection):
+    pool = ConnectionPool(factory=ConnectionFactory(database="testdb"), max_size=4, timeout=1)
+    yield pool
+    pool.close()
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                         DBCONTEXTS                                               #
 # ------------------------------------------------------------------------------------------------ #
@@ -18,10 +18,13 @@
 # Copyright: (c) 2022 Bryant St. Labs                                                              #
 # ================================================================================================ #
 from abc import ABC, abstractmethod
+import json
+import hashlib
+import inspect
 from datetime import datetime
 from typing import Any
 
-from deepctr.dal.context import Context
+from deepctr.dal.context import DBContext as Context
 
 # ------------------------------------------------------------------------------------------------ #
 
@@ -29,6 +32,18 @@ from deepctr.dal.context import Context
 class Operator(ABC):
     """Abstract class for operator classes
 
+    Operators that take part in lazy planning set kind to 'source', 'transform' or 'sink'
+    and implement read, transform or write respectively, with no side effects other than
+    the read or write itself. Other operators are run eagerly, in order.
+
+    Operators that read or write local files list them in inputs and outputs, which lets a
+    TaskCache skip them when nothing has changed. Bump version when a change in behavior is
+    not visible in the operator's own source code, e.g. a change in a helper it calls.
+
+    A Checkpoint records the operators that declare outputs, since their work is done once
+    the files are written. Set checkpoint to True to also record an operator without outputs,
+    along with the data it returns, e.g. an expensive transform.
+
     Args:
         seq (int): A number, typically used to indicate the sequence of the task within a DAG
         name (str): String name
@@ -37,6 +52,10 @@ class Operator(ABC):
 
     """
 
+    kind = None
+    version = 1
+    checkpoint = False
+
     def __init__(self, seq: int, name: str, desc: str, params: dict) -> None:
         self._seq = seq
         self._name = name
@@ -46,7 +65,9 @@ class Operator(ABC):
         self._task_id = None  # This is the id assigned by the database
         self._started = None
         self._stopped = None
+        self._duration = None
         self._context = None
+        self._depends_on = None  # None runs the task after the one before it
 
     def __str__(self) -> str:
         return str(
@@ -66,6 +87,37 @@ class Operator(ABC):
     def execute(self, data: Any = None, context: Context = None) -> Any:
         pass
 
+    def inputs(self) -> list:
+        """Returns the local files and folders the task reads."""
+        return []
+
+    def outputs(self) -> list:
+        """Returns the local files and folders the task writes."""
+        return []
+
+    def fingerprint(self, inputs: dict = None, upstream: list = None) -> str:
+        """Returns a hash of everything that determines the task's outputs.
+
+        Args:
+            inputs (dict): Fingerprints of the input files, keyed by path
+            upstream (list): Fingerprints of the upstream tasks
+        """
+        try:
+            source = inspect.getsource(self.__class__)
+        except (OSError, TypeError):
+            source = None
+        content = {
+            "operator": self.__class__.__module__ + "." + self.__class__.__qualname__,
+            "version": self.version,
+            "source": source,
+            "params": self._params,
+            "inputs": inputs or {},
+            "upstream": upstream or [],
+        }
+        return hashlib.sha256(
+            json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
     @property
     def seq(self) -> int:
         return self._seq
@@ -82,22 +134,38 @@ class Operator(ABC):
     def params(self) -> Any:
         return self._params
 
+    @property
+    def depends_on(self) -> list:
+        """Sequence numbers of the tasks this task depends on, or None for the previous task."""
+        return self._depends_on
+
+    @depends_on.setter
+    def depends_on(self, depends_on: list) -> None:
+        self._depends_on = None if depends_on is None else list(depends_on)
+
     @property
     def created(self) -> datetime:
         return self._created
 
     @property
     def start(self) -> datetime:
-        return self._start
+        return self._started
 
     @property
     def stop(self) -> datetime:
-        return self._stop
+        return self._stopped
 
     @property
     def duration(self) -> datetime:
         return self._duration
 
+    def _setup(self) -> None:
+        self._started = datetime.now()
+
+    def _teardown(self) -> None:
+        self._stopped = datetime.now()
+        self._duration = self._stopped - self._started
+
     def _start(self) -> None:
         self._started = datetime.now()
         dao = self._context.task
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /cache.py                                                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 02:11:09 pm                                              #
+# Modified   : Saturday October 17th 2026 02:11:09 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Content addressed cache of task results, used to skip unchanged tasks on re-runs."""
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any
+import logging
+import logging.config
+
+from deepctr.dag.base import Operator
+from deepctr.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+def get_path_fingerprint(path: str, hash_max_size: int = 0) -> list:
+    """Returns a fingerprint of a file or folder, or None if it does not exist.
+
+    Files are fingerprinted by size and modification time, which costs one stat per file.
+    Content hashing is opt-in: files up to hash_max_size bytes are fingerprinted by content,
+    so copies and touches do not change them, at the cost of reading them. Folders, such as
+    those Spark writes, combine the fingerprints of their files.
+
+    Args:
+        path (str): Path to the file or folder
+        hash_max_size (int): Largest file hashed by content. Default = 0, no file is hashed
+    """
+    if not os.path.exists(path):
+        return None
+    if os.path.isdir(path):
+        return [
+            [os.path.relpath(os.path.join(root, name), path)]
+            + get_path_fingerprint(os.path.join(root, name), hash_max_size=hash_max_size)
+            for root, folders, names in sorted(os.walk(path))
+            for name in sorted(names)
+        ]
+    stat = os.stat(path)
+    if hash_max_size and stat.st_size <= hash_max_size:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 ** 2), b""):
+                digest.update(block)
+        return [stat.st_size, digest.hexdigest()]
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        TASK CACHE                                                #
+# ------------------------------------------------------------------------------------------------ #
+class TaskCache:
+    """Records the outputs of tasks by fingerprint, so unchanged tasks can be skipped.
+
+    A task's fingerprint combines its class, version and source code, its params, the
+    fingerprints of its input files and the fingerprints of the tasks upstream of it. After a
+    task producing output files runs, the fingerprint is recorded with the fingerprints of its
+    outputs. On a later run, a task with the same fingerprint whose outputs are unchanged is
+    skipped. Tasks without outputs are never skipped; their fingerprints flow downstream.
+
+    Args:
+        filepath (str): JSON file holding the cache. Default = '.cache/tasks.json'
+        hash_max_size (int): Largest file fingerprinted by content. Default = 0, files are
+            fingerprinted by size and modification time only
+    """
+
+    def __init__(self, filepath: str = ".cache/tasks.json", hash_max_size: int = 0):
+        self._filepath = filepath
+        self._hash_max_size = hash_max_size
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def fingerprint(self, task: Operator, upstream: list = None) -> str:
+        """Returns the fingerprint of a task, given the fingerprints of its upstream tasks."""
+        inputs = {
+            path: get_path_fingerprint(path, hash_max_size=self._hash_max_size)
+            for path in task.inputs()
+        }
+        return task.fingerprint(inputs=inputs, upstream=upstream)
+
+    def is_current(self, task: Operator, fingerprint: str) -> bool:
+        """Returns True if the task ran with this fingerprint and its outputs are unchanged."""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+        if entry is None or not task.outputs():
+            return False
+        return all(
+            get_path_fingerprint(path, hash_max_size=self._hash_max_size) == recorded
+            for path, recorded in entry["outputs"].items()
+        )
+
+    def put(self, task: Operator, fingerprint: str) -> None:
+        """Records the outputs of a task that ran with this fingerprint."""
+        outputs = {
+            path: get_path_fingerprint(path, hash_max_size=self._hash_max_size)
+            for path in task.outputs()
+        }
+        with self._lock:
+            self._entries[fingerprint] = {
+                "task": task.name,
+                "outputs": outputs,
+                "created": datetime.now().isoformat(),
+            }
+            self._save()
+
+    def run(self, task: Operator, data: Any = None, context: Any = None, upstream: list = None):
+        """Runs a task unless it is current, and returns its result and fingerprint.
+
+        Args:
+            task (Operator): The task to run
+            data (Any): Input data for the task
+            context (Context): Database context
+            upstream (list): Fingerprints of the upstream tasks
+        """
+        fingerprint = self.fingerprint(task, upstream=upstream)
+        if self.is_current(task, fingerprint):
+            logger.info("Task {} is unchanged. Skipped.".format(task.name))
+            return None, fingerprint
+
+        result = task.run(data=data, context=context)
+        if task.outputs():
+            self.put(task, fingerprint)
+        return result, fingerprint
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._save()
+
+    def _load(self) -> dict:
+        try:
+            with open(self._filepath, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self._filepath) or ".", exist_ok=True)
+        tmp = self._filepath + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self._filepath)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /checkpoint.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 03:02:40 pm                                              #
+# Modified   : Saturday October 17th 2026 03:02:40 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Checkpoints of DAG runs, used to resume a failed run from the last completed task."""
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+from typing import Any
+import logging
+import logging.config
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pyspark.sql import DataFrame
+
+from deepctr.dag.base import Operator
+from deepctr.data.local import SparkSessionProvider
+from deepctr.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class Checkpoint:
+    """Records the tasks of a DAG run as they complete, along with the data they return.
+
+    Only tasks that declare outputs, or set checkpoint to True, are recorded. Other tasks,
+    typically reads and cheap transforms, run again when the DAG is resumed, which costs
+    less than writing their data out.
+
+    Spark DataFrames are written as Parquet and pandas DataFrames and Arrow tables as Arrow
+    IPC (Feather) files, in a folder per task. Spark DataFrames are then read back, so the
+    tasks downstream start from the checkpoint rather than recomputing the query. Data of any
+    other type is not saved. A task with outputs is still recorded, since its files hold its
+    results. A task without outputs is not, so a resumed run repeats it.
+
+    Args:
+        folder (str): Folder holding the state of the run and the data of its tasks.
+    """
+
+    __state = "state.json"
+
+    def __init__(self, folder: str) -> None:
+        self._folder = folder
+        self._lock = threading.Lock()
+        self._state = self._load()
+
+    @property
+    def range(self) -> tuple:
+        """The started and stopped task sequence numbers of the run, or None."""
+        if self._state is None:
+            return None
+        return self._state["started"], self._state["stopped"]
+
+    @property
+    def completed(self) -> dict:
+        """Fingerprints of the completed tasks, keyed by sequence number."""
+        if self._state is None:
+            return {}
+        return {
+            int(seq): entry["fingerprint"] for seq, entry in self._state["completed"].items()
+        }
+
+    def start(self, started: int, stopped: float) -> None:
+        """Discards the checkpoints of the previous run and starts a new one."""
+        with self._lock:
+            shutil.rmtree(self._folder, ignore_errors=True)
+            self._state = {
+                "started": started,
+                "stopped": stopped,
+                "created": datetime.now().isoformat(),
+                "completed": {},
+            }
+            self._save()
+
+    def save(self, task: Operator, data: Any = None, fingerprint: str = None) -> Any:
+        """Records a completed task and its data, and returns the data to pass downstream.
+
+        Args:
+            task (Operator): The completed task
+            data (Any): The data the task returned
+            fingerprint (str): The task's fingerprint, if a TaskCache is used
+        """
+        if not (task.checkpoint or task.outputs()):
+            return data
+
+        entry = {"format": None, "fingerprint": fingerprint}
+        path = os.path.join(self._folder, str(task.seq))
+        if isinstance(data, DataFrame):
+            data.write.mode("overwrite").parquet(path)
+            data = SparkSessionProvider().get_session().read.parquet(path)
+            entry["format"] = "parquet"
+        elif isinstance(data, (pd.DataFrame, pa.Table)):
+            os.makedirs(self._folder, exist_ok=True)
+            feather.write_feather(data, path)
+            entry["format"] = "pandas" if isinstance(data, pd.DataFrame) else "arrow"
+        elif data is not None and not task.outputs():
+            logger.warning(
+                "Task {} returned {}, which is not checkpointed.".format(task.name, type(data))
+            )
+            return data
+
+        with self._lock:
+            self._state["completed"][str(task.seq)] = entry
+            self._save()
+        return data
+
+    def load(self, seq: int) -> Any:
+        """Returns the data a completed task returned, or None."""
+        entry = self._state["completed"].get(str(seq)) if self._state else None
+        if entry is None or entry["format"] is None:
+            return None
+
+        path = os.path.join(self._folder, str(seq))
+        if entry["format"] == "parquet":
+            return SparkSessionProvider().get_session().read.parquet(path)
+        if entry["format"] == "pandas":
+            return feather.read_feather(path, memory_map=True)
+        return feather.read_table(path, memory_map=True)
+
+    def clear(self) -> None:
+        """Discards the checkpoints of the run."""
+        with self._lock:
+            shutil.rmtree(self._folder, ignore_errors=True)
+            self._state = None
+
+    def _load(self) -> dict:
+        try:
+            with open(os.path.join(self._folder, Checkpoint.__state), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self) -> None:
+        os.makedirs(self._folder, exist_ok=True)
+        filepath = os.path.join(self._folder, Checkpoint.__state)
+        tmp = filepath + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._state, f)
+        os.replace(tmp, filepath)
@@ -16,15 +16,17 @@
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
 from typing import Any
+import os
 import logging
 import logging.config
 import pandas as pd
 
 from deepctr.utils.decorators import operator
 from deepctr.dag.base import Operator
-from deepctr.dal.entity import File, Dataset
-from deepctr.dal.vfs import FileManager
-from deepctr.dal.remote import RemoteAccessObject
+from deepctr.dal.context import DBContext as Context
+from deepctr.dal.file import File
+from deepctr.data.remote import S3
+from deepctr.data.schema import SchemaRegistry
 from deepctr.utils.log_config import LOG_CONFIG
 
 # ------------------------------------------------------------------------------------------------ #
@@ -33,6 +35,14 @@ logging.getLogger("py4j").setLevel(logging.ERROR)
 logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------------------------ #
 
+
+def _get_folder(params: dict) -> str:
+    """Returns the local folder for a dataset at a stage, e.g. data/alibaba/vesuvio/raw."""
+    return os.path.join(
+        params.get("home", "data"), params["datasource"], params["dataset"], params["stage"]
+    )
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                     DOWNLOAD S3                                                  #
 # ------------------------------------------------------------------------------------------------ #
@@ -45,12 +55,12 @@ class DownloadS3(Operator):
         seq (int): Task sequence in dag.
         name (str): name of task
         params (dict): Parameters required by the task, including:
-          bucket (str): The Amazon S3 bucket name
-          key (str): The access key to the S3 bucket
-          password (str): The secret access key to the S3 bucket
-          folder (str): The folder within the bucket for the data
-          destination (str): The folder to which the data is downloaded
+          source (dict): The bucket and the folder within the bucket for the data
+          destination (dict): The home, datasource, dataset and stage of the local folder
+            to which the data is downloaded
           force (bool): If True, will execute and overwrite existing data.
+          stream (bool): If True, archives are extracted as they are downloaded. A streamed
+            archive that is interrupted is downloaded again from the start. Default = False
     """
 
     def __init__(self, seq: int, name: str, desc: str, params: dict) -> None:
@@ -59,7 +69,7 @@ class DownloadS3(Operator):
         self._progressbar = None
 
     @operator
-    def execute(self, data: Any = None) -> pd.DataFrame:
+    def execute(self, data: Any = None, context: Context = None) -> pd.DataFrame:
         """Extracts data from an Amazon AWS S3 resource and persists it."""
 
         source = {
@@ -67,15 +77,24 @@ class DownloadS3(Operator):
             "folder": self._params["source"]["folder"],
         }
 
-        destination = Dataset(
-            name=self._params["destination"]["dataset"],
-            stage=self._params["destination"]["stage"],
-            datasource=self._params["destination"]["datasource"],
-            home=self._params["destination"]["home"],
+        destination = _get_folder(self._params["destination"])
+
+        # The folder is listed once and its objects are downloaded concurrently. Archives are
+        # downloaded in checkpointed parts before extraction, so an interrupted archive resumes
+        # where it stopped. The manifest records completed objects, so a re-run only downloads
+        # what is missing.
+        s3 = S3(manifest=os.path.join(destination, ".manifest.json"))
+        s3.download_folder(
+            bucket=source["bucket"],
+            folder=source["folder"],
+            destination=destination,
+            expand=True,
+            force=self._params.get("force", False),
+            stream=self._params.get("stream", False),
         )
 
-        rao = RemoteAccessObject()
-        rao.download_dataset(source=source, destination=destination, expand=True, force=False)
+    def outputs(self) -> list:
+        return [_get_folder(self._params["destination"])]
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -84,25 +103,58 @@ class DownloadS3(Operator):
 class DataReader(Operator):
     """Reads data from the Data Repository"""
 
+    kind = "source"
+
     def __init__(self, seq: int, name: str, desc: str, params: list) -> None:
         super(DataReader, self).__init__(seq=seq, name=name, desc=desc, params=params)
 
     @operator
-    def execute(self, data: Any = None) -> Any:
+    def execute(self, data: Any = None, context: Context = None) -> Any:
         """Reads from the designated resource"""
+        return self.read()
+
+    def read(self) -> Any:
+        """Returns the data read, lazily for Spark DataFrames."""
+
+        file = self._get_file()
+        options = {}
+
+        # Raw CSV files are read with the schema registered for them, avoiding a second pass
+        # over the file to infer types, and with their registered sep and header, e.g. the
+        # tab separated Criteo files without a header row.
+        if file.format == "csv":
+            registry = SchemaRegistry()
+            key = {
+                "datasource": self._params["file"]["datasource"],
+                "dataset": self._params["file"]["dataset"],
+                "name": self._params["file"]["name"],
+            }
+            schema = registry.get(**key)
+            if schema is not None:
+                options["schema"] = schema
+            options.update(registry.read_options(**key))
+
+        # Columns and filters are pushed into the reader, so Parquet scans skip unused columns
+        # and row groups, e.g. columns: [user_id, click], filter: [[day, "=", 20170506]]
+        return file.read(
+            columns=self._params["file"].get("columns") or None,
+            filters=self._params["file"].get("filter") or None,
+            **options,
+        )
+
+    def inputs(self) -> list:
+        return [self._get_file().filepath]
 
-        file = File(
+    def _get_file(self) -> File:
+        return File(
             name=self._params["file"]["name"],
-            dataset=self._params["file"]["dataset"],
-            datasource=self._params["file"]["datasource"],
-            stage=self._params["file"]["stage"],
+            desc=self._desc,
+            folder=_get_folder(self._params["file"]),
             format=self._params["file"]["format"],
-            compressed=self._params["file"]["compressed"],
-            home=self._params["file"].get("home", "data"),
+            compressed=self._params["file"].get("compressed", False),
+            backend=self._params["file"].get("backend", "spark"),
         )
 
-        return FileManager().read(file=file)
-
 
 # ------------------------------------------------------------------------------------------------ #
 #                                     DATA WRITER                                                  #
@@ -110,22 +162,40 @@ class DataReader(Operator):
 class DataWriter(Operator):
     """Reads data from the Data Repository"""
 
+    kind = "sink"
+
     def __init__(self, seq: int, name: str, desc: str, params: list) -> None:
         super(DataWriter, self).__init__(seq=seq, name=name, desc=desc, params=params)
 
     @operator
-    def execute(self, data: Any = None) -> Any:
+    def execute(self, data: Any = None, context: Context = None) -> Any:
         """Reads from the designated resource"""
+        return self.write(data)
+
+    def write(self, data: Any) -> None:
+        """Writes the data, triggering its computation. Existing files are kept unless force
+        is True."""
+
+        file = self._get_file()
+
+        # Optional writer settings, e.g. partition_by: [day], target_file_size, compression,
+        # compression_level, dictionary and column_options
+        options = self._params["file"].get("write", {})
 
-        file = File(
+        if file.exists() and not self._params.get("force", False):
+            logger.info("{} exists and force is False. Not written.".format(file.filepath))
+            return None
+        file.write(data=data, **options)
+
+    def outputs(self) -> list:
+        return [self._get_file().filepath]
+
+    def _get_file(self) -> File:
+        return File(
             name=self._params["file"]["name"],
-            dataset=self._params["file"]["dataset"],
-            datasource=self._params["file"]["datasource"],
-            stage=self._params["file"]["stage"],
+            desc=self._desc,
+            folder=_get_folder(self._params["file"]),
             format=self._params["file"]["format"],
-            compressed=self._params["file"]["compressed"],
-            home=self._params["file"].get("home", "data"),
-            file_system=self._params["file"]["file_system"],
+            compressed=self._params["file"].get("compressed", False),
+            backend=self._params["file"].get("backend", "spark"),
         )
-
-        return FileManager().create(file=file, data=data, force=self._params.get("force", False))
@@ -19,11 +19,17 @@
 """Defines construction and execution of DAGs."""
 from abc import ABC, abstractmethod
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any
 import importlib
 import logging
 import logging.config
 
-from deepctr.dal.context import Context
+from deepctr.dal.context import DBContext as Context
+from deepctr.dag.base import Operator
+from deepctr.dag.plan import LogicalPlan
+from deepctr.dag.cache import TaskCache
+from deepctr.dag.checkpoint import Checkpoint
 from deepctr.utils.log_config import LOG_CONFIG
 
 # ------------------------------------------------------------------------------------------------ #
@@ -57,6 +63,18 @@ class DAG(ABC):
         self._duration = None
         self._created = datetime.now()
 
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def tasks(self) -> list:
+        return self._tasks
+
+    @property
+    def context(self) -> Context:
+        return self._context
+
     def run(self, started: int = 0, stopped: float = float("inf")) -> None:
         self._start()
         self.execute(started=started, stopped=stopped, context=self._context)
@@ -64,6 +82,12 @@ class DAG(ABC):
 
     def _start(self) -> None:
         """Sets start time,  creates the dag db entry, and updates the id from the database."""
+        self._started = datetime.now()
+
+    def _stop(self) -> None:
+        """Sets the stop time and duration of the run."""
+        self._stopped = datetime.now()
+        self._duration = self._stopped - self._started
 
     def _insert_dag(self) -> int:
         """Inserts the dag into the database and returns the dag id."""
@@ -81,21 +105,274 @@ class DataDAG(DAG):
         dag_name (str): name for the dag in lower case, underscore separated
         dag_desc (str): Brief desc
         tasks (list): List of tasks to execute
+        context (Context): Database context
+        lazy (bool): If True, tasks are executed through a LogicalPlan, in which only sinks
+            trigger computation. The plan follows task order and ignores depends_on.
+            Default = False
+        max_workers (int): Maximum number of tasks run concurrently. Tasks declaring
+            depends_on are scheduled by their dependencies, so independent branches run in
+            parallel. Default = 1
+        cache (TaskCache): If provided, tasks whose fingerprints and outputs are unchanged
+            since they last ran are skipped. Default = None
+        checkpoint (Checkpoint): If provided, completed tasks that declare outputs, or set
+            checkpoint, are recorded with the data they return, and a failed run can be
+            resumed. Not supported in lazy mode. Default = None
 
     """
 
-    def __init__(self, name: str, desc: str, tasks: list) -> None:
-        super(DataDAG, self).__init__(name=name, desc=desc, tasks=tasks)
+    def __init__(
+        self,
+        name: str,
+        desc: str,
+        tasks: list,
+        context: Context = None,
+        lazy: bool = False,
+        max_workers: int = 1,
+        cache: TaskCache = None,
+        checkpoint: Checkpoint = None,
+    ) -> None:
+        super(DataDAG, self).__init__(name=name, desc=desc, tasks=tasks, context=context)
+        if lazy and checkpoint is not None:
+            msg = "Checkpoints are not supported in lazy mode."
+            logger.error(msg)
+            raise ValueError(msg)
+        self._lazy = lazy
+        self._max_workers = max_workers
+        self._cache = cache
+        self._checkpoint = checkpoint
+        self._completed = {}
+
+    def run(self, started: int = 0, stopped: float = float("inf")) -> None:
+        if self._checkpoint is not None:
+            self._checkpoint.start(started=started, stopped=stopped)
+        self._completed = {}
+        super(DataDAG, self).run(started=started, stopped=stopped)
+
+    def resume(self) -> None:
+        """Resumes the last run from its checkpoint, skipping the tasks it recorded.
+
+        The data the recorded tasks returned is restored from the checkpoint and passed to
+        the tasks depending on them. Tasks that were not recorded run again. Without a
+        checkpoint to resume from, the DAG is run.
+        """
+        if self._checkpoint is None or self._checkpoint.range is None:
+            logger.info("No checkpoint to resume {} from. Running all tasks.".format(self._name))
+            return self.run()
+
+        started, stopped = self._checkpoint.range
+        self._completed = self._checkpoint.completed
+        logger.info(
+            "Resuming {}. Completed tasks: {}".format(self._name, sorted(self._completed))
+        )
+        self._start()
+        self.execute(started=started, stopped=stopped, context=self._context)
+        self._stop()
+
+    def plan(self, started: int = 0, stopped: float = float("inf")) -> LogicalPlan:
+        """Returns the logical plan for the tasks in the range given."""
+        return LogicalPlan(tasks=self._get_tasks(started=started, stopped=stopped))
 
     def execute(
         self, started: int = 0, stopped: float = float("inf"), context: Context = None
     ) -> None:
+        if self._lazy:
+            plan = self.plan(started=started, stopped=stopped)
+            logger.info("Executing plan:\n{}".format(plan.explain()))
+            with context as c:
+                plan.execute(context=c, cache=self._cache)
+            return
+
+        tasks = self._get_tasks(started=started, stopped=stopped)
+        if any(task.depends_on is not None for task in tasks):
+            with context as c:
+                TaskGraph(tasks=tasks).run(
+                    context=c,
+                    max_workers=self._max_workers,
+                    cache=self._cache,
+                    checkpoint=self._checkpoint,
+                    completed=self._completed,
+                )
+            return
+
         data = None
+        fingerprint = None
         with context as c:
-            for task in self._tasks:
-                if task.seq >= started and task.seq <= stopped:
-                    result = task.run(data=data, context=c)
-                    data = result if result is not None else data
+            for task in tasks:
+                if task.seq in self._completed:
+                    fingerprint = self._completed[task.seq]
+                    result = self._checkpoint.load(task.seq)
+                else:
+                    upstream = None if fingerprint is None else [fingerprint]
+                    result, fingerprint = _run_task(
+                        task,
+                        data=data,
+                        context=c,
+                        cache=self._cache,
+                        upstream=upstream,
+                        checkpoint=self._checkpoint,
+                    )
+                data = result if result is not None else data
+
+    def _get_tasks(self, started: int, stopped: float) -> list:
+        return [task for task in self._tasks if task.seq >= started and task.seq <= stopped]
+
+
+def _run_task(
+    task: Operator,
+    data: Any = None,
+    context: Context = None,
+    cache: TaskCache = None,
+    upstream: list = None,
+    checkpoint: Checkpoint = None,
+) -> tuple:
+    """Runs a task through the cache and checkpoint, if any, and returns its result and
+    fingerprint."""
+    fingerprint = None
+    if cache is not None:
+        result, fingerprint = cache.run(task, data=data, context=context, upstream=upstream)
+    else:
+        result = task.run(data=data, context=context)
+    if checkpoint is not None:
+        result = checkpoint.save(task, data=result, fingerprint=fingerprint)
+    return result, fingerprint
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                       TASK GRAPH                                                 #
+# ------------------------------------------------------------------------------------------------ #
+class TaskGraph:
+    """Schedules tasks by their dependencies on a thread pool.
+
+    A task is submitted as soon as all of the tasks it depends on have completed, and
+    receives the result of the last of its dependencies, in the order listed, that returned
+    data. Tasks without depends_on depend on the task before them, as in a linear DAG.
+    Dependencies outside the tasks given, e.g. when a DAG is run from a later task, are taken
+    as complete. Threads rather than processes are used, since Spark DataFrames and the shared
+    SparkSession cannot cross process boundaries; Spark runs jobs from several threads
+    concurrently.
+
+    Args:
+        tasks (list): Operators, in sequence order.
+    """
+
+    def __init__(self, tasks: list) -> None:
+        self._tasks = {task.seq: task for task in tasks}
+        self._dependencies = self._get_dependencies(tasks)
+        self._validate()
+
+    @property
+    def dependencies(self) -> dict:
+        return self._dependencies
+
+    def run(
+        self,
+        context: Any = None,
+        max_workers: int = 1,
+        cache: TaskCache = None,
+        checkpoint: Checkpoint = None,
+        completed: dict = None,
+    ) -> dict:
+        """Runs the tasks and returns their results keyed by sequence number.
+
+        Args:
+            context (Context): Database context
+            max_workers (int): Maximum number of tasks run concurrently. Default = 1
+            cache (TaskCache): If provided, unchanged tasks are skipped. Default = None
+            checkpoint (Checkpoint): If provided, completed tasks are checkpointed.
+                Default = None
+            completed (dict): Fingerprints of the tasks completed by a previous run, keyed
+                by sequence number. Their results are restored from the checkpoint.
+                Default = None
+        """
+        results = {}
+        fingerprints = {}
+        waiting = {seq: set(dependencies) for seq, dependencies in self._dependencies.items()}
+        dependents = {seq: [] for seq in self._tasks}
+        for seq, dependencies in self._dependencies.items():
+            for dependency in dependencies:
+                dependents[dependency].append(seq)
+
+        for seq in [seq for seq in self._tasks if seq in (completed or {})]:
+            results[seq] = checkpoint.load(seq)
+            fingerprints[seq] = completed[seq]
+            del waiting[seq]
+            for dependent in dependents[seq]:
+                waiting.get(dependent, set()).discard(seq)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = {}
+            ready = [seq for seq, dependencies in waiting.items() if not dependencies]
+            while ready or running:
+                for seq in ready:
+                    data = self._get_input(seq, results)
+                    future = executor.submit(
+                        _run_task,
+                        self._tasks[seq],
+                        data=data,
+                        context=context,
+                        cache=cache,
+                        upstream=[fingerprints[d] for d in self._dependencies[seq]],
+                        checkpoint=checkpoint,
+                    )
+                    running[future] = seq
+                ready = []
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    seq = running.pop(future)
+                    try:
+                        results[seq], fingerprints[seq] = future.result()
+                    except Exception:
+                        for pending in running:
+                            pending.cancel()
+                        raise
+                    for dependent in dependents[seq]:
+                        if dependent not in waiting:  # Completed by a previous run
+                            continue
+                        waiting[dependent].discard(seq)
+                        if not waiting[dependent]:
+                            ready.append(dependent)
+        return results
+
+    def _get_dependencies(self, tasks: list) -> dict:
+        dependencies = {}
+        previous = None
+        for task in tasks:
+            if task.depends_on is None:
+                declared = [] if previous is None else [previous]
+            else:
+                declared = [seq for seq in task.depends_on if seq in self._tasks]
+            dependencies[task.seq] = declared
+            previous = task.seq
+        return dependencies
+
+    def _get_input(self, seq: int, results: dict) -> Any:
+        data = None
+        for dependency in self._dependencies[seq]:
+            if results.get(dependency) is not None:
+                data = results[dependency]
+        return data
+
+    def _validate(self) -> None:
+        """Raises ValueError if the dependencies contain a cycle."""
+        visited = set()
+        for seq in self._dependencies:
+            path, stack = set(), [(seq, iter(self._dependencies[seq]))]
+            path.add(seq)
+            while stack:
+                node, children = stack[-1]
+                child = next(children, None)
+                if child is None:
+                    stack.pop()
+                    path.discard(node)
+                    visited.add(node)
+                elif child in path:
+                    msg = "Task {} is part of a dependency cycle.".format(child)
+                    logger.error(msg)
+                    raise ValueError(msg)
+                elif child not in visited:
+                    path.add(child)
+                    stack.append((child, iter(self._dependencies[child])))
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -135,6 +412,7 @@ class DAGBuilder(ABC):
                 desc=task_config["task_desc"],
                 params=task_config["task_params"],
             )
+            task_instance.depends_on = task_config.get("depends_on")
 
             tasks.append(task_instance)
 
@@ -187,13 +465,22 @@ class DataDAGBuilder(DAGBuilder):
         tasks = self._build_tasks(config)
 
         try:
-            self._dag = DataDAG(name=config["dag_name"], desc=config["dag_desc"], tasks=tasks,)
+            self._dag = DataDAG(
+                name=config["dag_name"],
+                desc=config["dag_desc"],
+                tasks=tasks,
+                lazy=config.get("dag_lazy", False),
+                max_workers=config.get("dag_max_workers", 1),
+                cache=TaskCache(config["dag_cache"]) if config.get("dag_cache") else None,
+                checkpoint=Checkpoint(config["dag_checkpoint"])
+                if config.get("dag_checkpoint")
+                else None,
+                context=self._context,
+            )
         except KeyError as e:
             logger.error("Invalid configuration parameters")
             raise ValueError(e)
 
-        self._dag.context = self._context
-
         return self
 
     def _create_config(self) -> dict:
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /plan.py                                                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 01:05:44 pm                                              #
+# Modified   : Saturday October 17th 2026 01:05:44 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Logical plans for lazy execution of data DAGs."""
+from dataclasses import dataclass, field
+from typing import Any
+import logging
+import logging.config
+
+from deepctr.dag.base import Operator
+from deepctr.dag.cache import TaskCache
+from deepctr.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+#                                        PLAN NODES                                                #
+# ------------------------------------------------------------------------------------------------ #
+
+
+@dataclass
+class Pipeline:
+    """A chain of data: a source task, or the result of an eager step, and the transforms
+    applied to it."""
+
+    source: Operator = None
+    upstream: Any = None  # The EagerStep whose result feeds the pipeline
+    previous: Any = None  # The Pipeline continued if the upstream step returns None
+    transforms: list = field(default_factory=list)
+    consumers: int = 0
+
+
+@dataclass
+class EagerStep:
+    """A task outside the plan, run in order on the data of the pipeline before it."""
+
+    task: Operator
+    pipeline: Pipeline = None
+    length: int = 0
+
+
+@dataclass
+class SinkStep:
+    """A sink task writing the data of the first 'length' transforms of a pipeline."""
+
+    task: Operator
+    pipeline: Pipeline
+    length: int
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                       LOGICAL PLAN                                               #
+# ------------------------------------------------------------------------------------------------ #
+class LogicalPlan:
+    """Plan for the lazy execution of a list of tasks.
+
+    Sources, transforms and sinks are not run as they are reached. Instead, each sink is
+    planned as its source followed by the transforms between them, fused into one function,
+    so Spark builds a single query from the read to the write and only the sink triggers a
+    job. Transforms shared by several sinks are computed once. Reads and transforms that no
+    sink or eager task consumes are pruned. Tasks of other kinds run eagerly, in order, as
+    in DataDAG.
+
+    Args:
+        tasks (list): Operators, in the order they would run eagerly.
+    """
+
+    def __init__(self, tasks: list) -> None:
+        self._steps = []
+        self._pruned = []
+        self._build(tasks)
+
+    @property
+    def steps(self) -> list:
+        return self._steps
+
+    @property
+    def pruned(self) -> list:
+        """Tasks removed from the plan because nothing consumes their output."""
+        return self._pruned
+
+    def explain(self) -> str:
+        """Returns a description of the plan, one line per step."""
+        lines = []
+        for step in self._steps:
+            if isinstance(step, SinkStep):
+                chain = self._describe(step.pipeline, step.length)
+                lines.append("{} <- {}".format(step.task.name, chain))
+            else:
+                lines.append("{} (eager)".format(step.task.name))
+        for task in self._pruned:
+            lines.append("{} (pruned)".format(task.name))
+        return "\n".join(lines)
+
+    def execute(self, context: Any = None, cache: TaskCache = None) -> Any:
+        """Runs the plan and returns the data of its last pipeline, if any.
+
+        Args:
+            context (Context): Database context
+            cache (TaskCache): If provided, sinks and eager tasks whose fingerprints and
+                outputs are unchanged are skipped, along with the reads and transforms
+                feeding them.
+        """
+        self._results = {}
+        self._cache = {}
+        self._persisted = []
+        self._fingerprints = {}
+        self._task_cache = cache
+        data = None
+        try:
+            for step in self._steps:
+                if isinstance(step, SinkStep):
+                    if cache is not None:
+                        upstream = [self._get_fingerprint(step.pipeline, step.length)]
+                        fingerprint = cache.fingerprint(step.task, upstream=upstream)
+                        if cache.is_current(step.task, fingerprint):
+                            logger.info("Task {} is unchanged. Skipped.".format(step.task.name))
+                            continue
+                    data = self._evaluate(step.pipeline, step.length, context)
+                    step.task.run(data=data, context=context)
+                    if cache is not None and step.task.outputs():
+                        cache.put(step.task, fingerprint)
+                else:
+                    data = None
+                    if step.pipeline is not None:
+                        data = self._evaluate(step.pipeline, step.length, context)
+                    if cache is not None:
+                        upstream = None
+                        if step.pipeline is not None:
+                            upstream = [self._get_fingerprint(step.pipeline, step.length)]
+                        result, fingerprint = cache.run(
+                            step.task, data=data, context=context, upstream=upstream
+                        )
+                        self._fingerprints[id(step)] = fingerprint
+                    else:
+                        result = step.task.run(data=data, context=context)
+                    self._results[id(step)] = result
+        finally:
+            for persisted in self._persisted:
+                persisted.unpersist()
+        return data
+
+    # -------------------------------------------------------------------------------------------- #
+    def _build(self, tasks: list) -> None:
+        current = None
+        for task in tasks:
+            kind = getattr(task, "kind", None)
+            if kind == "source":
+                self._prune(current)
+                current = Pipeline(source=task)
+            elif kind == "transform" and current is not None:
+                current.transforms.append(task)
+            elif kind == "sink" and current is not None:
+                current.consumers += 1
+                self._steps.append(
+                    SinkStep(task=task, pipeline=current, length=len(current.transforms))
+                )
+            else:
+                step = EagerStep(task=task)
+                if current is not None and (current.source or current.upstream):
+                    current.consumers += 1
+                    step.pipeline = current
+                    step.length = len(current.transforms)
+                self._steps.append(step)
+                current = Pipeline(upstream=step, previous=current)
+        self._prune(current)
+
+    def _prune(self, pipeline: Pipeline) -> None:
+        """Removes the source and transforms of a pipeline that nothing consumes."""
+        if pipeline is None:
+            return
+        used = max([step.length for step in self._steps if step.pipeline is pipeline] or [0])
+        self._pruned.extend(pipeline.transforms[used:])
+        if pipeline.consumers == 0 and pipeline.source is not None:
+            self._pruned.append(pipeline.source)
+
+    def _evaluate(self, pipeline: Pipeline, length: int, context: Any) -> Any:
+        """Returns the data of a pipeline after its first 'length' transforms, reusing the
+        longest prefix already computed."""
+        key = (id(pipeline), length)
+        if key in self._cache:
+            return self._cache[key]
+
+        prefixes = [n for (p, n) in self._cache if p == id(pipeline) and n <= length]
+        if prefixes:
+            start = max(prefixes)
+            data = self._cache[(id(pipeline), start)]
+        else:
+            start = 0
+            data = self._get_source(pipeline, context)
+
+        data = self._fuse(pipeline.transforms[start:length])(data)
+
+        # Data feeding more than one consumer is persisted, so Spark computes it once.
+        if pipeline.consumers > 1 and hasattr(data, "persist"):
+            data = data.persist()
+            self._persisted.append(data)
+        self._cache[key] = data
+        return data
+
+    def _get_source(self, pipeline: Pipeline, context: Any) -> Any:
+        if pipeline.source is not None:
+            return pipeline.source.read()
+        data = self._results.get(id(pipeline.upstream))
+        if data is None and pipeline.previous is not None:
+            return self._evaluate(pipeline.previous, len(pipeline.previous.transforms), context)
+        return data
+
+    def _get_fingerprint(self, pipeline: Pipeline, length: int) -> str:
+        """Returns the fingerprint of a pipeline after its first 'length' transforms."""
+        key = (id(pipeline), length)
+        if key not in self._fingerprints:
+            if length > 0:
+                upstream = [self._get_fingerprint(pipeline, length - 1)]
+                fingerprint = self._task_cache.fingerprint(
+                    pipeline.transforms[length - 1], upstream=upstream
+                )
+            elif pipeline.source is not None:
+                fingerprint = self._task_cache.fingerprint(pipeline.source)
+            else:
+                fingerprint = self._fingerprints.get(id(pipeline.upstream))
+                if pipeline.previous is not None:
+                    previous = self._get_fingerprint(
+                        pipeline.previous, len(pipeline.previous.transforms)
+                    )
+                    fingerprint = "{}/{}".format(fingerprint, previous)
+            self._fingerprints[key] = fingerprint
+        return self._fingerprints[key]
+
+    def _fuse(self, transforms: list):
+        """Composes transforms into a single function of the data."""
+
+        def fused(data: Any) -> Any:
+            for task in transforms:
+                data = task.transform(data)
+            return data
+
+        if transforms:
+            logger.info("Fused {}".format(", ".join(task.name for task in transforms)))
+        return fused
+
+    def _describe(self, pipeline: Pipeline, length: int) -> str:
+        names = [task.name for task in pipeline.transforms[:length]]
+        if pipeline.source is not None:
+            origin = pipeline.source.name
+        elif pipeline.upstream is not None:
+            origin = pipeline.upstream.task.name
+        else:
+            origin = "None"
+        return " -> ".join([origin] + names)
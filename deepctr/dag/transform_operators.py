@@ -24,6 +24,7 @@ import logging.config
 
 from deepctr.utils.decorators import operator
 from deepctr.dag.base import Operator
+from deepctr.dal.context import DBContext as Context
 from deepctr.utils.log_config import LOG_CONFIG
 
 # ------------------------------------------------------------------------------------------------ #
@@ -43,13 +44,23 @@ class ReplaceColumnNames(Operator):
         params (Any): Parameters for the task
     """
 
+    kind = "transform"
+
     def __init__(self, seq: int, name: str, desc: str, params: list) -> None:
         super(ReplaceColumnNames, self).__init__(seq=seq, name=name, desc=desc, params=params)
 
     @operator
-    def execute(self, data: Any = None, context: dict = None) -> pd.DataFrame:
+    def execute(self, data: Any = None, context: Context = None) -> pd.DataFrame:
         """Replaces the columns in the DataFrame according to the params['columns'] object."""
+        return self.transform(data)
 
-        data = data.toDF(*[x for x in self._params["columns"].values()])
+    def transform(self, data: Any) -> Any:
+        """Returns data with its columns renamed. Lazy for Spark DataFrames."""
+        columns = [x for x in self._params["columns"].values()]
+        if isinstance(data, pd.DataFrame):
+            # Small files read through the Arrow backend arrive as pandas DataFrames.
+            data = data.set_axis(columns, axis=1)
+        else:
+            data = data.toDF(*columns)
 
         return data
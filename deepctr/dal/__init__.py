@@ -15,7 +15,7 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
-from deepctr.data.local import SparkCSV, SparkParquet
+from deepctr.data.local import SparkCSV, SparkParquet, ArrowCSV, ArrowParquet
 
 # ------------------------------------------------------------------------------------------------ #
 STAGES = {
@@ -30,4 +30,6 @@ STAGES = {
 FORMATS = ["csv", "parquet"]
 SOURCES = ["alibaba", "avazu", "criteo"]
 FILE_SYSTEMS = ["local", "s3"]
+BACKENDS = ["spark", "arrow", "auto"]
 IO = {"csv": SparkCSV(), "parquet": SparkParquet()}
+ARROW_IO = {"csv": ArrowCSV(), "parquet": ArrowParquet()}
@@ -23,7 +23,7 @@ import logging.config
 from typing import Any
 from datetime import datetime
 
-from deepctr.dal import STAGES, FORMATS
+from deepctr.dal import STAGES, FORMATS, BACKENDS
 from deepctr.utils.printing import Printer
 from deepctr.utils.log_config import LOG_CONFIG
 
@@ -135,6 +135,12 @@ class Validator:
         else:
             return value
 
+    def backend(self, value: str) -> bool:
+        if value not in BACKENDS:
+            self._fail(value, BACKENDS)
+        else:
+            return value
+
     def stage(self, value: int) -> bool:
         if value not in STAGES.keys():
             self._fail(value, STAGES)
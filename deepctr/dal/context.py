@@ -17,9 +17,11 @@
 # ================================================================================================ #
 """Dataset context object that implements the Repository/Unit of Work Pattern."""
 from abc import ABC
+from collections import OrderedDict
+import threading
 import logging
 
-from deepctr.dal.base import EntityMapper
+from deepctr.dal.base import Entity, EntityMapper
 from deepctr.data.database import Database
 from deepctr.dal.source import SourceMapper
 from deepctr.dal.file import FileMapper
@@ -30,6 +32,238 @@ from deepctr.utils.log_config import LOG_CONFIG
 # ------------------------------------------------------------------------------------------------ #
 logging.config.dictConfig(LOG_CONFIG)
 logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+WRITE_MODES = ["immediate", "commit", "background"]
+# ------------------------------------------------------------------------------------------------ #
+#                                      IDENTITY MAP                                                #
+# ------------------------------------------------------------------------------------------------ #
+class IdentityMap:
+    """Entities loaded through a context, keyed by id, so each is built at most once.
+
+    Args:
+        max_size (int): Maximum number of entities held. The least recently used entity is
+            evicted beyond it. None holds every entity. Default = None
+    """
+
+    def __init__(self, max_size: int = None) -> None:
+        self._max_size = max_size
+        self._entities = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, id: int) -> bool:
+        return id in self._entities
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entities), "hits": self._hits, "misses": self._misses}
+
+    def get(self, id: int) -> Entity:
+        """Returns the entity with the id, or None if it has not been loaded."""
+        with self._lock:
+            entity = self._entities.get(id)
+            if entity is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entities.move_to_end(id)
+            return entity
+
+    def put(self, entity: Entity) -> Entity:
+        with self._lock:
+            self._entities[entity.id] = entity
+            self._entities.move_to_end(entity.id)
+            if self._max_size is not None and len(self._entities) > self._max_size:
+                self._entities.popitem(last=False)
+        return entity
+
+    def remove(self, id: int) -> None:
+        with self._lock:
+            self._entities.pop(id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entities.clear()
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      UNIT OF WORK                                                #
+# ------------------------------------------------------------------------------------------------ #
+class UnitOfWork:
+    """Buffers inserts, updates and deletes, and writes them in one transaction per flush.
+
+    Commands are built from the entities when they are flushed, so an entity inserted and
+    then updated before a flush is written by a single insert, and repeated updates by a
+    single update. A delete drops the pending update of the same row. Inserts are written
+    first, table by table in the order the tables were first registered, as multi-row
+    INSERTs, then updates and deletes through executemany.
+
+    Args:
+        database (Database): Object that reads and writes to the database
+        background (bool): If True, a writer thread flushes every flush_interval seconds, or
+            as soon as max_pending entities are waiting, so callers never wait on the
+            database. Requires a Database backed by a ConnectionPool, so the writer has its
+            own connection. Default = False
+        flush_interval (float): Seconds between background flushes. Default = 1.0
+        max_pending (int): Number of pending entities that triggers a background flush.
+            Default = 1000
+    """
+
+    def __init__(
+        self,
+        database: Database,
+        background: bool = False,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+    ) -> None:
+        if background and not database.pooled:
+            msg = "A background writer requires a Database backed by a ConnectionPool."
+            logger.error(msg)
+            raise ValueError(msg)
+        self._database = database
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._new = OrderedDict()  # Keyed by id(entity), as ids are assigned on flush
+        self._dirty = OrderedDict()
+        self._deleted = OrderedDict()  # Keyed by mapper type and entity id
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._writer = None
+        if background:
+            self._writer = threading.Thread(target=self._run, name="UnitOfWorkWriter", daemon=True)
+            self._writer.start()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._new) + len(self._dirty) + len(self._deleted)
+
+    def register_new(self, entity: Entity, mapper: EntityMapper) -> None:
+        """Buffers the insert of an entity. Its id is assigned when it is flushed."""
+        with self._lock:
+            self._new[id(entity)] = (entity, mapper)
+        self._notify()
+
+    def register_dirty(self, entity: Entity, mapper: EntityMapper) -> None:
+        """Buffers the update of an entity. Pending inserts pick up the change instead."""
+        with self._lock:
+            if id(entity) not in self._new:
+                self._dirty[id(entity)] = (entity, mapper)
+        self._notify()
+
+    def register_deleted(self, id: int, mapper: EntityMapper) -> None:
+        """Buffers the delete of the entity with this id, dropping its pending update."""
+        with self._lock:
+            for key, (entity, pending) in list(self._dirty.items()):
+                if entity.id == id and type(pending) is type(mapper):
+                    del self._dirty[key]
+            self._deleted[(type(mapper), id)] = (id, mapper)
+        self._notify()
+
+    def flush(self) -> None:
+        """Writes the pending inserts, updates and deletes in one transaction.
+
+        If the caller began a transaction through the database, the writes join it and the
+        caller commits or rolls back. On error, a transaction begun by the flush is rolled
+        back and the writes remain pending, to be retried. Within the caller's transaction
+        they are dropped, since some may already have been written to it.
+        """
+        with self._flush_lock:
+            with self._lock:
+                new, dirty = list(self._new.values()), list(self._dirty.values())
+                deleted = list(self._deleted.values())
+                self._new.clear()
+                self._dirty.clear()
+                self._deleted.clear()
+            if not new and not dirty and not deleted:
+                return
+
+            owned = not self._database.in_transaction
+            try:
+                if owned:
+                    self._database.begin_transaction()
+                for mapper, entities in self._group(new):
+                    commands = [mapper.insert(entity) for entity in entities]
+                    ids = self._database.insert_many(
+                        commands[0].statement, [command.parameters for command in commands]
+                    )
+                    for entity, key in zip(entities, ids):
+                        entity.id = key
+                for mapper, entities in self._group(dirty):
+                    commands = [mapper.update(entity) for entity in entities]
+                    self._database.execute_many(
+                        commands[0].statement, [command.parameters for command in commands]
+                    )
+                for mapper, keys in self._group(deleted):
+                    commands = [mapper.delete(key) for key in keys]
+                    self._database.execute_many(
+                        commands[0].statement, [command.parameters for command in commands]
+                    )
+                if owned:
+                    self._database.commit()
+            except Exception:
+                if not owned:
+                    raise
+                self._database.rollback()
+                for entity, _ in new:
+                    entity.id = 0
+                with self._lock:
+                    self._new = OrderedDict(
+                        [(id(entity), (entity, mapper)) for entity, mapper in new]
+                        + list(self._new.items())
+                    )
+                    for entity, mapper in dirty:
+                        self._dirty.setdefault(id(entity), (entity, mapper))
+                    for key, mapper in deleted:
+                        self._deleted.setdefault((type(mapper), key), (key, mapper))
+                raise
+
+    def discard(self) -> None:
+        """Drops the pending inserts, updates and deletes."""
+        with self._lock:
+            self._new.clear()
+            self._dirty.clear()
+            self._deleted.clear()
+
+    def close(self) -> None:
+        """Stops the background writer, if any, and flushes what remains."""
+        if self._writer is not None:
+            self._stopped.set()
+            self._wakeup.set()
+            self._writer.join()
+            self._writer = None
+        self.flush()
+
+    def _group(self, pending: list) -> list:
+        """Groups entities, or ids, by mapper type, in the order each type was first
+        registered."""
+        groups = OrderedDict()
+        for item, mapper in pending:
+            groups.setdefault(type(mapper), (mapper, []))[1].append(item)
+        return list(groups.values())
+
+    def _notify(self) -> None:
+        if self._writer is not None and self.pending >= self._max_pending:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+                self._database.close()  # Checks the writer's connection back into the pool
+            except Exception as e:
+                logger.error("Background flush failed: {}".format(e))
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                       DBCONTEXT                                                  #
 # ------------------------------------------------------------------------------------------------ #
@@ -37,37 +271,105 @@ class DBContext(ABC):
     """Base class for database context classes.
 
     Context controls the database connection and transactions, as well as the
-    mappers.
+    mappers. When the database checks connections out of a ConnectionPool, commit,
+    rollback and close return the connection to the pool rather than closing it, so
+    contexts used by concurrent tasks do not share a socket or reconnect.
+
+    Entities found through the context are held in its identity map, so repeated lookups
+    of the same id return the same object without a query. Updates and deletes invalidate
+    the entity, and rollback and close clear the map.
+
+    With write_mode 'commit' or 'background', inserts, updates and deletes made through a DAO
+    are buffered in a UnitOfWork rather than written as they are made. They are flushed in one
+    transaction at commit, by a background writer in 'background' mode, and at close.
+    Entities get their ids when they are flushed.
+
+    Used as a context manager, e.g. by DataDAG, the context commits when the block exits
+    and rolls back if it raises.
 
     Args:
     connection (pymysql.connections.Connection): Connection to the database
     database (Database): Object that reads and writes to the database
     mapper (EntityMapper): Contains SQL and factor reconstitute method for the entity.
+    max_entities (int): Maximum size of the identity map. None is unbounded. Default = None
+    write_mode (str): One of 'immediate', 'commit' or 'background'. Default = 'immediate'
 
     """
 
-    def __init__(self, database: Database) -> None:
+    def __init__(
+        self, database: Database, max_entities: int = None, write_mode: str = "immediate"
+    ) -> None:
+        if write_mode not in WRITE_MODES:
+            msg = "Invalid write_mode: {}. Valid values are: {}".format(write_mode, WRITE_MODES)
+            logger.error(msg)
+            raise ValueError(msg)
         self._database = database
         self._mapper = None
+        self._identity_map = IdentityMap(max_size=max_entities)
+        self._unit_of_work = None
+        if write_mode != "immediate":
+            self._unit_of_work = UnitOfWork(
+                database=database, background=write_mode == "background"
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
 
     @property
     def mapper(self) -> EntityMapper:
         return self._mapper
 
+    @property
+    def identity_map(self) -> IdentityMap:
+        return self._identity_map
+
     @property
     def database(self) -> Database:
         return self._database
 
+    @property
+    def buffered(self) -> bool:
+        """True if inserts, updates and deletes are buffered in a unit of work."""
+        return self._unit_of_work is not None
+
+    def register_new(self, entity: Entity) -> None:
+        self._unit_of_work.register_new(entity, self._mapper)
+
+    def register_dirty(self, entity: Entity) -> None:
+        self._unit_of_work.register_dirty(entity, self._mapper)
+
+    def register_deleted(self, id: int) -> None:
+        self._unit_of_work.register_deleted(id, self._mapper)
+
+    def flush(self) -> None:
+        """Writes the buffered inserts, updates and deletes, if any."""
+        if self._unit_of_work is not None:
+            self._unit_of_work.flush()
+
     def begin_transaction(self) -> None:
         self._database.begin_transaction()
 
     def commit(self) -> None:
+        self.flush()
         self._database.commit()
 
     def close(self) -> None:
+        if self._unit_of_work is not None:
+            self._unit_of_work.close()
+        self._identity_map.clear()
         self._database.close()
 
     def rollback(self) -> None:
+        # Entities may hold changes that were rolled back.
+        if self._unit_of_work is not None:
+            self._unit_of_work.discard()
+        self._identity_map.clear()
         self._database.rollback()
 
 
@@ -75,8 +377,12 @@ class DBContext(ABC):
 #                                  SOURCE DBCONTEXT                                                #
 # ------------------------------------------------------------------------------------------------ #
 class SourceDBContext(DBContext):
-    def __init__(self, database: Database) -> None:
-        super(SourceDBContext, self).__init__(database=database)
+    def __init__(
+        self, database: Database, max_entities: int = None, write_mode: str = "immediate"
+    ) -> None:
+        super(SourceDBContext, self).__init__(
+            database=database, max_entities=max_entities, write_mode=write_mode
+        )
         self._mapper = SourceMapper()
 
 
@@ -84,8 +390,12 @@ class SourceDBContext(DBContext):
 #                                    DBCONTEXT FILE                                                #
 # ------------------------------------------------------------------------------------------------ #
 class FileDBContext(DBContext):
-    def __init__(self, database: Database) -> None:
-        super(FileDBContext, self).__init__(database=database)
+    def __init__(
+        self, database: Database, max_entities: int = None, write_mode: str = "immediate"
+    ) -> None:
+        super(FileDBContext, self).__init__(
+            database=database, max_entities=max_entities, write_mode=write_mode
+        )
         self._mapper = FileMapper()
 
 
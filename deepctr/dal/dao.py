@@ -78,6 +78,7 @@ class DAO(DAOBase):
         super(DAO, self).__init__(dbcontext=dbcontext)
         self._database = self._dbcontext.database
         self._mapper = self._dbcontext.mapper
+        self._identity_map = self._dbcontext.identity_map
 
     def add(self, entity: Entity) -> Entity:
         """Adds an entity to the database
@@ -86,11 +87,43 @@ class DAO(DAOBase):
             entity (Entity): The entity to add to the database
 
         Returns
-            Entity with the id updated with id from the database.
+            Entity with the id updated with id from the database. If the context buffers
+            writes, the id is assigned when the context is flushed.
         """
+        if self._dbcontext.buffered:
+            self._dbcontext.register_new(entity)
+            return entity
         command = self._mapper.insert(entity)
         entity.id = self._database.insert(command.statement, command.parameters)
-        return entity
+        return self._identity_map.put(entity)
+
+    def add_many(self, entities: list, batch_size: int = 1000) -> list:
+        """Adds entities to the database in batches, inside one transaction.
+
+        Args:
+            entities (list): The entities to add to the database
+            batch_size (int): Entities per INSERT statement. Default = 1000
+
+        Returns
+            The entities, with their ids updated with ids from the database. If the context
+            buffers writes, the ids are assigned when the context is flushed.
+        """
+        if not entities:
+            return entities
+        if self._dbcontext.buffered:
+            for entity in entities:
+                self._dbcontext.register_new(entity)
+            return entities
+        commands = [self._mapper.insert(entity) for entity in entities]
+        ids = self._database.insert_many(
+            commands[0].statement,
+            [command.parameters for command in commands],
+            batch_size=batch_size,
+        )
+        for entity, id in zip(entities, ids):
+            entity.id = id
+            self._identity_map.put(entity)
+        return entities
 
     def find(self, id: int) -> dict:
         """Finds an entity based on the id and returns it as an entity dataclass.
@@ -98,25 +131,47 @@ class DAO(DAOBase):
         Args:
             id (int): The id that uniquely identifies an entity
 
+        Entities already loaded through the context are returned from its identity map.
+
         Returns a dictionary containing data for the specified row.
         """
+        entity = self._identity_map.get(id)
+        if entity is not None:
+            return entity
 
         command = self._mapper.select(id)
         record = self._database.select_one(command.statement, command.parameters)
         if record is None:
             return record
         else:
-            return self._mapper.factory(record)
+            return self._identity_map.put(self._mapper.factory(record))
 
     def findall(self, todf: bool = False) -> list:
-        """Returns all entities from the designated entity table."""
+        """Returns all entities from the designated entity table.
+
+        Args:
+            todf (bool): If True, the rows are streamed into a pandas DataFrame, one column
+                per field, without building entities.
+        """
         command = self._mapper.select_all()
-        entities = []
-        records = self._database.select_all(command.statement)
-        for record in records:
-            entity = self._mapper.factory(record)
-            entities.append(entity)
-        return entities
+        if todf:
+            return self._database.select_df(command.statement)
+        return [self._identity_map.put(entity) for entity in self.iterate()]
+
+    def iterate(self, batch_size: int = 1000):
+        """Yields the entities in the designated entity table, one at a time.
+
+        Rows are streamed from a server-side cursor, batch_size at a time, and entities are
+        built as they are consumed, so large tables are never held in memory at once.
+        Entities in the identity map are reused, but new ones are not added to it.
+
+        Args:
+            batch_size (int): Rows fetched per round trip. Default = 1000
+        """
+        command = self._mapper.select_all()
+        for records in self._database.select_batches(command.statement, batch_size=batch_size):
+            for record in records:
+                yield self._identity_map.get(record["id"]) or self._mapper.factory(record)
 
     def update(self, entity: Entity) -> None:
         """Updates the entity
@@ -125,9 +180,38 @@ class DAO(DAOBase):
             entity (Entity): The entity to update. The entity is overwritten.
 
         """
+        self._identity_map.remove(entity.id)
+        if self._dbcontext.buffered:
+            return self._dbcontext.register_dirty(entity)
         command = self._mapper.update(entity)
         return self._database.execute(command.statement, command.parameters)
 
+    def update_many(self, entities: list, batch_size: int = 1000) -> int:
+        """Updates entities in batches, inside one transaction, and returns the rows updated.
+
+        If the context buffers writes, the updates are written when the context is flushed,
+        and 0 is returned.
+
+        Args:
+            entities (list): The entities to update. The entities are overwritten.
+            batch_size (int): Entities per batch. Default = 1000
+
+        """
+        if not entities:
+            return 0
+        for entity in entities:
+            self._identity_map.remove(entity.id)
+        if self._dbcontext.buffered:
+            for entity in entities:
+                self._dbcontext.register_dirty(entity)
+            return 0
+        commands = [self._mapper.update(entity) for entity in entities]
+        return self._database.execute_many(
+            commands[0].statement,
+            [command.parameters for command in commands],
+            batch_size=batch_size,
+        )
+
     def delete(self, id: int) -> None:
         """Removes an entity from the database based upon id
 
@@ -135,6 +219,9 @@ class DAO(DAOBase):
             id (int): The unique identifier for the entity
 
         """
+        self._identity_map.remove(id)
+        if self._dbcontext.buffered:
+            return self._dbcontext.register_deleted(id)
         command = self._mapper.delete(id)
         return self._database.execute(command.statement, command.parameters)
 
@@ -16,14 +16,17 @@
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
 import os
+import json
 import shutil
 import logging
+import pandas as pd
+from typing import Union
 from dataclasses import dataclass
 from datetime import datetime
 from pyspark.sql import DataFrame
 
 from deepctr.dal.base import Entity, EntityMapper, Validator
-from deepctr.data.local import SparkCSV, SparkParquet
+from deepctr.data.local import SparkCSV, SparkParquet, ArrowCSV, ArrowParquet
 from deepctr.utils.log_config import LOG_CONFIG
 
 # ------------------------------------------------------------------------------------------------ #
@@ -33,7 +36,18 @@ logger = logging.getLogger(__name__)
 #                                         FILE                                                     #
 # ------------------------------------------------------------------------------------------------ #
 class File(Entity):
-    """Defines a file object"""
+    """Defines a file object
+
+    Files are read through Spark by default. Arrow is opt-in: it avoids JVM startup and
+    returns pandas DataFrames. The backend is 'spark', 'arrow' or 'auto', in which case files
+    smaller than File.arrow_max_size are read with Arrow. Writes use the backend that matches
+    the DataFrame written.
+
+    write_options holds default arguments for the writer, such as compression, dictionary
+    or partition_by. Options passed to write take precedence. Both are persisted with the file.
+    """
+
+    arrow_max_size = 256 * 1024 ** 2
 
     def __init__(
         self,
@@ -49,6 +63,8 @@ class File(Entity):
         created=None,
         modified=None,
         accessed=None,
+        backend: str = "spark",
+        write_options: dict = None,
     ) -> None:
         super(File, self).__init__(
             name=name, desc=desc, id=id, created=created, modified=modified, accessed=accessed
@@ -59,6 +75,8 @@ class File(Entity):
         self._compressed = compressed
         self._filepath = filepath
         self._size = size
+        self._backend = backend
+        self._write_options = write_options or {}
 
         self._validate()
         self._set_filepath()
@@ -92,16 +110,25 @@ class File(Entity):
     def size(self) -> str:
         return self._size
 
-    def read(self) -> DataFrame:
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def write_options(self) -> dict:
+        return self._write_options
+
+    def read(self, **kwargs) -> DataFrame:
         io = self._get_io()
-        data = io.read(self._filepath)
+        data = io.read(self._filepath, **kwargs)
         self._accessed = datetime.now()
         self._set_file_dates()
         return data
 
-    def write(self, data: DataFrame) -> None:
-        io = self._get_io()
-        io.write(data=data, filepath=self._filepath)
+    def write(self, data: Union[pd.DataFrame, DataFrame], **kwargs) -> None:
+        io = self._get_io(data=data)
+        options = {**self._write_options, **kwargs}
+        io.write(data=data, filepath=self._filepath, **options)
         self._accessed = datetime.now()
         self._set_size()
         self._set_file_dates()
@@ -129,15 +156,38 @@ class File(Entity):
             "created": self._created,
             "modified": self._modified,
             "accessed": self._accessed,
+            "backend": self._backend,
+            "write_options": self._write_options,
         }
 
     def _validate(self) -> None:
         validate = Validator()
         validate.format(self._format)
-
-    def _get_io(self) -> None:
+        validate.backend(self._backend)
+
+    def _get_io(self, data: Union[pd.DataFrame, DataFrame] = None) -> None:
+        backend = self._backend
+        if data is not None:
+            backend = "arrow" if isinstance(data, pd.DataFrame) else "spark"
+        elif backend == "auto":
+            size = self._size or self._get_size()
+            backend = "arrow" if 0 < size < File.arrow_max_size else "spark"
+        if backend == "arrow":
+            return ArrowCSV() if "csv" in self._format else ArrowParquet()
         return SparkCSV() if "csv" in self._format else SparkParquet()
 
+    def _get_size(self) -> int:
+        """Returns the size of the file, or of all files in a folder written by Spark."""
+        if os.path.isdir(self._filepath):
+            return sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, names in os.walk(self._filepath)
+                for name in names
+            )
+        if os.path.exists(self._filepath):
+            return os.path.getsize(self._filepath)
+        return 0
+
     def _set_filepath(self) -> None:
         if not self._filepath:
             self._filename = self._filename if self._filename else self._name + "." + self._format
@@ -170,10 +220,11 @@ class FileInsert:
         self.statement = """
             INSERT INTO `file`
             (`name`, `desc`, `folder`, `format`, `filename`, `filepath`,
-            `compressed`, `size`, `created`, `modified`,`accessed`)
+            `compressed`, `size`, `created`, `modified`,`accessed`,
+            `backend`, `write_options`)
             VALUES (%s, %s, %s, %s, %s,
                     %s, %s, %s, %s, %s,
-                    %s);
+                    %s, %s, %s);
             """
         self.parameters = (
             self.entity.name,
@@ -187,6 +238,8 @@ class FileInsert:
             self.entity.created,
             self.entity.modified,
             self.entity.accessed,
+            self.entity.backend,
+            json.dumps(self.entity.write_options),
         )
 
 
@@ -238,7 +291,9 @@ class FileUpdate:
                                 `size` = %s,
                                 `created` = %s,
                                 `modified` = %s,
-                                `accessed` = %s
+                                `accessed` = %s,
+                                `backend` = %s,
+                                `write_options` = %s
                             WHERE `id`= %s;"""
 
         self.parameters = (
@@ -253,7 +308,9 @@ class FileUpdate:
             self.entity.created,
             self.entity.modified,
             self.entity.accessed,
-            self.id,
+            self.entity.backend,
+            json.dumps(self.entity.write_options),
+            self.entity.id,
         )
 
 
@@ -292,6 +349,8 @@ class FileMapper(EntityMapper):
             created=record["created"],
             modified=record["modified"],
             accessed=record["accessed"],
+            backend=record["backend"],
+            write_options=json.loads(record["write_options"] or "{}"),
         )
 
         return file
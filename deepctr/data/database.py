@@ -16,11 +16,18 @@
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
 from dataclasses import dataclass
+from collections import deque
+from contextlib import contextmanager
 import os
+import re
+import time
+import threading
 import logging
 import logging.config
 from dotenv import load_dotenv
+import pandas as pd
 import pymysql
+from pymysql.constants import SERVER_STATUS
 
 from deepctr.utils.log_config import LOG_CONFIG
 
@@ -28,6 +35,12 @@ from deepctr.utils.log_config import LOG_CONFIG
 logging.config.dictConfig(LOG_CONFIG)
 logger = logging.getLogger(__name__)
 # ------------------------------------------------------------------------------------------------ #
+# Splits an INSERT into the text before, the row of placeholders and the text after the VALUES row
+INSERT_VALUES = re.compile(
+    r"^(\s*INSERT\b.+\bVALUES\s*)(\((?:\s*%s\s*,)*\s*%s\s*\))(\s*;?\s*)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# ------------------------------------------------------------------------------------------------ #
 
 
 @dataclass
@@ -46,7 +59,19 @@ class DBConfig:
 
 
 class ConnectionFactory:
-    """MySQL database connections context manager."""
+    """MySQL database connections context manager.
+
+    get_connection returns a single connection owned by the factory. Code running tasks
+    concurrently should share a ConnectionPool from get_pool instead. The .env file is read
+    once per process.
+
+    Args:
+        database (str): Name of the database. Defaults to the DATABASE environment variable.
+    """
+
+    __pools = {}
+    __lock = threading.Lock()
+    __dotenv_loaded = False
 
     def __init__(self, database: str = None) -> None:
         self._database = database
@@ -61,9 +86,26 @@ class ConnectionFactory:
             self._connection.close()
             return self._create()
 
-    def _create(self) -> pymysql.connect:
+    def get_pool(self, **kwargs) -> "ConnectionPool":
+        """Returns the process-wide connection pool for the database, creating it on first use.
+
+        Args:
+            kwargs (dict): Arguments to ConnectionPool, used when the pool is created.
+        """
+        with ConnectionFactory.__lock:
+            pool = ConnectionFactory.__pools.get(self._database)
+            if pool is None or pool.closed:
+                pool = ConnectionPool(factory=self, **kwargs)
+                ConnectionFactory.__pools[self._database] = pool
+            return pool
+
+    def create(self) -> pymysql.connect:
+        """Opens and returns a new connection, which the caller owns."""
+        with ConnectionFactory.__lock:
+            if not ConnectionFactory.__dotenv_loaded:
+                load_dotenv()
+                ConnectionFactory.__dotenv_loaded = True
 
-        load_dotenv()
         host = os.getenv("HOST")
         user = os.getenv("USER")
         password = os.getenv("PASSWORD")
@@ -71,7 +113,7 @@ class ConnectionFactory:
         database = self._database if self._database is not None else os.getenv("DATABASE")
 
         try:
-            self._connection = pymysql.connect(
+            connection = pymysql.connect(
                 host=host,
                 user=user,
                 password=password,
@@ -83,35 +125,318 @@ class ConnectionFactory:
         except pymysql.MySQLError as e:
             logger.error("Execute error %d: %s" % (e.args[0], e.args[1]))
             raise ConnectionError(e)
+        return connection
+
+    def _create(self) -> pymysql.connect:
+        self._connection = self.create()
         return self._connection
 
 
+# ------------------------------------------------------------------------------------------------ #
+#                                     CONNECTION POOL                                              #
+# ------------------------------------------------------------------------------------------------ #
+class ConnectionPool:
+    """Bounded, thread-safe pool of MySQL connections.
+
+    Connections are checked out with acquire, or the connection context manager, and
+    checked back in with release. At most max_size connections are open at once; callers
+    beyond that wait up to timeout seconds for one to be checked in, then get a TimeoutError.
+    Connections idle for longer than ping_interval are pinged before reuse, and those idle
+    for longer than idle_timeout are closed, down to min_size. Uncommitted work on a
+    connection is rolled back when it is checked in.
+
+    Args:
+        factory (ConnectionFactory): Creates the connections. Default = ConnectionFactory()
+        min_size (int): Number of idle connections kept open. Default = 1
+        max_size (int): Maximum number of open connections. Default = 8
+        timeout (float): Seconds to wait for a connection. Default = 30
+        idle_timeout (float): Seconds after which an idle connection is closed. Default = 300
+        ping_interval (float): Seconds after which an idle connection is pinged before reuse.
+            Default = 30
+    """
+
+    def __init__(
+        self,
+        factory: ConnectionFactory = None,
+        min_size: int = 1,
+        max_size: int = 8,
+        timeout: float = 30,
+        idle_timeout: float = 300,
+        ping_interval: float = 30,
+    ) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            msg = "Invalid pool size. min_size={}, max_size={}".format(min_size, max_size)
+            logger.error(msg)
+            raise ValueError(msg)
+        self._factory = factory or ConnectionFactory()
+        self._min_size = min_size
+        self._max_size = max_size
+        self._timeout = timeout
+        self._idle_timeout = idle_timeout
+        self._ping_interval = ping_interval
+        self._idle = deque()  # (connection, released), most recently released on the right
+        self._size = 0
+        self._closed = False
+        self._available = threading.Condition(threading.Lock())
+        self._metrics = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time": 0.0,
+            "max_wait_time": 0.0,
+            "timeouts": 0,
+            "created": 0,
+            "discarded": 0,
+        }
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def metrics(self) -> dict:
+        """Pool size and checkout counts. Times are in seconds.
+
+        waits counts the checkouts that found no connection available, and wait_time sums
+        the time all checkouts took, including opening and pinging connections.
+        """
+        with self._available:
+            metrics = dict(self._metrics)
+            metrics["size"] = self._size
+            metrics["idle"] = len(self._idle)
+            metrics["in_use"] = self._size - len(self._idle)
+        checkouts = metrics["checkouts"]
+        metrics["mean_wait_time"] = metrics["wait_time"] / checkouts if checkouts else 0.0
+        return metrics
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        """Checks out a connection for the duration of a with block."""
+        connection = self.acquire(timeout=timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def acquire(self, timeout: float = None) -> pymysql.connect:
+        """Checks out a connection, waiting up to timeout seconds for one to be available.
+
+        Args:
+            timeout (float): Seconds to wait. Defaults to the timeout of the pool.
+
+        Raises:
+            TimeoutError if no connection is available in time.
+        """
+        timeout = self._timeout if timeout is None else timeout
+        requested = time.monotonic()
+        while True:
+            connection, released = self._checkout(deadline=requested + timeout, timeout=timeout)
+            if connection is None:
+                connection = self._open()
+            elif not self._is_healthy(connection, released):
+                self._discard(connection)
+                continue
+
+            waited = time.monotonic() - requested
+            with self._available:
+                self._metrics["checkouts"] += 1
+                self._metrics["wait_time"] += waited
+                self._metrics["max_wait_time"] = max(self._metrics["max_wait_time"], waited)
+            return connection
+
+    def release(self, connection: pymysql.connect) -> None:
+        """Checks a connection back in, rolling back any uncommitted work."""
+        if self._closed or not connection.open:
+            self._discard(connection)
+            return
+        try:
+            if connection.server_status & SERVER_STATUS.SERVER_STATUS_IN_TRANS:
+                connection.rollback()
+        except pymysql.MySQLError:
+            self._discard(connection)
+            return
+
+        with self._available:
+            self._idle.append((connection, time.monotonic()))
+            expired = self._get_expired()
+            self._available.notify()
+        for connection in expired:
+            self._discard(connection)
+
+    def close(self) -> None:
+        """Closes the idle connections. Connections in use are closed when checked in."""
+        with self._available:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._available.notify_all()
+        for connection in idle:
+            self._discard(connection)
+
+    def _checkout(self, deadline: float, timeout: float) -> tuple:
+        """Returns an idle connection and when it was released, or (None, None) if a new one
+        may be opened."""
+        waited = False
+        with self._available:
+            while True:
+                if self._closed:
+                    raise ConnectionError("The connection pool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._size < self._max_size:
+                    self._size += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    msg = "No connection available after waiting {:.1f} seconds.".format(timeout)
+                    logger.error(msg)
+                    raise TimeoutError(msg)
+                if not waited:
+                    self._metrics["waits"] += 1
+                    waited = True
+                self._available.wait(remaining)
+
+    def _open(self) -> pymysql.connect:
+        try:
+            connection = self._factory.create()
+        except Exception:
+            with self._available:
+                self._size -= 1
+                self._available.notify()
+            raise
+        with self._available:
+            self._metrics["created"] += 1
+        return connection
+
+    def _is_healthy(self, connection: pymysql.connect, released: float) -> bool:
+        idle = time.monotonic() - released
+        if not connection.open or idle > self._idle_timeout:
+            return False
+        if idle > self._ping_interval:
+            try:
+                connection.ping(reconnect=False)
+            except pymysql.MySQLError:
+                return False
+        return True
+
+    def _get_expired(self) -> list:
+        """Removes and returns the connections idle for longer than idle_timeout, keeping
+        min_size. Called with the lock held."""
+        expired = []
+        now = time.monotonic()
+        while (
+            self._idle
+            and len(self._idle) > self._min_size
+            and now - self._idle[0][1] > self._idle_timeout
+        ):
+            expired.append(self._idle.popleft()[0])
+        return expired
+
+    def _discard(self, connection: pymysql.connect) -> None:
+        try:
+            connection.close()
+        except pymysql.MySQLError:
+            pass
+        with self._available:
+            self._size -= 1
+            self._metrics["discarded"] += 1
+            self._available.notify()
+
+
 # ------------------------------------------------------------------------------------------------ #
 class Database:
-    """Class responsible for direct access to database."""
+    """Class responsible for direct access to database.
+
+    The database either uses the connection given, or checks connections out of a pool.
+    With a pool, each thread gets its own connection on its first statement and keeps it
+    until it commits, rolls back or closes, which check it back in.
+
+    Transactions begun through begin_transaction are tracked per thread until commit,
+    rollback or close. Since connections run with autocommit off, the server reports a
+    transaction as open after any statement, so its status can't tell whether a caller
+    began one.
 
-    def __init__(self, connection: pymysql.connections.Connection) -> None:
+    Args:
+        connection (pymysql.connections.Connection): Connection to the database
+        pool (ConnectionPool): Pool to check connections out of, in place of a connection
+    """
+
+    def __init__(
+        self, connection: pymysql.connections.Connection = None, pool: ConnectionPool = None
+    ) -> None:
         self._connection = connection
+        self._pool = pool
+        self._local = threading.local()
+
+    @property
+    def pooled(self) -> bool:
+        return self._pool is not None
+
+    @property
+    def in_transaction(self) -> bool:
+        """True if the current thread began a transaction that it has not yet ended."""
+        return getattr(self._local, "transaction", False)
+
+    def _get_connection(self) -> pymysql.connections.Connection:
+        if self._pool is None:
+            return self._connection
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._pool.acquire()
+            self._local.connection = connection
+        return connection
+
+    def _release(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            self._local.connection = None
+            self._pool.release(connection)
 
     def _insert(self, statement, parameters=None):
         try:
-            cursor = self._connection.cursor()
+            cursor = self._get_connection().cursor()
             cursor.execute(statement, parameters)
-            statement = "SELECT LAST_INSERT_ID();"
-            return cursor.execute(statement)
+            return cursor.lastrowid
+        except pymysql.err.MySQLError as e:
+            logger.error("Execute error %d: %s" % (e.args[0], e.args[1]))
+
+    def _get_auto_increment_increment(self, cursor) -> int:
+        """Returns the step between auto-increment values in the cursor's session."""
+        cursor.execute("SELECT @@auto_increment_increment AS `increment`;")
+        row = cursor.fetchone()
+        return int(row["increment"] if isinstance(row, dict) else row[0])
+
+    def _execute_batches(self, execute, parameters: list, batch_size: int) -> list:
+        """Calls execute on each batch of parameters inside one transaction, and returns the
+        results. If a transaction is already open, the caller commits or rolls it back."""
+        owned = not self.in_transaction
+        try:
+            if owned:
+                self.begin_transaction()
+            cursor = self._get_connection().cursor()
+            results = [
+                execute(cursor, parameters[i : i + batch_size])
+                for i in range(0, len(parameters), batch_size)
+            ]
+            if owned:
+                self.commit()
+            return results
         except pymysql.err.MySQLError as e:
             logger.error("Execute error %d: %s" % (e.args[0], e.args[1]))
+            if owned:
+                self.rollback()
+            raise
 
     def _execute(self, statement, parameters=None):
         try:
-            cursor = self._connection.cursor()
+            cursor = self._get_connection().cursor()
             return cursor.execute(statement, parameters)
         except pymysql.err.MySQLError as e:
             logger.error("Execute error %d: %s" % (e.args[0], e.args[1]))
 
     def _query(self, statement, parameters=None):
         try:
-            cursor = self._connection.cursor()
+            cursor = self._get_connection().cursor()
             cursor.execute(statement, parameters)
             return cursor
         except pymysql.err.MySQLError as e:
@@ -123,13 +448,16 @@ class Database:
         Args:
             statement (str): The SQL query statement
             parameters (tuple): The parameters for the query
+            todf (bool): If True, the rows are streamed into a pandas DataFrame.
 
         Returns:
-            Single row of data
+            List of rows, or a DataFrame if todf is True
 
         Raises:
             MySQL Error if execute is not successful.
         """
+        if todf:
+            return self.select_df(statement=statement, parameters=parameters)
         cursor = self._query(statement=statement, parameters=parameters)
         return cursor.fetchall()
 
@@ -139,14 +467,66 @@ class Database:
         Args:
             statement (str): The SQL query statement
             parameters (tuple): The parameters for the query
+            todf (bool): If True, the rows are streamed into a pandas DataFrame.
 
         Returns:
-            Single row of data
+            List of rows, or a DataFrame if todf is True
 
         Raises:
             MySQL Error if execute is not successful.
         """
-        return self.select(statement=statement, parameters=parameters)
+        return self.select(statement=statement, parameters=parameters, todf=todf)
+
+    def select_batches(self, statement: str, parameters: tuple = None, batch_size: int = 1000):
+        """Select query that yields the rows in batches from a server-side cursor.
+
+        Rows are streamed from the server batch_size at a time, so only one batch is held in
+        client memory. The connection cannot run other statements until the generator is
+        exhausted or closed.
+
+        Args:
+            statement (str): The SQL query statement
+            parameters (tuple): The parameters for the query
+            batch_size (int): Rows fetched per round trip. Default = 1000
+
+        Yields:
+            Lists of up to batch_size rows
+
+        Raises:
+            MySQL Error if execute is not successful.
+        """
+        cursor = self._get_connection().cursor(pymysql.cursors.SSDictCursor)
+        try:
+            cursor.execute(statement, parameters)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except pymysql.err.MySQLError as e:
+            logger.error("Execute error %d: %s" % (e.args[0], e.args[1]))
+            raise
+        finally:
+            cursor.close()
+
+    def select_df(
+        self, statement: str, parameters: tuple = None, batch_size: int = 10000
+    ) -> pd.DataFrame:
+        """Select query that streams the rows into a pandas DataFrame, batch by batch.
+
+        Args:
+            statement (str): The SQL query statement
+            parameters (tuple): The parameters for the query
+            batch_size (int): Rows fetched per round trip. Default = 10000
+
+        Raises:
+            MySQL Error if execute is not successful.
+        """
+        frames = [
+            pd.DataFrame.from_records(rows)
+            for rows in self.select_batches(statement, parameters, batch_size=batch_size)
+        ]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
 
     def select_one(self, statement: str, parameters: tuple = None) -> dict:
         """Select query that returns one row.
@@ -199,6 +579,64 @@ class Database:
 
         return self._insert(statement=statement, parameters=parameters)
 
+    def insert_many(self, statement: str, parameters: list, batch_size: int = 1000) -> list:
+        """Inserts many rows and returns their primary keys, in order.
+
+        Rows are sent batch_size at a time as one multi-row INSERT, inside one transaction,
+        so n rows cost n / batch_size round trips and a single commit. The keys assume
+        auto-increment values within a statement are evenly spaced, which InnoDB guarantees
+        for inserts whose row count is known in advance. The spacing is the session's
+        auto_increment_increment, which replication setups often set above 1.
+
+        Args:
+            statement (str): Single row INSERT statement, with %s placeholders
+            parameters (list): The parameters for each row
+            batch_size (int): Rows per INSERT statement. Default = 1000
+
+        Raises:
+            ValueError if the statement is not a single row INSERT.
+            MySQL Error if execute is not successful. The transaction is rolled back.
+        """
+        match = INSERT_VALUES.match(statement)
+        if match is None:
+            msg = "Expected a single row INSERT ... VALUES (...) statement."
+            logger.error(msg)
+            raise ValueError(msg)
+        prefix, row, suffix = match.groups()
+        increment = []
+
+        def insert(cursor, batch: list) -> list:
+            if not increment:
+                increment.append(self._get_auto_increment_increment(cursor))
+            step = increment[0]
+            statement = prefix + ", ".join([row] * len(batch)) + suffix
+            cursor.execute(statement, [value for parameters in batch for value in parameters])
+            return list(range(cursor.lastrowid, cursor.lastrowid + len(batch) * step, step))
+
+        batches = self._execute_batches(insert, parameters=list(parameters), batch_size=batch_size)
+        return [id for ids in batches for id in ids]
+
+    def execute_many(self, statement: str, parameters: list, batch_size: int = 1000) -> int:
+        """Executes a command, such as an UPDATE, for many rows and returns the rows affected.
+
+        The command runs through cursor.executemany in batches inside one transaction, so the
+        rows share a single commit.
+
+        Args:
+            statement (str): The SQL statement
+            parameters (list): The parameters for each row
+            batch_size (int): Rows per call to executemany. Default = 1000
+
+        Raises:
+            MySQL Error if execute is not successful. The transaction is rolled back.
+        """
+
+        def execute(cursor, batch: list) -> int:
+            return cursor.executemany(statement, batch)
+
+        batches = self._execute_batches(execute, parameters=list(parameters), batch_size=batch_size)
+        return sum(rows or 0 for rows in batches)
+
     def execute(self, statement: str, parameters: tuple = None):
         """Executes a command that changes the data.
 
@@ -216,13 +654,25 @@ class Database:
         return self._execute(statement=statement, parameters=parameters)
 
     def begin_transaction(self) -> None:
-        self._connection.begin()
+        self._get_connection().begin()
+        self._local.transaction = True
 
     def rollback(self) -> None:
-        self._connection.rollback()
+        self._local.transaction = False
+        self._get_connection().rollback()
+        if self._pool is not None:
+            self._release()
 
     def commit(self) -> None:
-        self._connection.commit()
+        self._local.transaction = False
+        self._get_connection().commit()
+        if self._pool is not None:
+            self._release()
 
     def close(self) -> None:
-        self._connection.close()
+        """Closes the connection, or checks it back into the pool."""
+        self._local.transaction = False
+        if self._pool is not None:
+            self._release()
+        else:
+            self._connection.close()
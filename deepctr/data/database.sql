@@ -50,6 +50,8 @@ CREATE TABLE `file` (
     `created` DATETIME(6) NOT NULL,
     `modified` DATETIME(6) NOT NULL,
     `accessed` DATETIME(6) NOT NULL,
+    `backend` VARCHAR(8) NOT NULL DEFAULT 'spark',
+    `write_options` TEXT NULL,
     PRIMARY KEY (`id`),
     UNIQUE (`id`)
 ) ENGINE=InnoDB;
@@ -20,17 +20,30 @@
 """Reading and writing dataframes with progress bars"""
 from abc import ABC, abstractmethod
 import os
+import csv
+import shutil
+import json
+import math
+import mmap
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import pandas as pd
 import logging.config
 import pyspark
 from pyspark.sql import SparkSession, DataFrame
+from pyspark.sql import functions as F
+from pyspark.sql.types import StructType
 import findspark
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from typing import Union
 
 from deepctr.data.base import Metadata
+from deepctr.utils.spark import get_size_spark
 from deepctr.utils.log_config import LOG_CONFIG
 
 findspark.init()
@@ -41,6 +54,316 @@ logging.getLogger("py4j").setLevel(logging.ERROR)
 logger = logging.getLogger(__name__)
 
 
+# ------------------------------------------------------------------------------------------------ #
+#                                    SPARK SESSION PROVIDER                                        #
+# ------------------------------------------------------------------------------------------------ #
+
+
+class SparkSessionProvider:
+    """Process-wide SparkSession, configured once and shared by the IO classes and operators.
+
+    The session is created on first use with the configuration current at that time. Call
+    configure before the first read or write to change it; once the session exists, changes
+    only take effect after stop.
+    """
+
+    __config = {
+        "cores": 18,
+        "memory": "16g",
+        "shuffle_partitions": 36,
+        "arrow": True,
+        "log_level": "ERROR",
+    }
+    __session = None
+    __lock = threading.Lock()
+
+    def configure(
+        self,
+        cores: int = None,
+        memory: str = None,
+        shuffle_partitions: int = None,
+        arrow: bool = None,
+        log_level: str = None,
+    ) -> None:
+        """Sets the configuration used when the session is created.
+
+        Args:
+            cores (int): The number of CPU cores used by local Spark. Default = 18
+            memory (str): Driver memory, e.g. '16g'. Default = '16g'
+            shuffle_partitions (int): Partitions used for shuffles. Spark's default of 200 is
+                sized for clusters; a small multiple of cores suits local mode. Default = 36
+            arrow (bool): True to use Arrow for conversions to and from pandas. Default = True
+            log_level (str): Spark log level. Default = 'ERROR'
+        """
+        settings = {
+            "cores": cores,
+            "memory": memory,
+            "shuffle_partitions": shuffle_partitions,
+            "arrow": arrow,
+            "log_level": log_level,
+        }
+        with SparkSessionProvider.__lock:
+            for key, value in settings.items():
+                if value is not None:
+                    SparkSessionProvider.__config[key] = value
+            if SparkSessionProvider.__session is not None:
+                logger.warning("SparkSession already started. Configuration applies after stop.")
+
+    def get_session(self) -> SparkSession:
+        """Returns the shared SparkSession, creating it on first use."""
+        with SparkSessionProvider.__lock:
+            if SparkSessionProvider.__session is None:
+                SparkSessionProvider.__session = self._create()
+            return SparkSessionProvider.__session
+
+    def stop(self) -> None:
+        """Stops the shared SparkSession. The next get_session creates a new one."""
+        with SparkSessionProvider.__lock:
+            if SparkSessionProvider.__session is not None:
+                SparkSessionProvider.__session.stop()
+                SparkSessionProvider.__session = None
+
+    def _create(self) -> SparkSession:
+        config = SparkSessionProvider.__config
+        local = "local[" + str(config["cores"]) + "]"
+        spark = (
+            SparkSession.builder.master(local)
+            .appName("DeepCTR")
+            .config("spark.driver.memory", config["memory"])
+            .config("spark.sql.shuffle.partitions", str(config["shuffle_partitions"]))
+            .config("spark.sql.execution.arrow.pyspark.enabled", str(config["arrow"]).lower())
+            .getOrCreate()
+        )
+        spark.sparkContext.setLogLevel(config["log_level"])
+        logger.info("SparkSession started with {} cores.".format(config["cores"]))
+        return spark
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                         CSV ROW COUNTER                                          #
+# ------------------------------------------------------------------------------------------------ #
+
+
+def _count_newlines(filepath: str, start: int, end: int, blocksize: int) -> int:
+    """Counts newline bytes in the byte range [start, end) of a file, one block at a time."""
+    count = 0
+    with open(filepath, "rb") as f:
+        with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(start, end, blocksize):
+                count += mm[offset : min(offset + blocksize, end)].count(b"\n")
+    return count
+
+
+class CSVRowCounter:
+    """Counts the rows and columns of a CSV file without parsing it.
+
+    Newlines are counted over memory mapped blocks of the file, with large files split into
+    byte ranges counted in parallel processes. Columns are taken from the first line. The
+    result is cached in a sidecar file next to the data, keyed by the size and modification
+    time of each file and by the header and delimiter, so repeated calls on unchanged data
+    only read the sidecar.
+
+    Rows are counted as lines, so quoted fields containing newlines are not supported. Spark
+    writes a CSV 'file' as a folder of part files; these are counted together, each with its
+    own header.
+
+    Args:
+        max_workers (int): Number of processes used for large files. Default = number of CPUs
+        blocksize (int): Bytes counted at a time. Default = 16MB
+        parallel_threshold (int): Files smaller than this are counted in process. Default = 256MB
+    """
+
+    __suffix = ".rows.json"
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        blocksize: int = 16 * 1024 ** 2,
+        parallel_threshold: int = 256 * 1024 ** 2,
+    ) -> None:
+        self._max_workers = max_workers or os.cpu_count()
+        self._blocksize = blocksize
+        self._parallel_threshold = parallel_threshold
+
+    def count(self, filepath: str, header: bool = True, sep: str = ",") -> dict:
+        """Returns a dictionary containing the rows and cols of a CSV file or Spark CSV folder.
+
+        Args:
+            filepath (str): Path to the csv file or folder
+            header (bool): True if each file begins with a header row. Default = True
+            sep (str): Column delimiter. Default = ","
+        """
+        files = self._get_files(filepath)
+        key = [[os.path.basename(f), os.stat(f).st_size, os.stat(f).st_mtime_ns] for f in files]
+
+        cached = self._read_sidecar(filepath)
+        # The delimiter determines cols, so a count made with another sep is not reused.
+        if (
+            cached is not None
+            and cached["key"] == key
+            and cached["header"] == header
+            and cached.get("sep") == sep
+        ):
+            return {"rows": cached["rows"], "cols": cached["cols"]}
+
+        rows = 0
+        for file in files:
+            lines = self._count_lines(file)
+            rows += max(lines - 1, 0) if header else lines
+        cols = self._count_cols(files, sep=sep)
+
+        self._write_sidecar(
+            filepath, {"key": key, "header": header, "sep": sep, "rows": rows, "cols": cols}
+        )
+        return {"rows": rows, "cols": cols}
+
+    def _count_lines(self, filepath: str) -> int:
+        """Counts lines, including a final line without a trailing newline."""
+        size = os.path.getsize(filepath)
+        if size == 0:
+            return 0
+
+        if size < self._parallel_threshold or self._max_workers == 1:
+            newlines = _count_newlines(filepath, 0, size, self._blocksize)
+        else:
+            # Ranges are whole multiples of the blocksize so that workers read aligned blocks.
+            blocks = -(-size // self._blocksize)
+            step = -(-blocks // self._max_workers) * self._blocksize
+            with ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        _count_newlines, filepath, start, min(start + step, size), self._blocksize
+                    )
+                    for start in range(0, size, step)
+                ]
+                newlines = sum(future.result() for future in futures)
+
+        with open(filepath, "rb") as f:
+            f.seek(size - 1)
+            last = f.read(1)
+        return newlines if last == b"\n" else newlines + 1
+
+    def _count_cols(self, files: list, sep: str) -> int:
+        for file in files:
+            with open(file, "r", newline="") as f:
+                line = f.readline()
+            if line:
+                return len(next(csv.reader([line], delimiter=sep)))
+        return 0
+
+    def _get_files(self, filepath: str) -> list:
+        if os.path.isdir(filepath):
+            return sorted(
+                os.path.join(filepath, name)
+                for name in os.listdir(filepath)
+                if not name.startswith(("_", "."))
+                and os.path.isfile(os.path.join(filepath, name))
+            )
+        return [filepath]
+
+    def _get_sidecar(self, filepath: str) -> str:
+        filepath = filepath.rstrip(os.sep)
+        return os.path.join(
+            os.path.dirname(filepath), "." + os.path.basename(filepath) + CSVRowCounter.__suffix
+        )
+
+    def _read_sidecar(self, filepath: str) -> dict:
+        try:
+            with open(self._get_sidecar(filepath), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_sidecar(self, filepath: str, state: dict) -> None:
+        sidecar = self._get_sidecar(filepath)
+        try:
+            tmp = sidecar + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            # The sidecar is an optimization; read-only locations simply go uncached.
+            logger.warning("Unable to write row count sidecar {}: {}".format(sidecar, e))
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                           FILTERS                                                #
+# ------------------------------------------------------------------------------------------------ #
+# Filters are lists of [column, operator, value] conditions that must all hold, the form
+# pyarrow.parquet accepts. Spark translates them to Column expressions, which it pushes down
+# to Parquet row group statistics; Arrow uses them to skip row groups as well.
+OPERATORS = ["=", "==", "!=", "<", "<=", ">", ">=", "in", "not in"]
+
+
+def _validate_filters(filters: list) -> list:
+    filters = [tuple(condition) for condition in filters or []]
+    for condition in filters:
+        if len(condition) != 3 or condition[1] not in OPERATORS:
+            msg = "Invalid filter {}. Expected [column, operator, value] with operator in {}.".format(
+                list(condition), OPERATORS
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+    return filters
+
+
+def _to_spark_condition(filters: list) -> pyspark.sql.Column:
+    """Returns a Spark Column expression that is true where all conditions hold."""
+    expression = None
+    for column, op, value in _validate_filters(filters):
+        field = F.col(column)
+        if op in ("=", "=="):
+            condition = field == value
+        elif op == "!=":
+            condition = field != value
+        elif op == "<":
+            condition = field < value
+        elif op == "<=":
+            condition = field <= value
+        elif op == ">":
+            condition = field > value
+        elif op == ">=":
+            condition = field >= value
+        elif op == "in":
+            condition = field.isin(list(value))
+        else:
+            condition = ~field.isin(list(value))
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _to_arrow_mask(table: pa.Table, filters: list) -> pa.Array:
+    """Returns a boolean mask of the rows of an Arrow table where all conditions hold."""
+    functions = {
+        "=": pc.equal,
+        "==": pc.equal,
+        "!=": pc.not_equal,
+        "<": pc.less,
+        "<=": pc.less_equal,
+        ">": pc.greater,
+        ">=": pc.greater_equal,
+    }
+    mask = None
+    for column, op, value in _validate_filters(filters):
+        if op in functions:
+            condition = functions[op](table[column], value)
+        else:
+            condition = pc.is_in(table[column], value_set=pa.array(list(value)))
+            if op == "not in":
+                condition = pc.invert(condition)
+        mask = condition if mask is None else pc.and_(mask, condition)
+    return mask
+
+
+def _select(data: pyspark.sql.DataFrame, columns: list, filters: list) -> pyspark.sql.DataFrame:
+    """Applies filters then projects columns, leaving Spark to push both into the scan."""
+    if filters:
+        data = data.where(_to_spark_condition(filters))
+    if columns:
+        data = data.select(*columns)
+    return data
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                              IO                                                  #
 # ------------------------------------------------------------------------------------------------ #
@@ -65,26 +388,78 @@ class IO(ABC):
 # ------------------------------------------------------------------------------------------------ #
 #                                         SPARK PARQUET                                            #
 # ------------------------------------------------------------------------------------------------ #
+CODECS = ["none", "snappy", "gzip", "lz4", "zstd"]
+CODEC_LEVELS = {"zstd": "parquet.compression.codec.zstd.level", "gzip": "zlib.compress.level"}
+# Hadoop reads the zlib level as a ZlibCompressor.CompressionLevel name, not an integer.
+ZLIB_LEVELS = {
+    -1: "DEFAULT_COMPRESSION",
+    0: "NO_COMPRESSION",
+    1: "BEST_SPEED",
+    2: "TWO",
+    3: "THREE",
+    4: "FOUR",
+    5: "FIVE",
+    6: "SIX",
+    7: "SEVEN",
+    8: "EIGHT",
+    9: "BEST_COMPRESSION",
+}
+
+
+def _get_parquet_options(
+    compression: str, compression_level: int, dictionary: bool, column_options: dict
+) -> dict:
+    """Returns the Spark writer options, passed through to parquet-mr, for the settings given."""
+    if compression not in CODECS:
+        msg = "Codec {} is not supported. Valid codecs are {}.".format(compression, CODECS)
+        logger.error(msg)
+        raise ValueError(msg)
+
+    options = {"compression": compression, "parquet.enable.dictionary": str(dictionary).lower()}
+    if compression_level is not None:
+        if compression == "gzip":
+            if compression_level not in ZLIB_LEVELS:
+                msg = "Gzip compression level {} is not supported. Valid levels are {}.".format(
+                    compression_level, list(ZLIB_LEVELS.keys())
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+            options[CODEC_LEVELS[compression]] = ZLIB_LEVELS[compression_level]
+        elif compression in CODEC_LEVELS:
+            options[CODEC_LEVELS[compression]] = str(compression_level)
+        else:
+            logger.warning("Codec {} has no compression level. Ignored.".format(compression))
+
+    for column, settings in (column_options or {}).items():
+        if "dictionary" in settings:
+            options["parquet.enable.dictionary#" + column] = str(settings["dictionary"]).lower()
+        if "bloom_filter" in settings:
+            options["parquet.bloom.filter.enabled#" + column] = str(settings["bloom_filter"]).lower()
+    return options
 
 
 class SparkParquet(IO):
     """Reads, and writes Spark DataFrames to / from Parquet storage format.."""
 
-    def read(self, filepath: str, cores: int = 18) -> pyspark.sql.DataFrame:
+    def read(
+        self, filepath: str, columns: list = None, filters: list = None
+    ) -> pyspark.sql.DataFrame:
         """Reads a Spark DataFrame from Parquet file resource
 
         Args:
             filepath (str): The path to the parquet file resource
+            columns (list): Columns to read. Default = None, all columns
+            filters (list): [column, operator, value] conditions rows must meet. Row groups
+                whose statistics rule out a match, and partition folders, are skipped.
+                Default = None
 
         Returns:
             Spark DataFrame
         """
 
         if os.path.exists(filepath):
-            local = "local[" + str(cores) + "]"
-            spark = SparkSession.builder.master(local).appName("Read SparkParquet").getOrCreate()
-            spark.sparkContext.setLogLevel("ERROR")
-            return spark.read.parquet(filepath)
+            spark = SparkSessionProvider().get_session()
+            return _select(spark.read.parquet(filepath), columns=columns, filters=filters)
 
         else:
             logger.error("File {} was not found.".format(filepath))
@@ -96,18 +471,71 @@ class SparkParquet(IO):
         filepath: str,
         header: bool = True,
         mode: str = "overwrite",
+        partition_by: list = None,
+        target_file_size: int = None,
+        row_group_size: int = 128 * 1024 ** 2,
+        compression: str = "snappy",
+        compression_level: int = None,
+        dictionary: bool = True,
+        column_options: dict = None,
         **kwargs,
     ) -> None:
         """Writes Spark DataFrame to Parquet file resource
 
+        Given a target_file_size, the DataFrame is repartitioned so that each file holds about
+        that many bytes, based on get_size_spark's estimate, rather than inheriting the upstream
+        partitioning. With partition_by as well, rows are also clustered by the partition
+        columns, so each folder holds a few full files. Scans filtering on the partition
+        columns skip other folders.
+
         Args:
             data (pyspark.sql.DataFrame): Spark DataFrame to write
             filepath (str): The path to the parquet file to be written
             header (bool): True if data contains header row. False otherwise.
             mode (str): 'overwrite' or 'append'. Default is 'overwrite'.
+            partition_by (list): Columns to partition the output folders by, e.g. ['day'].
+                Default = None
+            target_file_size (int): Approximate size of each file in bytes, e.g. 128MB. None
+                keeps the upstream partitioning and skips the size estimate. Default = None
+            row_group_size (int): Parquet row group size in bytes. Default = 128MB
+            compression (str): Codec, one of CODECS. Default = 'snappy'
+            compression_level (int): Level for the zstd and gzip codecs, -1 to 9 for gzip.
+                Default = None, the codec's default
+            dictionary (bool): True to dictionary encode columns. Default = True
+            column_options (dict): Per column overrides, e.g. {'C1': {'dictionary': False,
+                'bloom_filter': True}}. Dictionary encoding rarely pays for hashed, high
+                cardinality columns, where a bloom filter better serves point lookups.
         """
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        data.write.option("header", header).mode(mode).parquet(filepath)
+        options = _get_parquet_options(
+            compression=compression,
+            compression_level=compression_level,
+            dictionary=dictionary,
+            column_options=column_options,
+        )
+
+        if target_file_size:
+            partitions = self._get_num_partitions(data, target_file_size=target_file_size)
+            if partition_by:
+                data = data.repartition(partitions, *partition_by)
+            else:
+                data = data.repartition(partitions)
+
+        writer = data.write.option("header", header).option("parquet.block.size", row_group_size)
+        writer = writer.options(**options)
+        if partition_by:
+            writer = writer.partitionBy(*partition_by)
+        writer.mode(mode).parquet(filepath)
+
+    def _get_num_partitions(self, data: pyspark.sql.DataFrame, target_file_size: int) -> int:
+        size = get_size_spark(data)
+        partitions = max(1, math.ceil(size / target_file_size))
+        logger.info(
+            "Writing an estimated {} bytes as {} partitions of about {} bytes.".format(
+                size, partitions, target_file_size
+            )
+        )
+        return partitions
 
     def metadata(self, filepath: str) -> dict:
         """Returns select metadata for a parquet file.
@@ -146,31 +574,39 @@ class SparkCSV(IO):
     def read(
         self,
         filepath: str,
-        cores: int = 18,
         header: bool = True,
         infer_schema: bool = True,
         sep: str = ",",
+        schema: StructType = None,
+        columns: list = None,
+        filters: list = None,
     ) -> pyspark.sql.DataFrame:
-        """Reads a Spark DataFrame from Parquet file resource
+        """Reads a Spark DataFrame from a CSV file resource
 
         Args:
-            filepath (str): The path to the parquet file resource
-            cores (int): The number of CPU cores to designated to the operation. Default = 18
+            filepath (str): The path to the csv file resource
             header (bool): True if the data contains a header row. Default = True
-            infer_schema (bool): True if the data types should be inferred. Default = False
+            infer_schema (bool): True if the data types should be inferred. Default = True
             sep (str): Column delimiter. Default = ","
+            schema (StructType): Explicit schema, e.g. from SchemaRegistry. When provided,
+                infer_schema is ignored and the file is read in a single pass. Default = None
+            columns (list): Columns to read. Spark's CSV parser skips converting the others.
+                Default = None, all columns
+            filters (list): [column, operator, value] conditions rows must meet. Default = None
 
         Returns:
             Spark DataFrame
         """
 
         if os.path.exists(filepath):
-            local = "local[" + str(cores) + "]"
-            spark = SparkSession.builder.master(local).appName("Read SparkCSV").getOrCreate()
-            spark.sparkContext.setLogLevel("ERROR")
-            return spark.read.options(header=header, delimiter=sep, inferSchema=infer_schema).csv(
-                filepath
-            )
+            spark = SparkSessionProvider().get_session()
+            if schema is not None:
+                data = spark.read.options(header=header, delimiter=sep).csv(filepath, schema=schema)
+            else:
+                data = spark.read.options(
+                    header=header, delimiter=sep, inferSchema=infer_schema
+                ).csv(filepath)
+            return _select(data, columns=columns, filters=filters)
         else:
             logger.error("File {} was not found.".format(filepath))
             raise FileNotFoundError()
@@ -182,12 +618,16 @@ class SparkCSV(IO):
         header: bool = True,
         sep: str = ",",
         mode: str = "overwrite",
+        **kwargs,
     ) -> None:
-        """Writes Spark DataFrame to Parquet file resource
+        """Writes Spark DataFrame to a CSV file resource
+
+        As with the other IO classes, options for other formats, such as a file's Parquet
+        write_options, are ignored.
 
         Args:
             data (pyspark.sql.DataFrame): Spark DataFrame to write
-            filepath (str): The path to the parquet file to be written
+            filepath (str): The path to the csv file to be written
             header (bool): True if data contains header. Default = True
             sep (str): Column delimiter. Default = ","
             mode (str): 'overwrite' or 'append'. Default = 'overwrite'.
@@ -195,22 +635,27 @@ class SparkCSV(IO):
 
         data.write.csv(path=filepath, header=header, sep=sep, mode=mode)
 
-    def metadata(self, filepath: str) -> dict:
+    def metadata(self, filepath: str, header: bool = True, sep: str = ",") -> dict:
         """Returns select metadata for a spark csv file.
 
+        Rows and columns come from CSVRowCounter, which counts lines rather than reading
+        the file through Spark, and caches the counts alongside the file.
+
         Args:
             filepath (str): Path to csv file
+            header (bool): True if the data contains a header row. Default = True
+            sep (str): Column delimiter. Default = ","
 
         Returns:
             dictionary select metadata
         """
         if os.path.exists(filepath):
             result = os.stat(filepath)
-            df = self.read(filepath)
+            counts = CSVRowCounter().count(filepath, header=header, sep=sep)
             metadata = Metadata(
                 size=result.st_size,
-                rows=df.count(),
-                cols=len(df.columns),
+                rows=counts["rows"],
+                cols=counts["cols"],
                 created=datetime.fromtimestamp(result.st_ctime),
                 modified=datetime.fromtimestamp(result.st_mtime),
                 accessed=datetime.fromtimestamp(result.st_atime),
@@ -222,3 +667,256 @@ class SparkCSV(IO):
             metadata = Metadata()
 
         return metadata
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                          ARROW IO                                                #
+# ------------------------------------------------------------------------------------------------ #
+ARROW_TYPES = {
+    "byte": pa.int8,
+    "short": pa.int16,
+    "integer": pa.int32,
+    "long": pa.int64,
+    "float": pa.float32,
+    "double": pa.float64,
+    "string": pa.string,
+    "boolean": pa.bool_,
+}
+
+
+def _to_arrow_schema(schema: StructType) -> pa.Schema:
+    """Converts a Spark schema, such as those from the SchemaRegistry, to an Arrow schema."""
+    fields = []
+    for field in schema.fields:
+        name = field.dataType.typeName()
+        if name == "decimal":
+            dtype = pa.decimal128(field.dataType.precision, field.dataType.scale)
+        elif name == "timestamp":
+            dtype = pa.timestamp("us")
+        else:
+            dtype = ARROW_TYPES[name]()
+        fields.append(pa.field(field.name, dtype))
+    return pa.schema(fields)
+
+
+def _get_part_files(filepath: str) -> list:
+    """Returns the data files of a file, or of a folder of part files written by Spark,
+    including those in partition folders."""
+    if os.path.isdir(filepath):
+        files = []
+        for root, folders, names in os.walk(filepath):
+            folders[:] = [folder for folder in folders if not folder.startswith(("_", "."))]
+            files.extend(
+                os.path.join(root, name) for name in names if not name.startswith(("_", "."))
+            )
+        return sorted(files)
+    return [filepath]
+
+
+class ArrowParquet(IO):
+    """IO using the pyarrow API. Reads and writes pandas DataFrames without a JVM."""
+
+    def read(self, filepath: str, columns: list = None, filters: list = None) -> pd.DataFrame:
+        """Reads a pandas DataFrame from a Parquet file or folder of part files
+
+        Args:
+            filepath (str): The path to the parquet file resource
+            columns (list): Columns to read. Default = None, all columns
+            filters (list): [column, operator, value] conditions rows must meet. Row groups
+                whose statistics rule out a match are not read. Default = None
+
+        Returns:
+            pandas DataFrame
+        """
+        if os.path.exists(filepath):
+            filters = _validate_filters(filters) or None
+            return pq.read_table(
+                filepath, columns=columns, filters=filters, use_threads=True
+            ).to_pandas()
+        else:
+            logger.error("File {} was not found.".format(filepath))
+            raise FileNotFoundError()
+
+    def write(
+        self,
+        data: pd.DataFrame,
+        filepath: str,
+        compression: str = "snappy",
+        partition_by: list = None,
+        compression_level: int = None,
+        dictionary: bool = True,
+        column_options: dict = None,
+        **kwargs,
+    ) -> None:
+        """Writes a pandas DataFrame to a Parquet file
+
+        Args:
+            data (pd.DataFrame): pandas DataFrame to write
+            filepath (str): The path to the parquet file to be written
+            compression (str): Parquet compression codec, one of CODECS. Default = 'snappy'
+            partition_by (list): Columns to partition the output folders by. The file is then
+                written as a folder, as Spark does. Default = None
+            compression_level (int): Codec compression level. Default = None
+            dictionary (bool): True to dictionary encode columns. Default = True
+            column_options (dict): Per column overrides, as for SparkParquet. Arrow honours
+                'dictionary'; bloom filters are ignored.
+        """
+        _get_parquet_options(
+            compression=compression,
+            compression_level=compression_level,
+            dictionary=dictionary,
+            column_options=column_options,
+        )  # Validates the settings as SparkParquet does
+        if compression not in CODEC_LEVELS:
+            compression_level = None
+        use_dictionary = dictionary
+        if column_options:
+            use_dictionary = [
+                column
+                for column in data.columns
+                if column_options.get(column, {}).get("dictionary", dictionary)
+            ]
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        if os.path.isdir(filepath):
+            # Overwrites a folder of part files previously written by Spark
+            shutil.rmtree(filepath)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        if partition_by:
+            pq.write_to_dataset(
+                table,
+                filepath,
+                partition_cols=list(partition_by),
+                compression=compression,
+                compression_level=compression_level,
+                use_dictionary=use_dictionary,
+            )
+        else:
+            pq.write_table(
+                table,
+                filepath,
+                compression=compression,
+                compression_level=compression_level,
+                use_dictionary=use_dictionary,
+            )
+
+    def metadata(self, filepath: str) -> dict:
+        """Returns select metadata for a parquet file or folder of part files.
+
+        Args:
+            filepath (str): Path to parquet file
+
+        Returns:
+            dictionary select metadata
+        """
+        if os.path.exists(filepath):
+            footers = [pq.read_metadata(file) for file in _get_part_files(filepath)]
+            result = os.stat(filepath)
+            metadata = Metadata(
+                size=result.st_size,
+                rows=sum(footer.num_rows for footer in footers),
+                cols=footers[0].num_columns if footers else 0,
+                created=datetime.fromtimestamp(result.st_ctime),
+                modified=datetime.fromtimestamp(result.st_mtime),
+                accessed=datetime.fromtimestamp(result.st_atime),
+            )
+        else:
+            metadata = Metadata()
+        return metadata
+
+
+class ArrowCSV(IO):
+    """IO using the pyarrow API. Reads and writes pandas DataFrames without a JVM."""
+
+    def read(
+        self,
+        filepath: str,
+        header: bool = True,
+        sep: str = ",",
+        schema: Union[StructType, pa.Schema] = None,
+        columns: list = None,
+        filters: list = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Reads a pandas DataFrame from a CSV file or folder of part files, on all cores
+
+        Args:
+            filepath (str): The path to the csv file resource
+            header (bool): True if the data contains a header row. Default = True
+            sep (str): Column delimiter. Default = ","
+            schema (StructType or pa.Schema): Explicit schema. As with SparkCSV, schema names
+                replace the header. Default = None, types are inferred.
+            columns (list): Columns to read. Others are not converted. Default = None
+            filters (list): [column, operator, value] conditions rows must meet. Default = None
+
+        Returns:
+            pandas DataFrame
+        """
+        if not os.path.exists(filepath):
+            logger.error("File {} was not found.".format(filepath))
+            raise FileNotFoundError()
+
+        if isinstance(schema, StructType):
+            schema = _to_arrow_schema(schema)
+
+        if schema is not None:
+            read_options = pv.ReadOptions(
+                column_names=schema.names, skip_rows=1 if header else 0, use_threads=True
+            )
+            convert_options = pv.ConvertOptions(column_types=schema, strings_can_be_null=True)
+        else:
+            read_options = pv.ReadOptions(autogenerate_column_names=not header, use_threads=True)
+            convert_options = pv.ConvertOptions(strings_can_be_null=True)
+        parse_options = pv.ParseOptions(delimiter=sep)
+
+        # Filter columns are converted too, then dropped once the rows are filtered.
+        filters = _validate_filters(filters)
+        if columns:
+            include = list(columns) + [c for c, _, _ in filters if c not in columns]
+            convert_options.include_columns = include
+
+        tables = [
+            pv.read_csv(
+                file,
+                read_options=read_options,
+                parse_options=parse_options,
+                convert_options=convert_options,
+            )
+            for file in _get_part_files(filepath)
+        ]
+        table = pa.concat_tables(tables)
+        if filters:
+            table = table.filter(_to_arrow_mask(table, filters))
+        if columns:
+            table = table.select(list(columns))
+        return table.to_pandas()
+
+    def write(
+        self, data: pd.DataFrame, filepath: str, header: bool = True, sep: str = ",", **kwargs
+    ) -> None:
+        """Writes a pandas DataFrame to a CSV file
+
+        Args:
+            data (pd.DataFrame): pandas DataFrame to write
+            filepath (str): The path to the csv file to be written
+            header (bool): True if the header row should be written. Default = True
+            sep (str): Column delimiter. Default = ","
+        """
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        if os.path.isdir(filepath):
+            # Overwrites a folder of part files previously written by Spark
+            shutil.rmtree(filepath)
+        table = pa.Table.from_pandas(data, preserve_index=False)
+        pv.write_csv(table, filepath, pv.WriteOptions(include_header=header, delimiter=sep))
+
+    def metadata(self, filepath: str, header: bool = True, sep: str = ",") -> dict:
+        """Returns select metadata for a csv file.
+
+        Args:
+            filepath (str): Path to csv file
+            header (bool): True if the data contains a header row. Default = True
+            sep (str): Column delimiter. Default = ","
+
+        Returns:
+            dictionary select metadata
+        """
+        return SparkCSV().metadata(filepath, header=header, sep=sep)
@@ -22,15 +22,25 @@ from abc import ABC, abstractmethod
 import os
 from dotenv import load_dotenv
 import logging
-import uuid
 import inspect
 import tarfile
 import shutil
+import threading
+import hashlib
+import json
+import math
+import struct
+import time
+import zlib
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging.config
 import progressbar
 import boto3
 import botocore
 from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import NoCredentialsError
 
 from deepctr.data.base import Metadata
@@ -74,7 +84,13 @@ class Cloud(ABC):
 
     @abstractmethod
     def download_file(
-        self, bucket: str, object_key: str, filepath: str, expand: bool = True, force: str = False
+        self,
+        bucket: str,
+        object_key: str,
+        filepath: str,
+        expand: bool = True,
+        force: str = False,
+        stream: bool = False,
     ) -> None:
         pass
 
@@ -95,11 +111,210 @@ class Cloud(ABC):
         pass
 
 
+# ------------------------------------------------------------------------------------------------ #
+#                                      BANDWIDTH LIMITER                                           #
+# ------------------------------------------------------------------------------------------------ #
+class BandwidthLimiter:
+    """Token bucket shared by the threads of a transfer, capping its combined throughput.
+
+    Each read takes its size in tokens, which refill at rate bytes per second up to one
+    second's worth. A read that overdraws the bucket sleeps until the debt is repaid.
+
+    Args:
+        rate (int): Maximum throughput in bytes per second.
+    """
+
+    def __init__(self, rate: int) -> None:
+        self._rate = rate
+        self._lock = threading.Lock()
+        self._tokens = rate
+        self._time = time.monotonic()
+
+    def consume(self, size: int) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._rate, self._tokens + (now - self._time) * self._rate)
+            self._time = now
+            self._tokens -= size
+            wait = -self._tokens / self._rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                       PART CHECKPOINT                                            #
+# ------------------------------------------------------------------------------------------------ #
+class PartCheckpoint:
+    """Records the parts of an object written to a partial download file.
+
+    A checkpoint saved for a different ETag, size or part size is ignored, since its parts
+    can't be combined with the current version of the object.
+
+    Args:
+        filepath (str): Path to the JSON checkpoint file.
+        etag (str): ETag of the object being downloaded.
+        size (int): Size of the object in bytes.
+        chunksize (int): Size of each ranged part in bytes.
+    """
+
+    def __init__(self, filepath: str, etag: str, size: int, chunksize: int) -> None:
+        self._filepath = filepath
+        self._lock = threading.Lock()
+        self._state = {"etag": etag, "size": size, "chunksize": chunksize, "parts": []}
+
+        if os.path.exists(filepath):
+            with open(filepath, "r") as f:
+                state = json.load(f)
+            if all([state.get(key) == self._state[key] for key in ("etag", "size", "chunksize")]):
+                self._state = state
+
+    @property
+    def parts(self) -> set:
+        return set(self._state["parts"])
+
+    def add(self, part: int) -> None:
+        with self._lock:
+            self._state["parts"].append(part)
+            self._save()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state["parts"] = []
+            self._save()
+
+    def delete(self) -> None:
+        if os.path.exists(self._filepath):
+            os.remove(self._filepath)
+
+    def _save(self) -> None:
+        # Written to a temporary file and renamed, so a crash never leaves a truncated checkpoint.
+        tempfile = self._filepath + ".tmp"
+        with open(tempfile, "w") as f:
+            json.dump(self._state, f)
+        os.replace(tempfile, self._filepath)
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                           MANIFEST                                               #
+# ------------------------------------------------------------------------------------------------ #
+class Manifest:
+    """Local record of the S3 objects downloaded completely, persisted as JSON.
+
+    Args:
+        filepath (str): Path to the JSON manifest file.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        self._filepath = filepath
+        self._lock = threading.Lock()
+        self._records = {}
+
+        if os.path.exists(filepath):
+            with open(filepath, "r") as f:
+                self._records = json.load(f)
+
+    def completed(self, bucket: str, object_key: str, etag: str, size: int, filepath: str) -> bool:
+        """Returns True if this version of the object was downloaded completely to filepath.
+
+        Args:
+            bucket (str): The S3 bucket containing the object
+            object_key (str): The path to the object within the bucket
+            etag (str): The current ETag of the object
+            size (int): The current size of the object in bytes
+            filepath (str): The local destination of the object
+        """
+        record = self._records.get(self._get_key(bucket, object_key))
+        if record is None or record["etag"] != etag or record["filepath"] != filepath:
+            return False
+        if not os.path.exists(filepath):
+            return False
+        # Expanded archives are folders. Other downloads must still have the object's size.
+        return os.path.isdir(filepath) or os.path.getsize(filepath) == size
+
+    def add(self, bucket: str, object_key: str, etag: str, size: int, filepath: str) -> None:
+        """Records a completed download.
+
+        Args:
+            bucket (str): The S3 bucket containing the object
+            object_key (str): The path to the object within the bucket
+            etag (str): The ETag of the object downloaded
+            size (int): The size of the object in bytes
+            filepath (str): The local destination of the object
+        """
+        with self._lock:
+            self._records[self._get_key(bucket, object_key)] = {
+                "etag": etag,
+                "size": size,
+                "filepath": filepath,
+                "completed": datetime.now().isoformat(),
+            }
+            self._save()
+
+    def _get_key(self, bucket: str, object_key: str) -> str:
+        return "{}/{}".format(bucket, object_key)
+
+    def _save(self) -> None:
+        os.makedirs(os.path.dirname(self._filepath) or ".", exist_ok=True)
+        tempfile = self._filepath + ".tmp"
+        with open(tempfile, "w") as f:
+            json.dump(self._records, f, indent=2)
+        os.replace(tempfile, self._filepath)
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        METADATA CACHE                                            #
+# ------------------------------------------------------------------------------------------------ #
+class MetadataCache:
+    """Thread-safe, time-to-live cache of S3 object Metadata.
+
+    Entries are keyed by bucket and object key. Writes and deletes through S3 invalidate the
+    entries they affect; changes made elsewhere are picked up once the entry expires.
+
+    Args:
+        ttl (int): Seconds an entry remains valid. Default = 300
+    """
+
+    def __init__(self, ttl: int = 300) -> None:
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, bucket: str, object_key: str) -> Metadata:
+        """Returns the cached Metadata for an object, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get((bucket, object_key))
+            if entry is None:
+                return None
+            if entry["expires"] < time.monotonic():
+                del self._entries[(bucket, object_key)]
+                return None
+            return entry["metadata"]
+
+    def put(self, bucket: str, object_key: str, metadata: Metadata) -> None:
+        with self._lock:
+            self._entries[(bucket, object_key)] = {
+                "metadata": metadata,
+                "expires": time.monotonic() + self._ttl,
+            }
+
+    def invalidate(self, bucket: str, prefix: str = "") -> None:
+        """Removes the entries for all objects in the bucket whose keys begin with prefix."""
+        with self._lock:
+            for key in [key for key in self._entries.keys() if key[0] == bucket]:
+                if key[1].startswith(prefix or ""):
+                    del self._entries[key]
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                              S3                                                  #
 # ------------------------------------------------------------------------------------------------ #
 class S3(Cloud):
-    """Base class for S3 uploading and downloading"""
+    """Base class for S3 uploading and downloading
+
+    Args:
+        manifest (str): Optional path to a JSON manifest of completed downloads. When provided,
+            objects whose ETag and local size match the manifest are not downloaded again.
+    """
 
     # Transfer Configuration controls parallelism, and other factors affecting throughput
     __MB = 1024 ** 2
@@ -109,6 +324,21 @@ class S3(Cloud):
         multipart_threshold=64 * __MB,
         max_bandwidth=50 * __MB,
     )
+    # Number of objects transferred concurrently by the bulk download methods. Each object
+    # transfer is itself multipart, using up to max_concurrency threads of the transfer config.
+    __max_workers = 4
+    # Compression level for uploads, the gzip default. Level 9 is several times slower for a
+    # few percent smaller archives.
+    __compresslevel = 6
+    # Object metadata shared by all instances, so repeated exists and metadata calls for the
+    # same objects don't each cost a request.
+    __cache = MetadataCache(ttl=300)
+
+    def __init__(self, manifest: str = None) -> None:
+        super(S3, self).__init__()
+        self._progressbar = None
+        self._lock = threading.Lock()
+        self._manifest = Manifest(filepath=manifest) if manifest else None
 
     def upload_file(
         self,
@@ -140,26 +370,16 @@ class S3(Cloud):
             )
         else:
 
-            # If compress is True, we create a temporary tar.gz file archive, upload it, then delete it.
+            # If compress is True, the tar.gz archive is compressed in parallel and streamed into
+            # a multipart upload. No compressed copy of the file is written to disk.
             if compress:
-                filepath_compressed = filepath + ".tar.gz"
-                try:
-                    with tarfile.open(filepath_compressed, "w:gz") as tar:
-                        tar.add(filepath, arcname=os.path.basename(filepath))
-
-                    self._upload_file(
-                        filepath=filepath_compressed, bucket=bucket, object_key=object_key
-                    )
-
-                except tarfile.TarError as e:
-                    logger.error(e)
-                    raise
-                finally:
-                    shutil.rmtree(filepath_compressed, ignore_errors=True)
+                self._upload_compressed(filepath=filepath, bucket=bucket, object_key=object_key)
 
             else:
                 self._upload_file(filepath=filepath, bucket=bucket, object_key=object_key)
 
+            S3.__cache.invalidate(bucket=bucket, prefix=object_key)
+
     def _upload_file(self, filepath: str, bucket: str, object_key: str) -> None:
         """Wraps all S3 upload related operations."""
 
@@ -182,8 +402,53 @@ class S3(Cloud):
             msg = "Credentials not available for {} bucket".format(bucket)
             raise NoCredentialsError(msg)
 
+    def _upload_compressed(self, filepath: str, bucket: str, object_key: str) -> None:
+        """Archives, compresses and uploads a file as a tar.gz object in a single pass."""
+
+        s3 = self._get_s3_connection(connection_type="client")
+
+        size = os.path.getsize(filepath)
+        self._progressbar = progressbar.progressbar.ProgressBar(maxval=size)
+        self._progressbar.start()
+
+        upload = MultipartUpload(
+            s3=s3,
+            bucket=bucket,
+            object_key=object_key,
+            partsize=S3.__transfer_config.multipart_chunksize,
+            max_workers=S3.__transfer_config.max_concurrency,
+        )
+        try:
+            gzip = ParallelGzipWriter(sink=upload.write, level=S3.__compresslevel)
+            with tarfile.open(fileobj=gzip, mode="w|") as tar:
+                tarinfo = tar.gettarinfo(filepath, arcname=os.path.basename(filepath))
+                with open(filepath, "rb") as f:
+                    tar.addfile(tarinfo, fileobj=ProgressStream(stream=f, callback=self._callback))
+            gzip.close()
+            upload.complete()
+
+        except tarfile.TarError as e:
+            upload.abort()
+            logger.error(e)
+            raise
+
+        except NoCredentialsError:
+            upload.abort()
+            msg = "Credentials not available for {} bucket".format(bucket)
+            raise NoCredentialsError(msg)
+
+        except Exception:
+            upload.abort()
+            raise
+
     def download_file(
-        self, bucket: str, object_key: str, filepath: str, expand: bool = True, force: str = False
+        self,
+        bucket: str,
+        object_key: str,
+        filepath: str,
+        expand: bool = True,
+        force: str = False,
+        stream: bool = False,
     ) -> None:
         """Downloads a file from an S3 resource
 
@@ -193,84 +458,514 @@ class S3(Cloud):
             filepath (str): The destination for the file. If expand is False, filepath will be
                 a path to a file. Otherwise, filepath will actually be a folder in to which thee
                 archive will be expanded.
-            expand (bool): True if the resource should be expanded, False otherwise.
+            expand (bool): True if the resource should be expanded, False otherwise. Only
+                objects ending in .tar.gz are expanded; others are downloaded to filepath.
             force (bool): If True, overwrite the object data if it exists; otherwise, upload only if
                 the object doesn't already exist.
+            stream (bool): If True and expand is True, the archive is extracted as it is
+                downloaded, without writing a temporary copy of the archive. Default = False
         """
-
-        if os.path.exists(filepath) and not force:
+        # Without a manifest, an existing file is kept unless force is True, so there is no
+        # need to ask S3 for the object's head.
+        if self._manifest is None and os.path.exists(filepath) and not force:
             logger.warning(
                 "File {} already exists. Download aborted. To overwrite the file, set force = True.".format(
                     filepath
                 )
             )
-        else:
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            return
 
-            # If we expand, we create a temporary file, create the folder for it, then
-            # download the archive to this file which is then extracted to the client provided filepath
-            if expand:
-                download_filepath = os.path.join(
-                    os.path.dirname(filepath), str(uuid.uuid4()), os.path.basename(filepath)
+        s3 = self._get_s3_connection(connection_type="client")
+        head = self._head_object(s3=s3, bucket=bucket, object_key=object_key)
+
+        # Configure the progress monitor
+        self._progressbar = progressbar.progressbar.ProgressBar(maxval=head["size"])
+        self._progressbar.start()
+
+        self._get_object(
+            s3=s3,
+            bucket=bucket,
+            object_key=object_key,
+            head=head,
+            filepath=filepath,
+            expand=expand,
+            force=force,
+            stream=stream,
+        )
+
+    def download_many(
+        self,
+        bucket: str,
+        object_keys: list,
+        destination: str,
+        folder: str = None,
+        expand: bool = True,
+        force: str = False,
+        stream: bool = False,
+        max_workers: int = None,
+    ) -> list:
+        """Downloads several objects concurrently from an S3 bucket
+
+        Args:
+            bucket (str): The S3 bucket from which the objects will be downloaded
+            object_keys (list): The paths to the objects within the bucket
+            destination (str): The local folder into which the objects are downloaded.
+            folder (str): Optional prefix stripped from the object keys when forming the local
+                filepaths. If None, the full object key is used relative to destination.
+            expand (bool): True if tar.gz objects should be expanded, False otherwise.
+            force (bool): If True, overwrite existing local data.
+            stream (bool): If True, tar.gz objects are extracted as they are downloaded.
+            max_workers (int): Maximum number of objects downloaded concurrently. Default = 4
+
+        Returns:
+            list of local filepaths, one per object.
+        """
+        s3 = self._get_s3_connection(connection_type="client")
+        # The heads come from listing the bucket, one request per page of up to 1000 objects,
+        # rather than one HEAD per object before the downloads start.
+        objects = self._list_heads(s3=s3, bucket=bucket, object_keys=object_keys)
+        missing = [object_key for object_key in object_keys if object_key not in objects]
+        if missing:
+            msg = "Objects {} do not exist.".format(missing)
+            logger.error(msg)
+            raise ValueError(msg)
+        return self._download_objects(
+            s3=s3,
+            bucket=bucket,
+            objects=objects,
+            destination=destination,
+            folder=folder,
+            expand=expand,
+            force=force,
+            stream=stream,
+            max_workers=max_workers,
+        )
+
+    def download_folder(
+        self,
+        bucket: str,
+        folder: str,
+        destination: str,
+        expand: bool = True,
+        force: str = False,
+        stream: bool = False,
+        max_workers: int = None,
+    ) -> list:
+        """Downloads all objects in an S3 folder concurrently
+
+        The folder is listed once, and the object sizes from the listing drive a single
+        progress bar for the whole folder. Objects are downloaded through a bounded pool of
+        workers sharing one client.
+
+        Args:
+            bucket (str): The S3 bucket from which the objects will be downloaded
+            folder (str): The S3 folder with trailing backslash
+            destination (str): The local folder into which the objects are downloaded.
+            expand (bool): True if tar.gz objects should be expanded, False otherwise.
+            force (bool): If True, overwrite existing local data.
+            stream (bool): If True, tar.gz objects are extracted as they are downloaded.
+            max_workers (int): Maximum number of objects downloaded concurrently. Default = 4
+
+        Returns:
+            list of local filepaths, one per object.
+        """
+        s3 = self._get_s3_connection(connection_type="client")
+        objects = self._list_objects(s3=s3, bucket=bucket, folder=folder)
+        return self._download_objects(
+            s3=s3,
+            bucket=bucket,
+            objects=objects,
+            destination=destination,
+            folder=folder,
+            expand=expand,
+            force=force,
+            stream=stream,
+            max_workers=max_workers,
+        )
+
+    def _download_objects(
+        self,
+        s3: boto3.client,
+        bucket: str,
+        objects: dict,
+        destination: str,
+        folder: str,
+        expand: bool,
+        force: bool,
+        stream: bool,
+        max_workers: int,
+    ) -> list:
+        """Downloads objects, a dictionary of object keys and head data, through a worker pool."""
+
+        max_workers = max_workers or S3.__max_workers
+
+        size = sum([head["size"] for head in objects.values()])
+        self._progressbar = progressbar.progressbar.ProgressBar(maxval=size)
+        self._progressbar.start()
+
+        filepaths = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for object_key, head in objects.items():
+                filepath = self._get_filepath(
+                    object_key=object_key, destination=destination, folder=folder, expand=expand
+                )
+                future = executor.submit(
+                    self._get_object,
+                    s3=s3,
+                    bucket=bucket,
+                    object_key=object_key,
+                    head=head,
+                    filepath=filepath,
+                    expand=expand,
+                    force=force,
+                    stream=stream,
                 )
-                os.makedirs(os.path.dirname(download_filepath), exist_ok=True)
-                self._download_file(
-                    bucket=bucket, object_key=object_key, filepath=download_filepath
+                futures[future] = filepath
+
+            for future in as_completed(futures):
+                # Re-raises any exception encountered by the worker
+                future.result()
+                filepaths.append(futures[future])
+
+        self._progressbar.finish()
+        return filepaths
+
+    def _get_object(
+        self,
+        s3: boto3.client,
+        bucket: str,
+        object_key: str,
+        head: dict,
+        filepath: str,
+        expand: bool,
+        force: bool,
+        stream: bool = False,
+    ) -> None:
+        """Downloads and optionally expands a single object using the client provided."""
+
+        if self._manifest is not None and not force:
+            if self._manifest.completed(
+                bucket=bucket,
+                object_key=object_key,
+                etag=head["etag"],
+                size=head["size"],
+                filepath=filepath,
+            ):
+                logger.info(
+                    "Object {} is unchanged since it was downloaded to {}. Download skipped.".format(
+                        object_key, filepath
+                    )
                 )
+                self._callback(head["size"])
+                return
+
+        elif os.path.exists(filepath) and not force:
+            logger.warning(
+                "File {} already exists. Download aborted. To overwrite the file, set force = True.".format(
+                    filepath
+                )
+            )
+            return
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+        # Only tar.gz objects are expanded. Other objects in the same folder are downloaded
+        # as they are.
+        archive = expand and object_key.endswith(".tar.gz")
 
-                try:
-                    with tarfile.open(download_filepath, "r:gz") as tar:
-                        names = tar.getnames()
-                        for name in names:
-                            member_expand_filepath = os.path.join(filepath, name)
-                            # We don't download if data already exists, unless force is True
-                            if os.path.exists(member_expand_filepath) and not force:
-                                logger.warning(
-                                    "\tArchive member {} already exists. To overwrite, set force = True".format(
-                                        name
-                                    )
+        # If we stream, the response body is piped through the decompressor and archive
+        # members are written as the bytes arrive.
+        if archive and stream:
+            self._stream_file(
+                s3=s3, bucket=bucket, object_key=object_key, filepath=filepath, force=force
+            )
+
+        # If we expand, we download the archive into a hidden folder beside the client provided
+        # filepath, then extract it to the filepath. The folder name doesn't change between runs,
+        # so an interrupted archive download is resumed on the next attempt.
+        elif archive:
+            download_folder = os.path.join(
+                os.path.dirname(filepath), "." + os.path.basename(filepath) + ".download"
+            )
+            download_filepath = os.path.join(download_folder, os.path.basename(object_key))
+            self._download_file(
+                s3=s3, bucket=bucket, object_key=object_key, head=head, filepath=download_filepath
+            )
+
+            try:
+                with tarfile.open(download_filepath, "r:gz") as tar:
+                    names = tar.getnames()
+                    for name in names:
+                        member_expand_filepath = os.path.join(filepath, name)
+                        # We don't download if data already exists, unless force is True
+                        if os.path.exists(member_expand_filepath) and not force:
+                            logger.warning(
+                                "\tArchive member {} already exists. To overwrite, set force = True".format(
+                                    name
                                 )
-                            else:
-                                tar.extract(member=name, path=member_expand_filepath)
+                            )
+                        else:
+                            tar.extract(member=name, path=member_expand_filepath)
 
-                except tarfile.TarError as e:
-                    logger.error(e)
-                    raise
-                finally:
-                    # Dispose of the temporary download file
-                    shutil.rmtree(os.path.dirname(download_filepath), ignore_errors=True)
+            except tarfile.TarError as e:
+                logger.error(e)
+                raise
+            finally:
+                # Dispose of the archive. An interrupted download raises before extraction
+                # starts, so its parts are kept for the next attempt.
+                shutil.rmtree(download_folder, ignore_errors=True)
 
-            else:
-                os.makedirs(os.path.dirname(filepath), exist_ok=True)
-                self._download_file(bucket=bucket, object_key=object_key, filepath=filepath)
+        else:
+            self._download_file(
+                s3=s3, bucket=bucket, object_key=object_key, head=head, filepath=filepath
+            )
+
+        if self._manifest is not None:
+            self._manifest.add(
+                bucket=bucket,
+                object_key=object_key,
+                etag=head["etag"],
+                size=head["size"],
+                filepath=filepath,
+            )
 
-    def _download_file(self, bucket: str, object_key: str, filepath: str) -> None:
-        """Wraps all S3 download related operations."""
+    def _download_file(
+        self, s3: boto3.client, bucket: str, object_key: str, head: dict, filepath: str
+    ) -> None:
+        """Downloads an object in ranged parts, resuming from the checkpoint of a prior attempt.
+
+        Parts are written into a '.part' file beside filepath and recorded in a checkpoint as
+        they complete. Every ranged GET is conditioned on the ETag, so parts from a different
+        version of the object are never mixed. Once all parts are present, the file is verified
+        against the object size and ETag and renamed to filepath.
+        """
+        size = head["size"]
+        etag = head["etag"]
+        chunksize = S3.__transfer_config.multipart_chunksize
+        partpath = filepath + ".part"
+
+        os.makedirs(os.path.dirname(partpath), exist_ok=True)
+        checkpoint = PartCheckpoint(
+            filepath=partpath + ".json", etag=etag, size=size, chunksize=chunksize
+        )
+        # A missing part file, or a checkpoint for another version of the object, starts the
+        # download over. The part file is truncated, so no bytes of the old version remain.
+        if not os.path.exists(partpath) or not checkpoint.parts:
+            checkpoint.reset()
+            open(partpath, "wb").close()
+
+        n_parts = math.ceil(size / chunksize)
+        parts = [part for part in range(n_parts) if part not in checkpoint.parts]
+
+        # The parts share one limiter, so the transfer as a whole respects max_bandwidth.
+        limiter = None
+        if S3.__transfer_config.max_bandwidth:
+            limiter = BandwidthLimiter(rate=S3.__transfer_config.max_bandwidth)
+
+        # Credit the progress bar with the parts completed by an earlier attempt.
+        if len(parts) < n_parts:
+            done = size - sum([min(chunksize, size - part * chunksize) for part in parts])
+            logger.info("Resuming download of {} at {} of {} bytes.".format(object_key, done, size))
+            self._callback(done)
 
         try:
-            # Get the size of the resource
-            s3 = self._get_s3_connection(connection_type="client")
-            response = s3.head_object(Bucket=bucket, Key=object_key)
-            size = response["ContentLength"]
+            fd = os.open(partpath, os.O_RDWR)
+            try:
+                with ThreadPoolExecutor(
+                    max_workers=S3.__transfer_config.max_concurrency
+                ) as executor:
+                    futures = {
+                        executor.submit(
+                            self._download_part,
+                            s3=s3,
+                            bucket=bucket,
+                            object_key=object_key,
+                            etag=etag,
+                            fd=fd,
+                            start=part * chunksize,
+                            stop=min((part + 1) * chunksize, size),
+                            limiter=limiter,
+                        ): part
+                        for part in parts
+                    }
+                    # Every part that completes is checkpointed, even if another part fails.
+                    for future in as_completed(futures):
+                        if future.exception() is None:
+                            checkpoint.add(futures[future])
+            finally:
+                os.close(fd)
+
+            errors = [future.exception() for future in futures if future.exception()]
+            if errors:
+                raise errors[0]
 
-            # Configure the progress monitor
-            self._progressbar = progressbar.progressbar.ProgressBar(maxval=size)
-            self._progressbar.start()
+        except botocore.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                msg = "Object {} does not exist.".format(object_key)
+                logger.error(msg)
+                raise ValueError(msg)
+            elif e.response["Error"]["Code"] in ("412", "PreconditionFailed"):
+                # The object changed since the download started. The parts are discarded.
+                self._discard(partpath=partpath, checkpoint=checkpoint)
+                msg = "Object {} changed during download. Download aborted.".format(object_key)
+                logger.error(msg)
+                raise ValueError(msg)
+            else:
+                operation_name = "{}: {}".format(self.__class__.__name__, inspect.stack()[0][3])
+                raise botocore.exceptions.ClientError(
+                    error_response=e, operation_name=operation_name
+                )
 
-            # Download the file (or file object for compressed files)
-            if "tar.gz" in filepath:
-                with open(filepath, "wb") as f:
-                    s3.download_fileobj(
-                        bucket, object_key, f, Callback=self._callback, Config=S3.__transfer_config,
-                    )
+        except NoCredentialsError:
+            msg = "Credentials not available for {} bucket".format(bucket)
+            raise NoCredentialsError(msg)
+
+        self._verify(partpath=partpath, checkpoint=checkpoint, object_key=object_key, head=head)
+        os.replace(partpath, filepath)
+        checkpoint.delete()
+
+    def _download_part(
+        self,
+        s3: boto3.client,
+        bucket: str,
+        object_key: str,
+        etag: str,
+        fd: int,
+        start: int,
+        stop: int,
+        limiter: BandwidthLimiter = None,
+    ) -> None:
+        """Downloads the byte range [start, stop) of an object into the open file at start."""
+        response = s3.get_object(
+            Bucket=bucket,
+            Key=object_key,
+            Range="bytes={}-{}".format(start, stop - 1),
+            IfMatch=etag,
+        )
+        offset = start
+        for chunk in response["Body"].iter_chunks(chunk_size=S3.__MB):
+            if limiter is not None:
+                limiter.consume(len(chunk))
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+            self._callback(len(chunk))
+
+    def _verify(
+        self, partpath: str, checkpoint: PartCheckpoint, object_key: str, head: dict
+    ) -> None:
+        """Verifies a downloaded file against the object size and ETag."""
+        size = os.path.getsize(partpath)
+        if size != head["size"]:
+            self._discard(partpath=partpath, checkpoint=checkpoint)
+            msg = "Object {} download has {} bytes. Expected {} bytes.".format(
+                object_key, size, head["size"]
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        etag = self._get_etag(filepath=partpath, etag=head["etag"])
+        if etag is not None and etag != head["etag"].strip('"'):
+            self._discard(partpath=partpath, checkpoint=checkpoint)
+            msg = "Object {} download failed checksum verification.".format(object_key)
+            logger.error(msg)
+            raise ValueError(msg)
+
+    def _get_etag(self, filepath: str, etag: str) -> str:
+        """Computes the S3 ETag of a local file, or returns None if it can't be reproduced.
+
+        Single part uploads have the MD5 of the content as ETag. Multipart uploads have the MD5
+        of the concatenated part digests, followed by the number of parts. The part size isn't
+        recorded, so it can only be reproduced for objects uploaded with this class's chunksize.
+        """
+        etag = etag.strip('"')
+        if "-" not in etag:
+            md5 = hashlib.md5()
+            with open(filepath, "rb") as f:
+                for block in iter(lambda: f.read(S3.__MB), b""):
+                    md5.update(block)
+            return md5.hexdigest()
+
+        chunksize = S3.__transfer_config.multipart_chunksize
+        n_parts = int(etag.split("-")[1])
+        if math.ceil(os.path.getsize(filepath) / chunksize) != n_parts:
+            logger.debug("ETag {} can't be reproduced. Size verified only.".format(etag))
+            return None
+
+        digests = []
+        with open(filepath, "rb") as f:
+            for block in iter(lambda: f.read(chunksize), b""):
+                digests.append(hashlib.md5(block).digest())
+        return "{}-{}".format(hashlib.md5(b"".join(digests)).hexdigest(), n_parts)
+
+    def _discard(self, partpath: str, checkpoint: PartCheckpoint) -> None:
+        """Removes a partial download and its checkpoint so the next attempt starts over."""
+        if os.path.exists(partpath):
+            os.remove(partpath)
+        checkpoint.delete()
+
+    def _stream_file(
+        self, s3: boto3.client, bucket: str, object_key: str, filepath: str, force: bool
+    ) -> None:
+        """Extracts a tar.gz object into the filepath folder while it is being downloaded."""
+
+        try:
+            response = s3.get_object(Bucket=bucket, Key=object_key)
+            body = ProgressStream(stream=response["Body"], callback=self._callback)
+
+            # Stream mode reads the archive strictly forward; members are visited in order.
+            with tarfile.open(fileobj=body, mode="r|gz") as tar:
+                for member in tar:
+                    member_expand_filepath = os.path.join(filepath, member.name)
+                    # We don't download if data already exists, unless force is True
+                    if os.path.exists(member_expand_filepath) and not force:
+                        logger.warning(
+                            "\tArchive member {} already exists. To overwrite, set force = True".format(
+                                member.name
+                            )
+                        )
+                    else:
+                        self._extract_member(
+                            tar=tar, member=member, filepath=member_expand_filepath
+                        )
+
+        except tarfile.TarError as e:
+            logger.error(e)
+            raise
+
+        except botocore.exceptions.ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                msg = "Object {} does not exist.".format(object_key)
+                logger.error(msg)
+                raise ValueError(msg)
             else:
-                s3.download_file(
-                    bucket,
-                    object_key,
-                    filepath,
-                    Callback=self._callback,
-                    Config=S3.__transfer_config,
+                operation_name = "{}: {}".format(self.__class__.__name__, inspect.stack()[0][3])
+                raise botocore.exceptions.ClientError(
+                    error_response=e, operation_name=operation_name
                 )
+
+        except NoCredentialsError:
+            msg = "Credentials not available for {} bucket".format(bucket)
+            raise NoCredentialsError(msg)
+
+    def _extract_member(self, tar: tarfile.TarFile, member: tarfile.TarInfo, filepath: str) -> None:
+        """Extracts an archive member beside filepath and renames it once it is fully written.
+
+        A stream interrupted mid-member leaves only the '.part' folder, which the next attempt
+        replaces, so a truncated member is never taken for a complete one.
+        """
+        partpath = filepath + ".part"
+        shutil.rmtree(partpath, ignore_errors=True)
+        tar.extract(member=member, path=partpath)
+        shutil.rmtree(filepath, ignore_errors=True)
+        os.replace(partpath, filepath)
+
+    def _head_object(self, s3: boto3.client, bucket: str, object_key: str) -> dict:
+        """Returns the size and ETag of an object."""
+        try:
+            response = s3.head_object(Bucket=bucket, Key=object_key)
+            return {"size": response["ContentLength"], "etag": response["ETag"]}
+
         except botocore.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "404":
                 msg = "Object {} does not exist.".format(object_key)
@@ -286,6 +981,52 @@ class S3(Cloud):
             msg = "Credentials not available for {} bucket".format(bucket)
             raise NoCredentialsError(msg)
 
+    def _list_objects(self, s3: boto3.client, bucket: str, folder: str = None) -> dict:
+        """Lists a folder once and returns a dictionary of object keys and head data."""
+        objects = {}
+        paginator = s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=folder or ""):
+            for content in page.get("Contents", []):
+                if not content["Key"].endswith("/"):  # Skip objects that are just the folder name
+                    objects[content["Key"]] = {"size": content["Size"], "etag": content["ETag"]}
+        return objects
+
+    def _list_heads(self, s3: boto3.client, bucket: str, object_keys: list) -> dict:
+        """Returns the head data of several objects, found by listing the bucket.
+
+        The listing pages under the common prefix of the keys are scanned in order, and the
+        scan stops after the page holding the last key. Objects that don't exist are omitted.
+        """
+        objects = {}
+        if not object_keys:
+            return objects
+        wanted = set(object_keys)
+        last = max(object_keys)
+        paginator = s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket, Prefix=os.path.commonprefix(object_keys)):
+            contents = page.get("Contents", [])
+            for content in contents:
+                if content["Key"] in wanted:
+                    objects[content["Key"]] = {
+                        "size": content["Size"],
+                        "etag": content["ETag"],
+                        "modified": content["LastModified"],
+                    }
+            # Keys are listed in order, so later pages can't hold any of the keys sought.
+            if not contents or contents[-1]["Key"] >= last:
+                break
+        return objects
+
+    def _get_filepath(self, object_key: str, destination: str, folder: str, expand: bool) -> str:
+        """Returns the local filepath for an object downloaded into destination."""
+        relpath = object_key
+        if folder and object_key.startswith(folder):
+            relpath = object_key[len(folder) :]
+        relpath = relpath.lstrip("/")
+        if expand and relpath.endswith(".tar.gz"):
+            relpath = relpath[: -len(".tar.gz")]
+        return os.path.join(destination, relpath)
+
     def delete_object(self, bucket: str, object_key: str, force: str = False) -> None:
         """Deletes a object_name from S3 storage
 
@@ -295,6 +1036,7 @@ class S3(Cloud):
         """
         s3 = self._get_s3_connection(connection_type="resource")
         s3.Object(bucket, object_key).delete()
+        S3.__cache.invalidate(bucket=bucket, prefix=object_key)
 
     def delete_folder(self, bucket: str, folder: str, force: str = False) -> None:
         """Deletes a object from S3 storage
@@ -304,6 +1046,7 @@ class S3(Cloud):
             folder (str, force: str = False): The S3 folder with trailing backslash
         """
         s3 = self._get_s3_connection(connection_type="resource")
+        S3.__cache.invalidate(bucket=bucket, prefix=folder)
         bucket = s3.Bucket(bucket)
         bucket.objects.filter(Prefix=folder).delete()
 
@@ -315,10 +1058,20 @@ class S3(Cloud):
             object_key (str, force: str = False): The path of the object
 
         """
+        if S3.__cache.get(bucket=bucket, object_key=object_key) is not None:
+            return True
+
         s3 = self._get_s3_connection(connection_type="client")
 
         try:
-            s3.head_object(Bucket=bucket, Key=object_key)
+            response = s3.head_object(Bucket=bucket, Key=object_key)
+            S3.__cache.put(
+                bucket=bucket,
+                object_key=object_key,
+                metadata=self._get_metadata(
+                    size=response["ContentLength"], modified=response["LastModified"]
+                ),
+            )
         except botocore.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "404":
                 return False
@@ -355,17 +1108,18 @@ class S3(Cloud):
             object_key (str): The path to an S3 object.
 
         """
+        metadata = S3.__cache.get(bucket=bucket, object_key=object_key)
+        if metadata is not None:
+            return metadata
+
         try:
             s3 = self._get_s3_connection(connection_type="client")
             response = s3.head_object(Bucket=bucket, Key=object_key)
-            return Metadata(
-                rows=0,
-                cols=0,
-                size=response["ContentLength"],
-                created=response["LastModified"],
-                modified=response["LastModified"],
-                accessed=response["LastModified"],
+            metadata = self._get_metadata(
+                size=response["ContentLength"], modified=response["LastModified"]
             )
+            S3.__cache.put(bucket=bucket, object_key=object_key, metadata=metadata)
+            return metadata
 
         except botocore.exceptions.ClientError as e:
             if e.response["Error"]["Code"] == "404":
@@ -382,6 +1136,52 @@ class S3(Cloud):
             msg = "Credentials not available for {} bucket".format(bucket)
             raise NoCredentialsError(msg)
 
+    def metadata_many(self, bucket: str, object_keys: list) -> dict:
+        """Returns metadata for several objects, listing the bucket instead of one HEAD per object.
+
+        Objects not in the metadata cache are found by scanning the listing pages under the
+        common prefix of their keys. The scan stops after the page holding the last key, so
+        validating a dataset folder costs one request per page of up to 1000 objects.
+
+        Args:
+            bucket (str): The S3 bucket containing the resources
+            object_keys (list): The paths to the S3 objects.
+
+        Returns:
+            dictionary of object keys and Metadata. Objects that don't exist are omitted.
+        """
+        result = {}
+        missing = []
+        for object_key in object_keys:
+            metadata = S3.__cache.get(bucket=bucket, object_key=object_key)
+            if metadata is None:
+                missing.append(object_key)
+            else:
+                result[object_key] = metadata
+
+        if not missing:
+            return result
+
+        try:
+            s3 = self._get_s3_connection(connection_type="client")
+            heads = self._list_heads(s3=s3, bucket=bucket, object_keys=missing)
+            for object_key, head in heads.items():
+                metadata = self._get_metadata(size=head["size"], modified=head["modified"])
+                S3.__cache.put(bucket=bucket, object_key=object_key, metadata=metadata)
+                result[object_key] = metadata
+
+        except NoCredentialsError:
+            msg = "Credentials not available for {} bucket".format(bucket)
+            raise NoCredentialsError(msg)
+
+        return result
+
+    def _get_metadata(self, size: int, modified: datetime) -> Metadata:
+        """S3 records only the last modified date, which stands in for the other dates."""
+        return Metadata(
+            rows=0, cols=0, size=size, created=modified, modified=modified, accessed=modified,
+        )
+
     def _get_object_key(self, filepath: str, object_key, compress: bool) -> str:
         """Returns the object_name name given a filepath, folder and compress flag"""
         object_key = os.path.basename(filepath) if not object_key else object_key
@@ -391,19 +1191,281 @@ class S3(Cloud):
         return object_key
 
     def _callback(self, size):
-        self._progressbar.update(self._progressbar.currval + size)
+        # Callbacks arrive from the transfer threads of every object in flight.
+        with self._lock:
+            self._progressbar.update(self._progressbar.currval + size)
 
     def _get_s3_connection(self, connection_type: str = "resource") -> boto3.resource:
         """Obtains an S3 boto3.resource object."""
-        load_dotenv()
+        # The bulk downloads run up to max_workers objects at once, each with max_concurrency
+        # ranged requests in flight, all on the same client.
+        max_pool_connections = S3.__transfer_config.max_concurrency * S3.__max_workers
+        return S3ConnectionFactory().get_connection(
+            connection_type=connection_type, max_pool_connections=max_pool_connections
+        )
 
-        S3_ACCESS = os.getenv("S3_ACCESS")
-        S3_PASSWORD = os.getenv("S3_PASSWORD")
 
-        if connection_type == "resource":
-            s3 = boto3.resource(
-                "s3", aws_access_key_id=S3_ACCESS, aws_secret_access_key=S3_PASSWORD
+# ------------------------------------------------------------------------------------------------ #
+#                                    S3 CONNECTION FACTORY                                         #
+# ------------------------------------------------------------------------------------------------ #
+class S3ConnectionFactory:
+    """Process-wide cache of boto3 S3 clients and resources.
+
+    Building a client costs tens of milliseconds, so connections are created once per set of
+    credentials, region, endpoint and pool size, then shared. Clients are thread-safe and are
+    shared across threads. Resources are not, so each thread gets its own, held in
+    thread-local storage and released with the thread. The .env file is read once per process.
+    """
+
+    __connections = {}
+    __resources = threading.local()
+    __lock = threading.Lock()
+    __dotenv_loaded = False
+
+    def get_connection(
+        self, connection_type: str = "client", max_pool_connections: int = 10
+    ) -> boto3.client:
+        """Returns a cached S3 client or resource, creating it on first use.
+
+        Args:
+            connection_type (str): Either 'client' or 'resource'. Default = 'client'
+            max_pool_connections (int): Size of the HTTP connection pool. Default = 10
+        """
+        with S3ConnectionFactory.__lock:
+            if not S3ConnectionFactory.__dotenv_loaded:
+                load_dotenv()
+                S3ConnectionFactory.__dotenv_loaded = True
+
+            credentials = (
+                os.getenv("S3_ACCESS"),
+                os.getenv("S3_PASSWORD"),
+                os.getenv("S3_REGION"),
+                # Optional endpoint for S3 compatible stand-ins, such as MinIO or moto.
+                os.getenv("S3_ENDPOINT"),
             )
+            key = (connection_type, credentials, max_pool_connections)
+            if connection_type == "resource":
+                if not hasattr(S3ConnectionFactory.__resources, "connections"):
+                    S3ConnectionFactory.__resources.connections = {}
+                connections = S3ConnectionFactory.__resources.connections
+            else:
+                connections = S3ConnectionFactory.__connections
+
+            if key not in connections:
+                connections[key] = self._create(
+                    connection_type=connection_type,
+                    credentials=credentials,
+                    max_pool_connections=max_pool_connections,
+                )
+            return connections[key]
+
+    def clear(self) -> None:
+        """Discards all cached connections, for instance after credentials are rotated."""
+        with S3ConnectionFactory.__lock:
+            S3ConnectionFactory.__connections = {}
+            S3ConnectionFactory.__resources = threading.local()
+            S3ConnectionFactory.__dotenv_loaded = False
+
+    def _create(
+        self, connection_type: str, credentials: tuple, max_pool_connections: int
+    ) -> boto3.client:
+        access, password, region, endpoint = credentials
+        session = boto3.session.Session(
+            aws_access_key_id=access, aws_secret_access_key=password, region_name=region,
+        )
+        config = Config(max_pool_connections=max_pool_connections)
+
+        if connection_type == "resource":
+            return session.resource("s3", endpoint_url=endpoint, config=config)
+        else:
+            return session.client("s3", endpoint_url=endpoint, config=config)
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        PROGRESS STREAM                                           #
+# ------------------------------------------------------------------------------------------------ #
+class ProgressStream:
+    """Read-only file object that reports the bytes read from an underlying stream.
+
+    Args:
+        stream (Any): A file-like object, such as the body of an S3 get_object response.
+        callback (Callable): Called with the number of bytes returned by each read.
+    """
+
+    def __init__(self, stream, callback) -> None:
+        self._stream = stream
+        self._callback = callback
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size) if size is not None and size >= 0 else self._stream.read()
+        self._callback(len(data))
+        return data
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                     PARALLEL GZIP WRITER                                         #
+# ------------------------------------------------------------------------------------------------ #
+class ParallelGzipWriter:
+    """Write-only file object that gzip compresses blocks of data on several cores.
+
+    Blocks are compressed independently as raw deflate streams, each primed with the last 32KB
+    of the preceding block and ended on a byte boundary, then concatenated in order. The result
+    is a single member gzip stream, readable by gzip, tarfile and other standard tools, both
+    in file and stream mode. zlib releases the GIL while compressing, so a thread pool suffices.
+
+    Args:
+        sink (Callable): Called with the compressed bytes, in order.
+        level (int): zlib compression level. Default = 6
+        blocksize (int): Size of the uncompressed blocks in bytes. Default = 1MB
+        max_workers (int): Number of compression threads. Default = number of CPUs
+    """
+
+    __window = 32 * 1024
+
+    def __init__(
+        self, sink, level: int = 6, blocksize: int = 1024 ** 2, max_workers: int = None
+    ) -> None:
+        self._sink = sink
+        self._level = level
+        self._blocksize = blocksize
+        self._max_workers = max_workers or os.cpu_count()
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        self._pending = deque()
+        self._buffer = bytearray()
+        self._dictionary = b""
+        self._crc = 0
+        self._size = 0
+        self._closed = False
+
+        # Gzip header: magic number, deflate, no flags, modification time, no extra flags, unknown OS
+        self._sink(b"\x1f\x8b\x08\x00" + struct.pack("<I", int(time.time())) + b"\x00\xff")
+
+    def write(self, data: bytes) -> int:
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._blocksize:
+            block = bytes(self._buffer[: self._blocksize])
+            del self._buffer[: self._blocksize]
+            self._submit(block=block, last=False)
+        return len(data)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._submit(block=bytes(self._buffer), last=True)
+        self._buffer = bytearray()
+        while self._pending:
+            self._sink(self._pending.popleft().result())
+        self._executor.shutdown()
+        # Gzip trailer: CRC32 and size modulo 2^32 of the uncompressed data
+        self._sink(struct.pack("<II", self._crc & 0xFFFFFFFF, self._size & 0xFFFFFFFF))
+
+    def _submit(self, block: bytes, last: bool) -> None:
+        self._crc = zlib.crc32(block, self._crc)
+        self._size += len(block)
+        future = self._executor.submit(self._compress, block, self._dictionary, last)
+        self._dictionary = block[-self.__window :]
+        self._pending.append(future)
+
+        # Bound the blocks held in memory, passing finished blocks on in order.
+        while len(self._pending) > 2 * self._max_workers:
+            self._sink(self._pending.popleft().result())
+
+    def _compress(self, block: bytes, dictionary: bytes, last: bool) -> bytes:
+        if dictionary:
+            compressor = zlib.compressobj(self._level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
         else:
-            s3 = boto3.client("s3", aws_access_key_id=S3_ACCESS, aws_secret_access_key=S3_PASSWORD)
-        return s3
+            compressor = zlib.compressobj(self._level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        flush = zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+        return compressor.compress(block) + compressor.flush(flush)
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                       MULTIPART UPLOAD                                           #
+# ------------------------------------------------------------------------------------------------ #
+class MultipartUpload:
+    """Write-only file object that uploads the bytes written to it as an S3 multipart upload.
+
+    Parts are uploaded concurrently as soon as enough bytes have been written. At most
+    max_workers parts are held in memory at once.
+
+    Args:
+        s3 (boto3.client): The S3 client
+        bucket (str): The name of the S3 bucket
+        object_key (str): The path to the object
+        partsize (int): Size of each part in bytes, at least 5MB. Default = 16MB
+        max_workers (int): Number of parts uploaded concurrently. Default = 10
+    """
+
+    def __init__(
+        self,
+        s3: boto3.client,
+        bucket: str,
+        object_key: str,
+        partsize: int = 16 * 1024 ** 2,
+        max_workers: int = 10,
+    ) -> None:
+        self._s3 = s3
+        self._bucket = bucket
+        self._object_key = object_key
+        self._partsize = partsize
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = deque()
+        self._parts = []
+        self._buffer = bytearray()
+
+        response = s3.create_multipart_upload(Bucket=bucket, Key=object_key)
+        self._upload_id = response["UploadId"]
+
+    def write(self, data: bytes) -> int:
+        self._buffer.extend(data)
+        while len(self._buffer) >= self._partsize:
+            part = bytes(self._buffer[: self._partsize])
+            del self._buffer[: self._partsize]
+            self._submit(part)
+        return len(data)
+
+    def complete(self) -> None:
+        """Uploads the remaining bytes as the last part and completes the upload."""
+        if self._buffer or not self._parts and not self._pending:
+            self._submit(bytes(self._buffer))
+            self._buffer = bytearray()
+        while self._pending:
+            self._parts.append(self._pending.popleft().result())
+        self._executor.shutdown()
+
+        self._s3.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=self._object_key,
+            UploadId=self._upload_id,
+            MultipartUpload={"Parts": sorted(self._parts, key=lambda part: part["PartNumber"])},
+        )
+
+    def abort(self) -> None:
+        """Aborts the upload, so S3 discards the parts already uploaded."""
+        for future in self._pending:
+            future.cancel()
+        self._executor.shutdown()
+        self._s3.abort_multipart_upload(
+            Bucket=self._bucket, Key=self._object_key, UploadId=self._upload_id
+        )
+
+    def _submit(self, part: bytes) -> None:
+        number = len(self._parts) + len(self._pending) + 1
+        self._pending.append(self._executor.submit(self._upload_part, part, number))
+        while len(self._pending) > self._max_workers:
+            self._parts.append(self._pending.popleft().result())
+
+    def _upload_part(self, part: bytes, number: int) -> dict:
+        response = self._s3.upload_part(
+            Bucket=self._bucket,
+            Key=self._object_key,
+            UploadId=self._upload_id,
+            PartNumber=number,
+            Body=part,
+        )
+        return {"PartNumber": number, "ETag": response["ETag"]}
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /schema.py                                                                          #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:12:40 am                                              #
+# Modified   : Saturday October 17th 2026 10:12:40 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Explicit Spark schemas for the raw CSV files of each datasource."""
+import os
+import re
+import logging
+import logging.config
+import threading
+from pyspark.sql.types import (
+    StructType,
+    StructField,
+    ByteType,
+    ShortType,
+    IntegerType,
+    LongType,
+    FloatType,
+    DoubleType,
+    DecimalType,
+    StringType,
+    BooleanType,
+    TimestampType,
+)
+
+from deepctr.utils.config import YamlIO
+from deepctr.utils.log_config import LOG_CONFIG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+TYPES = {
+    "byte": ByteType,
+    "short": ShortType,
+    "int": IntegerType,
+    "long": LongType,
+    "float": FloatType,
+    "double": DoubleType,
+    "string": StringType,
+    "boolean": BooleanType,
+    "timestamp": TimestampType,
+}
+DECIMAL = re.compile(r"^decimal\((\d+),\s*(\d+)\)$")
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      SCHEMA REGISTRY                                             #
+# ------------------------------------------------------------------------------------------------ #
+class SchemaRegistry:
+    """Spark schemas for raw files, keyed by datasource, dataset and file name.
+
+    Schemas are read from the 'schemas' section of config/<datasource>.yml, which maps each
+    dataset to its files and each file to an ordered mapping of raw column names to types.
+    Types are one of the keys of TYPES, or decimal(precision,scale). Files that are not
+    comma separated with a header row instead map to 'columns', holding the column types,
+    and 'options', holding the sep and header arguments to read them with. Passing a schema to
+    SparkCSV.read replaces schema inference, which costs Spark an extra pass over the file,
+    and fixes the column types across runs. Config files are read once per process.
+
+    Args:
+        folder (str): Folder containing the datasource config files. Default = 'config'
+    """
+
+    __schemas = {}
+    __lock = threading.Lock()
+
+    def __init__(self, folder: str = "config") -> None:
+        self._folder = folder
+
+    def get(self, datasource: str, dataset: str, name: str) -> StructType:
+        """Returns the schema for a file, or None if the registry has no schema for it.
+
+        Args:
+            datasource (str): The datasource, i.e. 'alibaba', 'avazu' or 'criteo'
+            dataset (str): The dataset within the datasource
+            name (str): The name of the file within the dataset
+        """
+        columns = self._get_entry(datasource, dataset, name).get("columns")
+        if not columns:
+            logger.info("No schema registered for {}/{}/{}.".format(datasource, dataset, name))
+            return None
+        return StructType(
+            [
+                StructField(column, self._get_type(dtype), nullable=True)
+                for column, dtype in columns.items()
+            ]
+        )
+
+    def read_options(self, datasource: str, dataset: str, name: str) -> dict:
+        """Returns the sep and header arguments registered for a file, or an empty dict.
+
+        Args:
+            datasource (str): The datasource, i.e. 'alibaba', 'avazu' or 'criteo'
+            dataset (str): The dataset within the datasource
+            name (str): The name of the file within the dataset
+        """
+        return dict(self._get_entry(datasource, dataset, name).get("options") or {})
+
+    def _get_entry(self, datasource: str, dataset: str, name: str) -> dict:
+        """Returns the columns and read options registered for a file."""
+        entry = self._load(datasource).get(dataset, {}).get(name) or {}
+        if isinstance(entry.get("columns"), dict):
+            return entry
+        return {"columns": entry}
+
+    def _load(self, datasource: str) -> dict:
+        filepath = os.path.join(self._folder, datasource + ".yml")
+        with SchemaRegistry.__lock:
+            if filepath not in SchemaRegistry.__schemas:
+                config = YamlIO().read(filepath) or {}
+                SchemaRegistry.__schemas[filepath] = config.get("schemas") or {}
+            return SchemaRegistry.__schemas[filepath]
+
+    def _get_type(self, dtype: str):
+        dtype = str(dtype).strip().lower()
+        if dtype in TYPES:
+            return TYPES[dtype]()
+        match = DECIMAL.match(dtype)
+        if match:
+            return DecimalType(precision=int(match.group(1)), scale=int(match.group(2)))
+        msg = "Unsupported schema type {}. Expected one of {} or decimal(p,s).".format(
+            dtype, list(TYPES.keys())
+        )
+        logger.error(msg)
+        raise ValueError(msg)
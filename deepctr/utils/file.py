@@ -19,7 +19,8 @@
 import os
 import shutil
 from sklearn.datasets import load_iris
-from pyspark.sql import SparkSession
+
+from deepctr.data.local import SparkSessionProvider
 
 # ------------------------------------------------------------------------------------------------ #
 
@@ -70,8 +71,7 @@ class FileCreator:
 
     def create_parquet(self):
         df = self._get_dataframe()
-        spark = SparkSession.builder.master("local[18]").appName("Spark DataFrame").getOrCreate()
-        spark.sparkContext.setLogLevel("ERROR")
+        spark = SparkSessionProvider().get_session()
         sdf = spark.createDataFrame(df)
         sdf.write.parquet(self._filepath)
 
@@ -102,8 +102,7 @@ def file_creator(filepath: str):
     if "csv" in ext:
         df.to_csv(filepath)
     elif "parquet" in ext:
-        spark = SparkSession.builder.master("local[18]").appName("Spark DataFrame").getOrCreate()
-        spark.sparkContext.setLogLevel("ERROR")
+        spark = SparkSessionProvider().get_session()
         sdf = spark.createDataFrame(df)
         sdf.write.parquet(filepath)
     else:
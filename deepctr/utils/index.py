@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /index.py                                                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:02:19 am                                              #
+# Modified   : Saturday October 17th 2026 11:02:19 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+"""Line offset index for random row access into large CSV files."""
+import io
+import os
+import mmap
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------------------------------------ #
+
+
+class LineIndex:
+    """Row access by number into a CSV file through an index of line offsets.
+
+    The index holds the byte offset of the start of every line, followed by the file size, as
+    a uint64 NumPy array saved next to the file. Row i spans offsets[i] to offsets[i + 1], so
+    any range of rows is a single slice of the memory mapped file, and a random subset of rows
+    costs one slice per row. The index is rebuilt when the file size no longer matches it or
+    the file is newer than the index.
+
+    Args:
+        filepath (str): Path to the csv file
+        header (bool): True if the file begins with a header row. Rows are numbered from the
+            first data row. Default = True
+        sep (str): Column delimiter. Default = ","
+        blocksize (int): Bytes scanned at a time when building the index. Default = 16MB
+    """
+
+    def __init__(
+        self, filepath: str, header: bool = True, sep: str = ",", blocksize: int = 16 * 1024 ** 2
+    ) -> None:
+        self._filepath = filepath
+        self._header = header
+        self._sep = sep
+        self._blocksize = blocksize
+        self._offsets = None
+
+    @property
+    def index_filepath(self) -> str:
+        return os.path.join(
+            os.path.dirname(self._filepath), "." + os.path.basename(self._filepath) + ".offsets.npy"
+        )
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1 - (1 if self._header else 0), 0)
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """The line offsets, built or loaded on first use."""
+        if self._offsets is None:
+            self.build()
+        return self._offsets
+
+    def build(self, force: bool = False) -> None:
+        """Loads the index, building and saving it if it is missing or stale.
+
+        Args:
+            force (bool): If True, rebuild the index even if it is current.
+        """
+        if not force and self._is_current():
+            self._offsets = np.load(self.index_filepath, mmap_mode="r")
+            return
+
+        size = os.path.getsize(self._filepath)
+        chunks = [np.zeros(1, dtype=np.uint64)]
+        with open(self._filepath, "rb") as f:
+            position = 0
+            while True:
+                block = f.read(self._blocksize)
+                if not block:
+                    break
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                chunks.append((newlines + position + 1).astype(np.uint64))
+                position += len(block)
+
+        offsets = np.concatenate(chunks)
+        # A last line without a trailing newline still ends at the end of the file.
+        if offsets[-1] != size:
+            offsets = np.append(offsets, np.uint64(size))
+
+        try:
+            np.save(self.index_filepath, offsets)
+        except OSError:
+            pass  # Read-only locations keep the index in memory only
+        self._offsets = offsets
+
+    def lines(self, start: int, stop: int) -> bytes:
+        """Returns the raw bytes of rows start through stop - 1."""
+        start, stop, _ = slice(start, stop).indices(len(self))
+        first = start + (1 if self._header else 0)
+        last = max(stop, start) + (1 if self._header else 0)
+        with open(self._filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mm:
+                return mm[int(self.offsets[first]) : int(self.offsets[last])]
+
+    def read(self, start: int, stop: int) -> pd.DataFrame:
+        """Returns rows start through stop - 1 as a DataFrame.
+
+        Args:
+            start (int): First row, counted from the first data row
+            stop (int): One past the last row
+        """
+        return self._to_dataframe(self.lines(start, stop))
+
+    def take(self, rows: list) -> pd.DataFrame:
+        """Returns the given rows, in the order given, as a DataFrame.
+
+        Args:
+            rows (list): Row numbers, counted from the first data row
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size and (rows.min() < 0 or rows.max() >= len(self)):
+            raise IndexError("Rows must be between 0 and {}.".format(len(self) - 1))
+        lines = rows + (1 if self._header else 0)
+        with open(self._filepath, "rb") as f:
+            with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mm:
+                data = b"".join(
+                    self._terminate(mm[int(self.offsets[line]) : int(self.offsets[line + 1])])
+                    for line in lines
+                )
+        return self._to_dataframe(data)
+
+    def sample(self, size: int, random_state: int = 50) -> pd.DataFrame:
+        """Returns a uniform random sample of rows, without replacement, in file order.
+
+        Args:
+            size (int): Sample size
+            random_state (int): Pseudo random seed
+        """
+        rng = np.random.default_rng(random_state)
+        rows = rng.choice(len(self), size=min(size, len(self)), replace=False)
+        return self.take(np.sort(rows))
+
+    def _is_current(self) -> bool:
+        if not os.path.exists(self.index_filepath):
+            return False
+        if os.path.getmtime(self.index_filepath) < os.path.getmtime(self._filepath):
+            return False
+        try:
+            offsets = np.load(self.index_filepath, mmap_mode="r")
+        except (OSError, ValueError, EOFError):
+            return False  # A corrupt or truncated index is rebuilt
+        return (
+            offsets.ndim == 1
+            and len(offsets) > 0
+            and int(offsets[-1]) == os.path.getsize(self._filepath)
+        )
+
+    def _terminate(self, line: bytes) -> bytes:
+        return line if not line or line.endswith(b"\n") else line + b"\n"
+
+    def _to_dataframe(self, data: bytes) -> pd.DataFrame:
+        if self._header:
+            header = self._terminate(self._read_header())
+            return pd.read_csv(io.BytesIO(header + self._terminate(data)), sep=self._sep)
+        if not data:
+            return pd.DataFrame()
+        return pd.read_csv(io.BytesIO(self._terminate(data)), sep=self._sep, header=None)
+
+    def _read_header(self) -> bytes:
+        with open(self._filepath, "rb") as f:
+            return f.readline()
@@ -17,26 +17,151 @@
 # License  : BSD 3-clause "New" or "Revised" License                                               #
 # Copyright: (c) 2022 Bryant St. Labs                                                              #
 # ================================================================================================ #
-import pandas as pd
+import io
+import csv
+import math
 import random
+import itertools
+import pandas as pd
+from typing import Union
 
 # ------------------------------------------------------------------------------------------------ #
 
 
 def sample_from_file(
-    source: str, size: int, header: bool = True, random_state: int = 50
+    source: Union[str, list],
+    size: int,
+    header: bool = True,
+    random_state: int = 50,
+    sep: str = ",",
+    label: Union[str, int] = None,
 ) -> pd.DataFrame:
     """Reads a random sampling of 'size' from 'source' file
 
+    The files are read once, line by line, and a reservoir holds the sampled lines, so memory
+    is proportional to the sample size rather than the file. Only the sampled lines are parsed.
+    Rows are returned in file order.
+
     Args:
-        source (str): The filepath to the file to be sampled
+        source (str, list): The filepath to the file to be sampled, or a list of filepaths
+            sharing the same columns, sampled as if they were one file.
         size (int): Sample size
         header (bool): True if file contains a header row.
         random_state (int): Pseudo random seed
+        sep (str): Column delimiter. Default = ","
+        label (str, int): Optional column name or index to stratify the sample by. Each label
+            value is represented in proportion to its frequency in the files.
     Returns:
         pd.DataFrame
     """
-    header_row = 1 if header else 0
-    n = sum(1 for line in open(source)) - header_row  # Num lines in file minus header if exists
-    skip = sorted(random.sample(range(header_row, n + 1), n - size))
-    return pd.read_csv(source, skiprows=skip)
+    sources = [source] if isinstance(source, str) else list(source)
+    rng = random.Random(random_state)
+
+    header_line = _read_header(sources[0]) if header else b""
+    lines = _read_lines(sources, header=header)
+
+    if label is None:
+        sample = _reservoir(lines, size=size, rng=rng)
+    else:
+        index = _get_label_index(label, header_line=header_line, sep=sep)
+        sample = _stratified_reservoir(lines, size=size, index=index, sep=sep, rng=rng)
+
+    sample.sort(key=lambda item: item[0])
+    data = header_line + b"".join(
+        line if line.endswith(b"\n") else line + b"\n" for _, line in sample
+    )
+    return pd.read_csv(io.BytesIO(data), sep=sep, header=0 if header else None)
+
+
+def _read_header(source: str) -> bytes:
+    with open(source, "rb") as f:
+        line = f.readline()
+    return line if line.endswith(b"\n") else line + b"\n"
+
+
+def _read_lines(sources: list, header: bool):
+    """Yields ((file number, line number), line) for the data lines of each file."""
+    for file_no, source in enumerate(sources):
+        with open(source, "rb") as f:
+            if header:
+                f.readline()
+            for line_no, line in enumerate(f):
+                yield (file_no, line_no), line
+
+
+def _uniform(rng: random.Random) -> float:
+    """Returns a random number in the open interval (0, 1)."""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+
+def _reservoir(items, size: int, rng: random.Random) -> list:
+    """Reservoir sampling with geometric skips (Li's Algorithm L).
+
+    Draws O(size * log(n / size)) random numbers rather than one per item, so lines that are
+    skipped cost no more than reading them.
+    """
+    items = iter(items)
+    reservoir = list(itertools.islice(items, size))
+    if len(reservoir) < size or size == 0:
+        return reservoir
+
+    w = math.exp(math.log(_uniform(rng)) / size)
+    while True:
+        skip = math.floor(math.log(_uniform(rng)) / math.log1p(-w))
+        item = next(itertools.islice(items, skip, None), None)
+        if item is None:
+            return reservoir
+        reservoir[rng.randrange(size)] = item
+        w *= math.exp(math.log(_uniform(rng)) / size)
+
+
+def _stratified_reservoir(items, size: int, index: int, sep: str, rng: random.Random) -> list:
+    """Proportionally allocated stratified sample of items, keyed by the label column.
+
+    A reservoir of up to 'size' lines is kept per label value along with the count of lines
+    seen. At the end, each stratum is allotted its share of the sample by largest remainder
+    and its reservoir is subsampled, which keeps the sample uniform within each stratum.
+    """
+    reservoirs = {}
+    counts = {}
+    for item in items:
+        value = next(csv.reader([item[1].decode("utf-8")], delimiter=sep))[index]
+        count = counts.get(value, 0) + 1
+        counts[value] = count
+        reservoir = reservoirs.setdefault(value, [])
+        if len(reservoir) < size:
+            reservoir.append(item)
+        else:
+            j = rng.randrange(count)
+            if j < size:
+                reservoir[j] = item
+
+    total = sum(counts.values())
+    if total <= size:
+        return [item for reservoir in reservoirs.values() for item in reservoir]
+
+    quotas = {value: size * count / total for value, count in counts.items()}
+    allocation = {value: math.floor(quota) for value, quota in quotas.items()}
+    remainder = size - sum(allocation.values())
+    for value in sorted(quotas, key=lambda v: quotas[v] - allocation[v], reverse=True)[:remainder]:
+        allocation[value] += 1
+
+    sample = []
+    for value, reservoir in reservoirs.items():
+        sample.extend(rng.sample(reservoir, allocation[value]))
+    return sample
+
+
+def _get_label_index(label: Union[str, int], header_line: bytes, sep: str) -> int:
+    if isinstance(label, int):
+        return label
+    if not header_line:
+        raise ValueError("A label name requires a header row. Pass the column index instead.")
+    columns = next(csv.reader([header_line.decode("utf-8")], delimiter=sep))
+    columns = [column.strip() for column in columns]
+    if label not in columns:
+        raise ValueError("Label {} is not a column. Columns are {}.".format(label, columns))
+    return columns.index(label)
@@ -15,23 +15,119 @@
 # License    : BSD 3-clause "New" or "Revised" License                                             #
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
+import os
+import sys
+import math
+from urllib.parse import urlparse
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
 from pyspark.sql import DataFrame
 
 # ------------------------------------------------------------------------------------------------ #
-def get_size_spark(data: DataFrame, fraction: float = 0.001, seed=None) -> int:
+# Spark reports this size when it cannot estimate a plan, e.g. after a Python UDF.
+UNKNOWN_SIZE = 2 ** 63 - 1
+METHODS = ["auto", "plan", "parquet", "sample"]
+
+
+# ------------------------------------------------------------------------------------------------ #
+def get_size_spark(
+    data: DataFrame,
+    fraction: float = 0.001,
+    seed=None,
+    method: str = "auto",
+    tolerance: float = 0.05,
+    max_fraction: float = 0.1,
+) -> int:
     """Estimates size of a Spark DataFrame
 
-    This function takes a sample from the Spark Dataframe, converts it to a pandas DataFrame,
-    then uses pandas memory_usage method to obtain the size of the sample in memory. We
-    multiply that value by the inverse of our  sampling fraction to get an estimate for the
-    size of the entire Spark DataFrame.
+    Methods, from cheapest to most expensive:
+        plan: Size from the statistics of Spark's optimized logical plan. No job is run. For
+            file scans this is the size of the files, adjusted for projections and filters.
+            Raises ValueError if Spark has no estimate for the plan, e.g. after a Python UDF.
+        parquet: Sum of the uncompressed row group sizes in the Parquet footers of the files
+            the DataFrame reads. No job is run; only footers are read.
+        sample: Samples rows, measures their size in memory and extrapolates to the row
+            count. The sample is doubled until the relative standard error of the mean row
+            size is within tolerance, or the sample fraction reaches max_fraction.
+        auto: plan, falling back to sample when Spark has no estimate for the plan.
 
     Args:
         data: (DataFrame) The Spark DataFrame
-        fraction (float): The fraction of the Spark DataFrame to sample
+        fraction (float): The initial fraction of the Spark DataFrame to sample
+        seed (int): Seed for the sample
+        method (str): One of 'auto', 'plan', 'parquet' or 'sample'. Default = 'auto'
+        tolerance (float): Target relative standard error for the sample method. Default = 0.05
+        max_fraction (float): Largest fraction sampled by the sample method. Default = 0.1
     Returns:
         (int) Size of Spark DataFrame in bytes.
     """
-    df_sample = data.sample(withReplacement=False, fraction=fraction, seed=seed).toPandas()
-    sample_size = df_sample.memory_usage(deep=True).sum()
-    return sample_size / fraction
+    if method not in METHODS:
+        raise ValueError("Method {} is not supported. Valid methods are {}.".format(method, METHODS))
+
+    if method in ("auto", "plan"):
+        size = _get_size_plan(data)
+        if size is not None:
+            return size
+        if method == "plan":
+            raise ValueError(
+                "Spark has no size estimate for the plan. Use method 'auto' or 'sample'."
+            )
+    if method == "parquet":
+        return _get_size_parquet(data)
+    return _get_size_sample(
+        data, fraction=fraction, seed=seed, tolerance=tolerance, max_fraction=max_fraction
+    )
+
+
+def _get_size_plan(data: DataFrame) -> int:
+    """Returns the size estimate from the optimized plan, or None if Spark has none."""
+    stats = data._jdf.queryExecution().optimizedPlan().stats()
+    size = int(stats.sizeInBytes().toString())
+    return None if size >= UNKNOWN_SIZE else size
+
+
+def _get_size_parquet(data: DataFrame) -> int:
+    """Returns the uncompressed size of the row groups in the Parquet files read by data."""
+    size = 0
+    for uri in data.inputFiles():
+        parsed = urlparse(uri)
+        filepath = parsed.path if parsed.scheme in ("", "file") else uri
+        if not os.path.basename(filepath).startswith(("_", ".")):
+            metadata = pq.read_metadata(filepath)
+            size += sum(metadata.row_group(i).total_byte_size for i in range(metadata.num_row_groups))
+    return size
+
+
+def _get_size_sample(
+    data: DataFrame, fraction: float, seed, tolerance: float, max_fraction: float
+) -> int:
+    """Extrapolates the mean in-memory row size of a sample to the row count."""
+    rows = data.count()
+    if rows == 0:
+        return 0
+
+    while True:
+        sample = data.sample(withReplacement=False, fraction=fraction, seed=seed).toPandas()
+        sizes = _get_row_sizes(sample)
+        if len(sizes) > 1:
+            mean = sizes.mean()
+            error = sizes.std(ddof=1) / (mean * math.sqrt(len(sizes))) if mean else 0.0
+            if error <= tolerance or fraction >= max_fraction:
+                return int(mean * rows)
+        elif fraction >= max_fraction:
+            return int(sizes.mean() * rows) if len(sizes) else 0
+        fraction = min(fraction * 2, max_fraction)
+
+
+def _get_row_sizes(df: pd.DataFrame) -> np.ndarray:
+    """Returns the in-memory size of each row of a pandas DataFrame, as memory_usage(deep=True)
+    would count it."""
+    sizes = np.zeros(len(df), dtype=np.float64)
+    for column in df.columns:
+        series = df[column]
+        if isinstance(series.dtype, np.dtype) and series.dtype != object:
+            sizes += series.dtype.itemsize
+        else:
+            sizes += series.map(sys.getsizeof).to_numpy(dtype=np.float64) + 8  # Object and pointer
+    return sizes
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project  : DeepCTR: Deep Learning and Neural Architecture Selection for CTR Prediction     #
+# Version  : 0.1.0                                                                                 #
+# File     : /__init__.py                                                                          #
+# Language : Python 3.10.4                                                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author   : John James                                                                            #
+# Email    : john.james.ai.studio@gmail.com                                                        #
+# URL      : https://github.com/john-james-ai/DeepCTR                                        #
+# ------------------------------------------------------------------------------------------------ #
+# Created  : Thursday, April 7th 2022, 3:26:01 pm                                                  #
+# Modified : Thursday, April 7th 2022, 3:26:08 pm                                                  #
+# Modifier : John James (john.james.ai.studio@gmail.com)                                           #
+# ------------------------------------------------------------------------------------------------ #
+# License  : BSD 3-clause "New" or "Revised" License                                               #
+# Copyright: (c) 2022 Bryant St. Labs                                                              #
+# ================================================================================================ #
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_cache.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:25:00 pm                                              #
+# Modified   : Saturday October 17th 2026 09:25:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import shutil
+import inspect
+import pytest
+import logging
+import logging.config
+from typing import Any
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.dag.base import Operator
+from deepctr.dag.cache import TaskCache, get_path_fingerprint
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_cache"
+SOURCE = os.path.join(FOLDER, "source.csv")
+TARGET = os.path.join(FOLDER, "target.csv")
+
+
+def write(filepath: str, content: str) -> None:
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, "w") as f:
+        f.write(content)
+
+
+def touch(filepath: str, seconds: int = 10) -> None:
+    """Moves the modification time of a file forward without changing its content."""
+    stat = os.stat(filepath)
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10 ** 9))
+
+
+class Copy(Operator):
+    """Copies the source file to the target file, counting its runs."""
+
+    def __init__(self, params: dict = None) -> None:
+        super(Copy, self).__init__(seq=1, name="copy", desc="", params=params or {})
+        self.runs = 0
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self.runs += 1
+        shutil.copyfile(SOURCE, TARGET)
+
+    def inputs(self) -> list:
+        return [SOURCE]
+
+    def outputs(self) -> list:
+        return [TARGET]
+
+
+class Count(Operator):
+    """Counts its runs. Declares no outputs."""
+
+    def __init__(self) -> None:
+        super(Count, self).__init__(seq=2, name="count", desc="", params={})
+        self.runs = 0
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self.runs += 1
+
+
+@pytest.fixture
+def folder():
+    shutil.rmtree(FOLDER, ignore_errors=True)
+    write(SOURCE, "a,b\n1,2\n")
+    yield FOLDER
+    shutil.rmtree(FOLDER, ignore_errors=True)
+
+
+@pytest.mark.dag
+@pytest.mark.cache
+class TestPathFingerprint:
+    def test_file(self, caplog, folder) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        assert get_path_fingerprint(os.path.join(folder, "none.csv")) is None
+
+        # By default, files are fingerprinted by size and modification time
+        fingerprint = get_path_fingerprint(SOURCE)
+        assert fingerprint == [os.path.getsize(SOURCE), os.stat(SOURCE).st_mtime_ns]
+        touch(SOURCE)
+        assert get_path_fingerprint(SOURCE) != fingerprint, logger.error("Touch missed.")
+
+        # With hashing opted in, small files are fingerprinted by content, so a touch doesn't
+        # change them. Larger files are still fingerprinted by stat.
+        hash_max_size = 16 * 1024 ** 2
+        fingerprint = get_path_fingerprint(SOURCE, hash_max_size=hash_max_size)
+        touch(SOURCE)
+        assert get_path_fingerprint(SOURCE, hash_max_size=hash_max_size) == fingerprint
+        write(SOURCE, "a,b\n1,3\n")
+        assert get_path_fingerprint(SOURCE, hash_max_size=hash_max_size) != fingerprint
+        fingerprint = get_path_fingerprint(SOURCE, hash_max_size=1)
+        assert fingerprint == [os.path.getsize(SOURCE), os.stat(SOURCE).st_mtime_ns]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_folder(self, caplog, folder) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        path = os.path.join(folder, "spark.parquet")
+        write(os.path.join(path, "part-0.parquet"), "0")
+        fingerprint = get_path_fingerprint(path)
+        assert get_path_fingerprint(path) == fingerprint
+
+        write(os.path.join(path, "part-1.parquet"), "1")
+        assert get_path_fingerprint(path) != fingerprint, logger.error("New part file missed.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.dag
+@pytest.mark.cache
+class TestTaskCache:
+    def test_skip(self, caplog, folder) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(folder, "tasks.json")
+        task = Copy()
+        _, fingerprint = TaskCache(filepath).run(task)
+        assert task.runs == 1 and os.path.exists(TARGET)
+
+        # An unchanged task is skipped, also by a new cache reading the same file
+        result, skipped = TaskCache(filepath).run(task)
+        assert task.runs == 1, logger.error("Unchanged task was not skipped.")
+        assert result is None and skipped == fingerprint
+
+        # Changes to params, upstream fingerprints or outputs rerun the task
+        cache = TaskCache(filepath)
+        other = Copy(params={"header": True})
+        cache.run(other)
+        assert other.runs == 1, logger.error("Changed params did not rerun the task.")
+        assert not cache.is_current(task, cache.fingerprint(task, upstream=["changed"]))
+        write(TARGET, "changed")
+        cache.run(task)
+        assert task.runs == 2, logger.error("Changed output did not rerun the task.")
+
+        # Tasks without outputs are never skipped
+        count = Count()
+        cache.run(count)
+        cache.run(count)
+        assert count.runs == 2
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    @pytest.mark.parametrize("hash_max_size", [0, 16 * 1024 ** 2])
+    def test_input_change(self, caplog, folder, hash_max_size) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        cache = TaskCache(os.path.join(folder, "tasks.json"), hash_max_size=hash_max_size)
+        task = Copy()
+        cache.run(task)
+        cache.run(task)
+        assert task.runs == 1
+
+        # A new modification time reruns the task when inputs are fingerprinted by stat.
+        # Hashed inputs are unchanged by a touch.
+        touch(SOURCE)
+        cache.run(task)
+        assert task.runs == (2 if hash_max_size == 0 else 1), logger.error("Touch handled wrong.")
+
+        # A change in size always reruns the task
+        runs = task.runs
+        write(SOURCE, "a,b\n1,2\n3,4\n")
+        cache.run(task)
+        assert task.runs == runs + 1, logger.error("Input size change did not rerun the task.")
+        cache.run(task)
+        assert task.runs == runs + 1
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
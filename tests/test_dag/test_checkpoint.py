@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_checkpoint.py                                                                 #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 08:20:00 pm                                              #
+# Modified   : Saturday October 17th 2026 08:20:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import shutil
+import inspect
+import pytest
+import logging
+import logging.config
+from typing import Any
+import pandas as pd
+import pyarrow as pa
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.dal.context import DBContext
+from deepctr.dag.base import Operator
+from deepctr.dag.checkpoint import Checkpoint
+from deepctr.dag.orchestrator import DataDAG
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_checkpoint"
+
+
+class RecordingContext(DBContext):
+    """A DBContext without a database, recording whether each run committed or rolled back."""
+
+    def __init__(self) -> None:
+        super(RecordingContext, self).__init__(database=None)
+        self.ended = []
+
+    def commit(self) -> None:
+        self.ended.append("commit")
+
+    def rollback(self) -> None:
+        self.ended.append("rollback")
+
+
+class Source(Operator):
+    """Returns a one row DataFrame holding its sequence number. Not checkpointed."""
+
+    def __init__(self, seq: int, calls: list = None) -> None:
+        super(Source, self).__init__(seq=seq, name="source_{}".format(seq), desc="", params={})
+        self._calls = calls if calls is not None else []
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self._calls.append(self.seq)
+        return pd.DataFrame({"total": [self.seq]})
+
+
+class Add(Source):
+    """Adds its sequence number to the total, failing while fail is set. Checkpointed."""
+
+    checkpoint = True
+
+    def __init__(self, seq: int, calls: list = None, fail: dict = None) -> None:
+        super(Add, self).__init__(seq=seq, calls=calls)
+        self._fail = fail if fail is not None else {}
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self._calls.append(self.seq)
+        if self._fail.get(self.seq):
+            raise RuntimeError("Task {} failed.".format(self.seq))
+        return data.assign(total=data["total"] + self.seq)
+
+
+class Writer(Source):
+    """Declares an output and returns nothing."""
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self._calls.append(self.seq)
+
+    def outputs(self) -> list:
+        return [os.path.join(FOLDER, "output.csv")]
+
+
+@pytest.mark.dag
+@pytest.mark.checkpoint
+class TestCheckpoint:
+    def test_save_load(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        folder = os.path.join(FOLDER, "save_load")
+        checkpoint = Checkpoint(folder)
+        assert checkpoint.range is None and checkpoint.completed == {}
+        checkpoint.start(started=1, stopped=4)
+
+        # Tasks without outputs are only recorded if they opt in
+        df = pd.DataFrame({"total": [1, 2, 3]})
+        assert checkpoint.save(Source(1), data=df) is df
+        assert checkpoint.save(Add(2), data=df, fingerprint="abc").equals(df)
+        table = pa.table({"total": [4, 5]})
+        assert checkpoint.save(Add(3), data=table).equals(table)
+        assert checkpoint.save(Writer(4), data=None) is None
+        assert checkpoint.completed == {2: "abc", 3: None, 4: None}
+
+        # The state survives the process
+        checkpoint = Checkpoint(folder)
+        assert checkpoint.range == (1, 4)
+        assert sorted(checkpoint.completed) == [2, 3, 4]
+        assert checkpoint.load(1) is None
+        assert checkpoint.load(2).equals(df), logger.error("Checkpoint pandas load failed.")
+        assert checkpoint.load(3).equals(table), logger.error("Checkpoint arrow load failed.")
+        assert checkpoint.load(4) is None
+
+        # Data that can't be saved isn't recorded, unless the task has outputs
+        assert checkpoint.save(Add(5), data={"total": 1}) == {"total": 1}
+        assert checkpoint.save(Writer(6), data={"total": 1}) == {"total": 1}
+        assert 5 not in checkpoint.completed and 6 in checkpoint.completed
+
+        # A new run discards the last one, and clear discards everything
+        checkpoint.start(started=1, stopped=2)
+        assert checkpoint.range == (1, 2) and checkpoint.completed == {}
+        checkpoint.clear()
+        assert checkpoint.range is None and not os.path.exists(folder)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_spark(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        checkpoint = Checkpoint(os.path.join(FOLDER, "spark"))
+        checkpoint.start(started=1, stopped=1)
+        data = checkpoint.save(Add(1), data=spark_dataframe)
+        assert data.count() == 150
+        assert checkpoint.load(1).count() == 150, logger.error("Checkpoint spark load failed.")
+        checkpoint.clear()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.dag
+@pytest.mark.checkpoint
+class TestResume:
+    def build(
+        self, folder: str, calls: list, fail: dict, graph: bool, context: DBContext
+    ) -> DataDAG:
+        tasks = [
+            Source(1, calls=calls),
+            Add(2, calls=calls, fail=fail),
+            Add(3, calls=calls, fail=fail),
+            Add(4, calls=calls, fail=fail),
+        ]
+        if graph:
+            for task in tasks:
+                task.depends_on = [task.seq - 1] if task.seq > 1 else []
+        return DataDAG(
+            name="test_resume",
+            desc="Test Resume",
+            tasks=tasks,
+            context=context,
+            checkpoint=Checkpoint(folder),
+        )
+
+    @pytest.mark.parametrize("graph", [False, True])
+    def test_resume(self, caplog, graph) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        folder = os.path.join(FOLDER, "resume_{}".format(graph))
+        shutil.rmtree(folder, ignore_errors=True)
+        calls = []
+        fail = {3: True}
+        context = RecordingContext()
+
+        # The run is interrupted by the failure of task 3, and the context rolled back
+        with pytest.raises(RuntimeError):
+            self.build(folder, calls=calls, fail=fail, graph=graph, context=context).run()
+        assert calls == [1, 2, 3]
+        assert sorted(Checkpoint(folder).completed) == [2]
+        assert context.ended == ["rollback"]
+
+        # The resumed run restores task 2 and reruns the source, which isn't checkpointed
+        calls.clear()
+        fail.clear()
+        self.build(folder, calls=calls, fail=fail, graph=graph, context=context).resume()
+        assert sorted(calls) == [1, 3, 4], logger.error("Resume ran the wrong tasks.")
+        assert context.ended == ["rollback", "commit"], logger.error("Resume did not commit.")
+        checkpoint = Checkpoint(folder)
+        assert sorted(checkpoint.completed) == [2, 3, 4]
+        assert checkpoint.load(4)["total"].tolist() == [10], logger.error("Resume data failed.")
+
+        # Without a checkpoint to resume from, all tasks run
+        checkpoint.clear()
+        calls.clear()
+        self.build(folder, calls=calls, fail=fail, graph=graph, context=context).resume()
+        assert calls == [1, 2, 3, 4]
+        shutil.rmtree(folder, ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
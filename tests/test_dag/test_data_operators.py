@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_data_operators.py                                                             #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 11:40:00 pm                                              #
+# Modified   : Saturday October 17th 2026 11:40:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import shutil
+import inspect
+import pytest
+import logging
+import logging.config
+import pandas as pd
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.dag import data_operators
+from deepctr.dag.data_operators import DownloadS3, DataReader, DataWriter
+from deepctr.dag.transform_operators import ReplaceColumnNames
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_data_operators"
+
+
+def get_file_params(name: str, stage: str = "staged") -> dict:
+    return {
+        "home": FOLDER,
+        "name": name,
+        "datasource": "alibaba",
+        "dataset": "vesuvio",
+        "stage": stage,
+        "format": "parquet",
+        "backend": "arrow",
+    }
+
+
+def write_impressions() -> pd.DataFrame:
+    """Writes a small impression file for the readers, and returns its data."""
+    shutil.rmtree(FOLDER, ignore_errors=True)
+    folder = os.path.join(FOLDER, "alibaba", "vesuvio", "staged")
+    os.makedirs(folder)
+    df = pd.DataFrame({"user_id": [1, 2, 3, 4], "day": [5, 5, 6, 6], "click": [0, 1, 1, 0]})
+    df.to_parquet(os.path.join(folder, "impression.parquet"), index=False)
+    return df
+
+
+class StubS3:
+    """Stands in for S3, recording the manifest and the folders downloaded."""
+
+    manifests = []
+    downloads = []
+
+    def __init__(self, manifest: str = None) -> None:
+        StubS3.manifests.append(manifest)
+
+    def download_folder(self, **kwargs) -> list:
+        StubS3.downloads.append(kwargs)
+        return []
+
+
+@pytest.mark.dag
+@pytest.mark.operators
+class TestDownloadS3:
+    def test_execute(self, caplog, monkeypatch) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        StubS3.manifests, StubS3.downloads = [], []
+        monkeypatch.setattr(data_operators, "S3", StubS3)
+        params = {
+            "source": {"bucket": "deepctr", "folder": "alibaba/vesuvio/"},
+            "destination": {
+                "home": FOLDER,
+                "datasource": "alibaba",
+                "dataset": "vesuvio",
+                "stage": "raw",
+            },
+            "force": False,
+        }
+        task = DownloadS3(seq=1, name="download", desc="Download", params=params)
+        destination = FOLDER + "/alibaba/vesuvio/raw"
+        assert task.outputs() == [destination]
+
+        # The folder is downloaded in one call, through the resumable path by default
+        task.execute()
+        assert StubS3.manifests == [destination + "/.manifest.json"]
+        assert StubS3.downloads == [
+            {
+                "bucket": "deepctr",
+                "folder": "alibaba/vesuvio/",
+                "destination": destination,
+                "expand": True,
+                "force": False,
+                "stream": False,
+            }
+        ], logger.error("DownloadS3 did not download the folder.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.dag
+@pytest.mark.operators
+class TestDataReader:
+    def test_pushdown(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        df = write_impressions()
+        file = get_file_params(name="impression")
+        task = DataReader(seq=1, name="read", desc="Read", params={"file": file})
+        assert task.execute().equals(df)
+
+        # Only the columns and rows asked for are read
+        file.update({"columns": ["user_id", "click"], "filter": [["day", "=", 6]]})
+        data = task.execute()
+        assert list(data.columns) == ["user_id", "click"], logger.error("Columns not pushed.")
+        assert data["user_id"].tolist() == [3, 4], logger.error("Filter not pushed.")
+        shutil.rmtree(FOLDER, ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.dag
+@pytest.mark.operators
+class TestDataWriter:
+    def test_run(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Operators run through Operator.run, with a context, as a DAG runs them
+        df = write_impressions()
+        reader = DataReader(
+            seq=1, name="read", desc="Read", params={"file": get_file_params("impression")}
+        )
+        rename = ReplaceColumnNames(
+            seq=2,
+            name="rename",
+            desc="Rename",
+            params={"columns": {"user_id": "user", "day": "day", "click": "clicked"}},
+        )
+        params = {"file": get_file_params("renamed", stage="processed"), "force": False}
+        writer = DataWriter(seq=3, name="write", desc="Write", params=params)
+
+        data = rename.run(data=reader.run(context=None), context=None)
+        assert writer.run(data=data, context=None) is None
+        filepath = writer.outputs()[0]
+        written = pd.read_parquet(filepath)
+        assert list(written.columns) == ["user", "day", "clicked"]
+        assert written["user"].tolist() == df["user_id"].tolist(), logger.error("Run failed.")
+        assert reader.duration is not None and writer.duration is not None
+
+        # Existing files are only overwritten when forced
+        writer.run(data=data.head(1), context=None)
+        assert len(pd.read_parquet(filepath)) == 4
+        params["force"] = True
+        writer.run(data=data.head(1), context=None)
+        assert len(pd.read_parquet(filepath)) == 1
+        shutil.rmtree(FOLDER, ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_orchestrator.py                                                               #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:05:00 pm                                              #
+# Modified   : Saturday October 17th 2026 09:05:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import time
+import inspect
+import pytest
+import logging
+import logging.config
+import threading
+from typing import Any
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.utils.config import YamlIO
+from deepctr.dag.base import Operator
+from deepctr.dag.orchestrator import TaskGraph, DataDAGBuilder
+from deepctr.dag.data_operators import DownloadS3, DataReader, DataWriter
+from deepctr.dag.transform_operators import ReplaceColumnNames
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class Monitor:
+    """Records when each task starts and stops, and the peak number running at once."""
+
+    def __init__(self) -> None:
+        self.started = {}
+        self.stopped = {}
+        self.running = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def start(self, seq: int) -> None:
+        with self._lock:
+            self.started[seq] = time.perf_counter()
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+
+    def stop(self, seq: int) -> None:
+        with self._lock:
+            self.running -= 1
+            self.stopped[seq] = time.perf_counter()
+
+
+class Sleep(Operator):
+    """Sleeps, then returns its input with its sequence number appended."""
+
+    def __init__(
+        self,
+        seq: int,
+        monitor: Monitor,
+        depends_on: list = None,
+        duration: float = 0.05,
+        fail: bool = False,
+    ) -> None:
+        super(Sleep, self).__init__(seq=seq, name="sleep_{}".format(seq), desc="", params={})
+        self.depends_on = depends_on
+        self._monitor = monitor
+        self._duration = duration
+        self._fail = fail
+        self.received = None
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self._monitor.start(self.seq)
+        self.received = data
+        time.sleep(self._duration)
+        self._monitor.stop(self.seq)
+        if self._fail:
+            raise RuntimeError("Task {} failed.".format(self.seq))
+        return (data or []) + [self.seq]
+
+
+@pytest.mark.dag
+@pytest.mark.taskgraph
+class TestTaskGraph:
+    def test_cycle(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        monitor = Monitor()
+        with pytest.raises(ValueError):
+            TaskGraph([Sleep(1, monitor, depends_on=[2]), Sleep(2, monitor, depends_on=[1])])
+        with pytest.raises(ValueError):
+            TaskGraph([Sleep(1, monitor, depends_on=[1])])
+        with pytest.raises(ValueError):
+            tasks = [Sleep(1, monitor, depends_on=[3]), Sleep(2, monitor), Sleep(3, monitor)]
+            TaskGraph(tasks)
+        assert monitor.started == {}
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_dependencies(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Tasks without depends_on follow the task before them. Dependencies outside the
+        # tasks given are taken as complete.
+        monitor = Monitor()
+        tasks = [Sleep(2, monitor, depends_on=[1]), Sleep(3, monitor), Sleep(4, monitor, [2])]
+        graph = TaskGraph(tasks)
+        assert graph.dependencies == {2: [], 3: [2], 4: [2]}
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_order(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # A diamond: 2 and 3 depend on 1, and 4 on both
+        monitor = Monitor()
+        tasks = [
+            Sleep(1, monitor, depends_on=[]),
+            Sleep(2, monitor, depends_on=[1], duration=0.2),
+            Sleep(3, monitor, depends_on=[1], duration=0.2),
+            Sleep(4, monitor, depends_on=[2, 3]),
+        ]
+        results = TaskGraph(tasks).run(max_workers=4)
+
+        assert monitor.started[2] >= monitor.stopped[1]
+        assert monitor.started[3] >= monitor.stopped[1]
+        assert monitor.started[4] >= max(monitor.stopped[2], monitor.stopped[3]), logger.error(
+            "Task started before its dependencies completed."
+        )
+        # The independent branches overlap
+        assert monitor.started[3] < monitor.stopped[2] and monitor.started[2] < monitor.stopped[3]
+
+        # A task receives the result of the last of its dependencies, in the order listed
+        assert tasks[3].received == [1, 3]
+        assert results == {1: [1], 2: [1, 2], 3: [1, 3], 4: [1, 3, 4]}
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    @pytest.mark.parametrize("max_workers", [1, 2, 3])
+    def test_max_workers(self, caplog, max_workers) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        monitor = Monitor()
+        tasks = [Sleep(seq, monitor, depends_on=[], duration=0.1) for seq in range(1, 7)]
+        results = TaskGraph(tasks).run(max_workers=max_workers)
+
+        assert len(results) == 6
+        assert monitor.peak == max_workers, logger.error(
+            "{} tasks ran at once with max_workers {}.".format(monitor.peak, max_workers)
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_failure(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # The failure is raised, and the tasks depending on the failed task never start
+        monitor = Monitor()
+        tasks = [
+            Sleep(1, monitor, depends_on=[]),
+            Sleep(2, monitor, depends_on=[1], fail=True),
+            Sleep(3, monitor, depends_on=[2]),
+            Sleep(4, monitor, depends_on=[3]),
+        ]
+        with pytest.raises(RuntimeError):
+            TaskGraph(tasks).run(max_workers=2)
+        assert sorted(monitor.started) == [1, 2], logger.error("Failure did not stop the graph.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.dag
+@pytest.mark.taskgraph
+class TestDataDAGBuilder:
+    def test_build(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        context = object()
+        config = YamlIO().read("config/alibaba.yml")
+        dag = DataDAGBuilder().with_template(config).and_context(context).build().dag
+        assert dag.name == "alibaba_etl"
+        assert dag.context is context, logger.error("Context was not passed to the DAG.")
+
+        # The download is followed by four independent read, rename and write chains
+        tasks = dag.tasks
+        assert [task.seq for task in tasks] == list(range(1, 14))
+        assert isinstance(tasks[0], DownloadS3)
+        for seq in [2, 5, 8, 11]:
+            assert isinstance(tasks[seq - 1], DataReader)
+            assert isinstance(tasks[seq], ReplaceColumnNames)
+            assert isinstance(tasks[seq + 1], DataWriter)
+        dependencies = TaskGraph(tasks).dependencies
+        assert dependencies[1] == []
+        assert [dependencies[seq] for seq in [2, 5, 8, 11]] == [[1]] * 4
+        assert all(dependencies[seq] == [seq - 1] for seq in [3, 4, 6, 7, 9, 10, 12, 13])
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_plan.py                                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 08:45:00 pm                                              #
+# Modified   : Saturday October 17th 2026 08:45:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import logging.config
+from typing import Any
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.dag.base import Operator
+from deepctr.dag.plan import LogicalPlan, SinkStep, EagerStep
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+
+
+class Stub(Operator):
+    """Records its calls in a shared log. Data is the list of task names applied so far."""
+
+    def __init__(self, seq: int, log: list) -> None:
+        name = "{}{}".format(self.prefix, seq)
+        super(Stub, self).__init__(seq=seq, name=name, desc="", params={})
+        self._log = log
+        self.received = []
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self._log.append(self.name)
+        self.received.append(data)
+        return None if data is None else data + [self.name]
+
+
+class Source(Stub):
+    kind = "source"
+    prefix = "S"
+
+    def read(self) -> list:
+        self._log.append(self.name)
+        return [self.name]
+
+
+class Transform(Stub):
+    kind = "transform"
+    prefix = "T"
+
+    def transform(self, data: list) -> list:
+        self._log.append(self.name)
+        return data + [self.name]
+
+
+class Sink(Stub):
+    kind = "sink"
+    prefix = "K"
+
+
+class Eager(Stub):
+    prefix = "E"
+
+
+class Barrier(Stub):
+    """An eager task that returns nothing."""
+
+    prefix = "B"
+
+    def execute(self, data: Any = None, context: Any = None) -> Any:
+        self._log.append(self.name)
+        self.received.append(data)
+
+
+@pytest.mark.dag
+@pytest.mark.plan
+class TestLogicalPlan:
+    def test_build(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        log = []
+        tasks = [Source(1, log), Transform(2, log), Transform(3, log), Sink(4, log)]
+        tasks += [Transform(5, log), Sink(6, log)]
+        plan = LogicalPlan(tasks)
+
+        # Only sinks become steps, each over a prefix of the same pipeline
+        assert [type(step) for step in plan.steps] == [SinkStep, SinkStep]
+        assert [step.task.name for step in plan.steps] == ["K4", "K6"]
+        assert plan.steps[0].pipeline is plan.steps[1].pipeline
+        assert [step.length for step in plan.steps] == [2, 3]
+        assert plan.pruned == []
+        assert plan.explain() == "K4 <- S1 -> T2 -> T3\nK6 <- S1 -> T2 -> T3 -> T5"
+        assert log == [], logger.error("Building the plan ran tasks.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_prefix_reuse(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        log = []
+        tasks = [Source(1, log), Transform(2, log), Transform(3, log), Sink(4, log)]
+        tasks += [Transform(5, log), Sink(6, log)]
+        LogicalPlan(tasks).execute()
+
+        # The source and shared transforms run once, and the second sink resumes from the
+        # data computed for the first.
+        assert log == ["S1", "T2", "T3", "K4", "T5", "K6"], logger.error("Prefix reuse failed.")
+        assert tasks[3].received == [["S1", "T2", "T3"]]
+        assert tasks[5].received == [["S1", "T2", "T3", "T5"]]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_pruning(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Transforms after the last sink, and sources no task consumes, are pruned
+        log = []
+        tasks = [Source(1, log), Transform(2, log), Source(3, log), Sink(4, log)]
+        tasks += [Transform(5, log)]
+        plan = LogicalPlan(tasks)
+        assert sorted(task.name for task in plan.pruned) == ["S1", "T2", "T5"]
+        assert "T5 (pruned)" in plan.explain()
+
+        plan.execute()
+        assert log == ["S3", "K4"], logger.error("Pruned tasks ran.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_eager_boundary(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # An eager task evaluates the pipeline before it and starts a new one from its result
+        log = []
+        tasks = [Source(1, log), Transform(2, log), Eager(3, log), Transform(4, log)]
+        tasks += [Sink(5, log)]
+        plan = LogicalPlan(tasks)
+        assert [type(step) for step in plan.steps] == [EagerStep, SinkStep]
+        assert plan.explain() == "E3 (eager)\nK5 <- E3 -> T4"
+
+        plan.execute()
+        assert log == ["S1", "T2", "E3", "T4", "K5"]
+        assert tasks[2].received == [["S1", "T2"]]
+        assert tasks[4].received == [["S1", "T2", "E3", "T4"]], logger.error("Eager step failed.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_eager_returns_none(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # When an eager task returns nothing, the pipeline before it continues
+        log = []
+        tasks = [Source(1, log), Transform(2, log), Barrier(3, log), Transform(4, log)]
+        tasks += [Sink(5, log)]
+        plan = LogicalPlan(tasks)
+        data = plan.execute()
+
+        assert log == ["S1", "T2", "B3", "T4", "K5"], logger.error("Pipeline recomputed.")
+        assert tasks[4].received == [["S1", "T2", "T4"]]
+        assert data == ["S1", "T2", "T4"]
+
+        # A sink before any source receives no data
+        log.clear()
+        sink = Sink(1, log)
+        LogicalPlan([sink]).execute()
+        assert log == ["K1"] and sink.received == [None]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -16,14 +16,18 @@
 # Copyright  : (c) 2022 John James                                                                 #
 # ================================================================================================ #
 # Remember to propagate any changes made to the database to test_dao_setup.sql
+import time
 import inspect
 import pytest
 import logging
 import logging.config
+import pandas as pd
 
 from deepctr.dal.file import File
 from deepctr.utils.log_config import LOG_CONFIG
 from deepctr.dal.dao import DAO
+from deepctr.dal.context import FileDBContext, IdentityMap
+from deepctr.data.database import Database
 
 # ------------------------------------------------------------------------------------------------ #
 logging.config.dictConfig(LOG_CONFIG)
@@ -224,3 +228,274 @@ class TestDAO:
         for file in files:
             dao.delete(file.id)
             assert not dao.exists(file.id)
+
+
+# ================================================================================================ #
+#                                     TEST BULK DAO                                                #
+# ================================================================================================ #
+def part_files(n: int, offset: int = 0) -> list:
+    return [
+        File(
+            name="part-{:05d}".format(offset + i),
+            desc="Part file written by Spark",
+            folder="tests/data/bulk/click_logs.parquet",
+            format="parquet",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.dao
+@pytest.mark.bulkdao
+class TestBulkDAO:
+    def test_add_many(self, caplog, filecontext):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        files = dao.add_many(part_files(250), batch_size=100)
+        ids = [file.id for file in files]
+        assert ids == list(range(ids[0], ids[0] + 250))
+        for file in files[::50]:
+            assert dao.find(file.id).name == file.name
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_update_many(self, caplog, filecontext):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        files = dao.add_many(part_files(50, offset=250))
+        for file in files:
+            file._size = 1024
+        assert dao.update_many(files, batch_size=20) == 50
+        for file in files[::10]:
+            assert dao.find(file.id).size == 1024
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_benchmark(self, caplog, filecontext):
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        n = 2000
+
+        files = part_files(n, offset=1000)
+        start = time.time()
+        filecontext.begin_transaction()
+        for file in files:
+            dao.add(file)
+        filecontext.commit()
+        single = n / (time.time() - start)
+
+        files = part_files(n, offset=1000 + n)
+        start = time.time()
+        dao.add_many(files)
+        bulk = n / (time.time() - start)
+
+        logger.info(
+            "\t\tadd: {:,.0f} rows/s, add_many: {:,.0f} rows/s ({:.1f}x)".format(
+                single, bulk, bulk / single
+            )
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_iterate(self, caplog, filecontext):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        files = dao.findall()
+        streamed = dao.iterate(batch_size=100)
+        assert not isinstance(streamed, list)
+        assert [file.id for file in streamed] == [file.id for file in files]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_findall_todf(self, caplog, filecontext):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        df = dao.findall(todf=True)
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == len(dao.findall())
+        assert "filepath" in df.columns
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+# ================================================================================================ #
+#                                   TEST IDENTITY MAP                                              #
+# ================================================================================================ #
+@pytest.mark.dao
+@pytest.mark.identitymap
+class TestIdentityMap:
+    def test_find(self, caplog, filecontext):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        file = dao.add(part_files(1, offset=9000)[0])
+        filecontext.identity_map.clear()
+
+        a = dao.find(file.id)
+        b = dao.find(file.id)
+        assert a is b
+        assert filecontext.identity_map.stats["hits"] >= 1
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_invalidate(self, caplog, filecontext):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        dao = DAO(filecontext)
+        file = dao.find(dao.add(part_files(1, offset=9001)[0]).id)
+        dao.update(file)
+        assert file.id not in filecontext.identity_map
+        assert dao.find(file.id) is not file
+
+        dao.delete(file.id)
+        assert file.id not in filecontext.identity_map
+        assert dao.find(file.id) is None
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_lru(self, caplog):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        identity_map = IdentityMap(max_size=2)
+        files = part_files(3, offset=9002)
+        for i, file in enumerate(files):
+            file.id = i + 1
+        identity_map.put(files[0])
+        identity_map.put(files[1])
+        assert identity_map.get(1) is files[0]
+        identity_map.put(files[2])
+        assert len(identity_map) == 2
+        assert 2 not in identity_map
+        assert identity_map.get(1) is files[0]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+# ================================================================================================ #
+#                                   TEST UNIT OF WORK                                              #
+# ================================================================================================ #
+@pytest.mark.dao
+@pytest.mark.unitofwork
+class TestUnitOfWork:
+    def test_commit(self, caplog, pool):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        context = FileDBContext(Database(pool=pool), write_mode="commit")
+        dao = DAO(context)
+        files = [dao.add(file) for file in part_files(100, offset=10000)]
+        for file in files:
+            file._size = 2048
+            dao.update(file)
+        assert all(file.id == 0 for file in files)
+
+        context.commit()
+        ids = [file.id for file in files]
+        assert ids == list(range(ids[0], ids[0] + 100))
+        assert dao.find(ids[-1]).size == 2048
+        context.close()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_background(self, caplog, pool):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        context = FileDBContext(Database(pool=pool), write_mode="background")
+        dao = DAO(context)
+        files = [dao.add(file) for file in part_files(100, offset=10100)]
+        time.sleep(2)
+        assert all(file.id != 0 for file in files)
+        context.close()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_bulk(self, caplog, pool):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        context = FileDBContext(Database(pool=pool), write_mode="commit")
+        dao = DAO(context)
+        files = dao.add_many(part_files(50, offset=10200))
+        assert all(file.id == 0 for file in files)
+        context.commit()
+        assert all(file.id != 0 for file in files)
+
+        # Updates and deletes are written at commit, after the inserts
+        for file in files:
+            file._size = 4096
+        assert dao.update_many(files[:40]) == 0
+        dao.delete(files[-1].id)
+        assert dao.find(files[-1].id) is not None
+        context.commit()
+        assert dao.find(files[0].id).size == 4096
+        assert dao.find(files[-1].id) is None, logger.error("Buffered delete failed.")
+        context.close()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_failure(self, caplog, pool, monkeypatch):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        context = FileDBContext(Database(pool=pool), write_mode="commit")
+        dao = DAO(context)
+        files = dao.add_many(part_files(10, offset=10300))
+        context.commit()
+        execute_many = context.database.execute_many
+
+        def failing(*args, **kwargs):
+            raise RuntimeError("Write failed.")
+
+        # A failed flush in its own transaction keeps the writes for the next flush
+        for file in files:
+            file._size = 8192
+        dao.update_many(files)
+        monkeypatch.setattr(context.database, "execute_many", failing)
+        with pytest.raises(RuntimeError):
+            context.commit()
+        monkeypatch.setattr(context.database, "execute_many", execute_many)
+        context.commit()
+        assert dao.find(files[0].id).size == 8192, logger.error("Failed writes were lost.")
+
+        # In the caller's transaction, the caller rolls back and the writes are dropped
+        written = []
+
+        def recorded(*args, **kwargs):
+            written.append(args)
+            return execute_many(*args, **kwargs)
+
+        context.begin_transaction()
+        dao.update_many(files)
+        monkeypatch.setattr(context.database, "execute_many", failing)
+        with pytest.raises(RuntimeError):
+            context.flush()
+        monkeypatch.setattr(context.database, "execute_many", recorded)
+        context.rollback()
+        context.flush()
+        assert written == [], logger.error("Writes were requeued in the caller's transaction.")
+        context.close()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_context_manager(self, caplog, pool):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # The context commits when the block exits, and rolls back if it raises
+        with FileDBContext(Database(pool=pool), write_mode="commit") as context:
+            dao = DAO(context)
+            files = dao.add_many(part_files(10, offset=10400))
+        assert all(file.id != 0 for file in files)
+        assert dao.find(files[0].id).name == files[0].name
+
+        with pytest.raises(RuntimeError):
+            with context:
+                dao.add_many(part_files(10, offset=10410))
+                raise RuntimeError("Task failed.")
+        context.flush()
+        assert dao.find(files[-1].id + 10) is None, logger.error("Failed block was committed.")
+        context.close()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -21,6 +21,7 @@ import pytest
 import logging
 import logging.config
 import pyspark
+import pandas as pd
 from datetime import datetime
 from copy import deepcopy
 
@@ -146,11 +147,49 @@ class TestCSVFile:
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
 
+    def test_write_options_csv(self, caplog, csv_file, spark_dataframe):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Parquet options persisted with a file don't break CSV writes
+        file = File(
+            name=csv_file.name,
+            desc=csv_file.desc,
+            folder=csv_file.folder,
+            format=csv_file.format,
+            filename=csv_file.filename,
+            write_options={"sep": ",", "compression": "zstd", "partition_by": ["sepal_length"]},
+        )
+        file.write(spark_dataframe)
+        assert os.path.exists(file.filepath), logger.error("CSV write with options failed.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
     def test_exists_csv(self, caplog, csv_file):
 
         file = deepcopy(csv_file)
         assert file.exists()
 
+    def test_read_auto(self, caplog, csv_file, parquet_file):
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # With the auto backend, small files are read through Arrow
+        for fixture in [csv_file, parquet_file]:
+            file = File(
+                name=fixture.name,
+                desc=fixture.desc,
+                folder=fixture.folder,
+                format=fixture.format,
+                filename=fixture.filename,
+                backend="auto",
+            )
+            data = file.read()
+            assert isinstance(data, pd.DataFrame)
+
+            file.write(data)
+            assert os.path.exists(file.filepath)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
 
 @pytest.mark.dal
 @pytest.mark.file
@@ -163,6 +202,7 @@ class TestFileDAO:
             format="csv",
             folder="tests/data/data_store",
             filename="csvfile{}.csv".format(str(i)),
+            write_options={"header": True},
         )
         return file
 
@@ -178,6 +218,8 @@ class TestFileDAO:
         assert isinstance(a.created, datetime)
         assert isinstance(a.modified, datetime)
         assert isinstance(a.accessed, datetime)
+        assert a.backend == "spark"
+        assert a.write_options == {"header": True}
 
     def check_files(self, a, b):
         assert a.name == b.name
@@ -191,6 +233,8 @@ class TestFileDAO:
         assert a.created == b.created
         assert a.modified == b.modified
         assert a.accessed == b.accessed
+        assert a.backend == b.backend
+        assert a.write_options == b.write_options
 
     def test_add(self, caplog, filecontext):
         logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -19,7 +19,9 @@ import inspect
 import pytest
 import logging
 import numpy as np
+import pandas as pd
 import logging.config
+from concurrent.futures import ThreadPoolExecutor
 
 from deepctr.utils.log_config import LOG_CONFIG
 from deepctr.data.database import DBConfig, Database
@@ -130,3 +132,153 @@ class TestDatabase:
         assert result is True, logger.error("Execute error")
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.db
+@pytest.mark.bulk
+class TestBulkInsert:
+    def test_insert_many_increment(self, caplog, connection) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Keys are stepped by the session's auto_increment_increment
+        database = Database(connection)
+        database.execute("SET SESSION auto_increment_increment = 3;")
+        try:
+            ids = database.insert_many(
+                """INSERT INTO `testtable` (number, letters) VALUES (%s, %s);""",
+                [(i, "step_" + str(i)) for i in range(10)],
+                batch_size=4,
+            )
+        finally:
+            database.execute("SET SESSION auto_increment_increment = 1;")
+
+        rows = database.select_all(
+            """SELECT `id` FROM `testtable` WHERE `letters` LIKE %s ORDER BY `id`;""", ("step_%",)
+        )
+        assert ids == [row["id"] for row in rows], logger.error("Insert many key error")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.db
+@pytest.mark.transaction
+class TestTransaction:
+    def test_ownership(self, caplog, connection) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        database = Database(connection)
+        statement = """INSERT INTO `testtable` (number, letters) VALUES (%s, %s);"""
+        count = """SELECT COUNT(*) AS `rows` FROM `testtable`;"""
+
+        # With autocommit off, the server reports a transaction after any statement, but
+        # only begin_transaction opens one on the caller's behalf.
+        rows = database.select_one(count)["rows"]
+        assert not database.in_transaction, logger.error("Transaction ownership error")
+
+        # Bulk writes outside a transaction commit their own
+        database.insert_many(statement, [(i, "owned_" + str(i)) for i in range(5)])
+        database.rollback()
+        assert database.select_one(count)["rows"] == rows + 5, logger.error("Commit error")
+
+        # Inside the caller's transaction, they are committed or rolled back by the caller
+        database.begin_transaction()
+        assert database.in_transaction
+        database.insert_many(statement, [(i, "joined_" + str(i)) for i in range(5)])
+        database.execute_many(
+            """UPDATE `testtable` SET letters = %s WHERE number = %s;""", [("updated", 0)]
+        )
+        assert database.in_transaction
+        database.rollback()
+        assert not database.in_transaction
+        assert database.select_one(count)["rows"] == rows + 5, logger.error("Rollback error")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.db
+@pytest.mark.stream
+class TestStreaming:
+    def test_select_batches(self, caplog, connection) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        database = Database(connection)
+        database.insert_many(
+            """INSERT INTO `testtable` (number, letters) VALUES (%s, %s);""",
+            [(i, "row_" + str(i)) for i in range(250)],
+        )
+
+        statement = """SELECT * FROM `testtable`;"""
+        expected = len(database.select_all(statement))
+        batches = list(database.select_batches(statement, batch_size=100))
+        assert all(len(batch) <= 100 for batch in batches), logger.error("Batch size error")
+        assert sum(len(batch) for batch in batches) == expected, logger.error("Row count error")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_select_all_todf(self, caplog, connection) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        database = Database(connection)
+        statement = """SELECT * FROM `testtable`;"""
+        df = database.select_all(statement, todf=True)
+        assert isinstance(df, pd.DataFrame), logger.error("Select_all todf error")
+        assert len(df) == len(database.select_all(statement)), logger.error("Row count error")
+        assert list(df.columns) == ["id", "number", "letters"], logger.error("Column error")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.db
+@pytest.mark.pool
+class TestConnectionPool:
+    def test_checkout_checkin(self, caplog, pool) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        with pool.connection() as a:
+            assert a.open, logger.error("Connection error")
+        with pool.connection() as b:
+            assert b is a, logger.error("Connection was not reused")
+        assert pool.metrics["in_use"] == 0, logger.error("Connection was not checked in")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_bounded(self, caplog, pool) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        connections = [pool.acquire() for _ in range(4)]
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.1)
+        for connection in connections:
+            pool.release(connection)
+        assert pool.metrics["timeouts"] == 1, logger.error("Timeout not recorded")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_concurrent(self, caplog, pool) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        database = Database(pool=pool)
+
+        def select(id: int) -> dict:
+            try:
+                return database.select_one("""SELECT * FROM `testtable` WHERE `id`= %s;""", id)
+            finally:
+                database.close()
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(select, range(1, 65)))
+        assert len(results) == 64, logger.error("Select error")
+
+        metrics = pool.metrics
+        assert metrics["size"] <= 4, logger.error("Pool exceeded its maximum size")
+        assert metrics["in_use"] == 0, logger.error("Connections were not checked in")
+        logger.info("\tPool metrics: {}".format(metrics))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
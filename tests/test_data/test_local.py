@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_local.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 09:00:00 am                                              #
+# Modified   : Saturday October 17th 2026 09:00:00 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import os
+import time
+import logging.config
+
+from deepctr.utils.log_config import LOG_CONFIG
+import numpy as np
+import pandas as pd
+from deepctr.data.local import SparkSessionProvider, SparkCSV, SparkParquet, CSVRowCounter
+from deepctr.data.local import ArrowCSV, ArrowParquet, _get_parquet_options
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_local"
+
+
+@pytest.mark.local
+class TestSparkSession:
+    def test_setup(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        os.makedirs(FOLDER, exist_ok=True)
+        SparkCSV().write(data=spark_dataframe, filepath=os.path.join(FOLDER, "iris.csv"))
+        SparkParquet().write(data=spark_dataframe, filepath=os.path.join(FOLDER, "iris.parquet"))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_session_reuse(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        provider = SparkSessionProvider()
+        session = provider.get_session()
+        assert SparkSessionProvider().get_session() is session
+
+        df1 = SparkCSV().read(filepath=os.path.join(FOLDER, "iris.csv"))
+        df2 = SparkParquet().read(filepath=os.path.join(FOLDER, "iris.parquet"))
+        assert df1.sparkSession is session
+        assert df2.sparkSession is session
+        assert session.conf.get("spark.sql.execution.arrow.pyspark.enabled") == "true"
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_benchmark(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        provider = SparkSessionProvider()
+        provider.stop()
+
+        start = time.time()
+        provider.get_session()
+        startup = time.time() - start
+
+        start = time.time()
+        SparkCSV().read(filepath=os.path.join(FOLDER, "iris.csv")).count()
+        first = time.time() - start
+
+        start = time.time()
+        SparkParquet().read(filepath=os.path.join(FOLDER, "iris.parquet")).count()
+        second = time.time() - start
+
+        logger.info(
+            "\t\tSession startup {:.2f}s, first read {:.2f}s, subsequent read {:.2f}s".format(
+                startup, first, second
+            )
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.local
+class TestCSVRowCounter:
+    def test_setup(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        os.makedirs(FOLDER, exist_ok=True)
+        with open(os.path.join(FOLDER, "rows.csv"), "w") as f:
+            f.write('a,b,"c,d"\n')
+            f.writelines("{},{},{}\n".format(i, i * 2, i * 3) for i in range(100000))
+            f.write("x,y,z")  # Last line without a trailing newline
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_count(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "rows.csv")
+        counter = CSVRowCounter(blocksize=1024, parallel_threshold=4096, max_workers=4)
+        assert counter.count(filepath) == {"rows": 100001, "cols": 3}
+        assert CSVRowCounter().count(filepath, header=False) == {"rows": 100002, "cols": 3}
+
+        # The sidecar doesn't return cols counted with another delimiter
+        assert CSVRowCounter().count(filepath, sep="\t") == {"rows": 100001, "cols": 1}
+        assert CSVRowCounter().count(filepath, sep=",") == {"rows": 100001, "cols": 3}
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_spark_folder(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "iris.csv")
+        io = SparkCSV()
+        df = io.read(filepath)
+        metadata = io.metadata(filepath)
+        assert metadata.rows == df.count()
+        assert metadata.cols == len(df.columns)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_benchmark(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "rows.csv")
+        for sidecar in os.listdir(FOLDER):
+            if sidecar.endswith(".rows.json"):
+                os.remove(os.path.join(FOLDER, sidecar))
+
+        start = time.time()
+        SparkCSV().read(filepath).count()
+        spark = time.time() - start
+
+        start = time.time()
+        CSVRowCounter().count(filepath)
+        first = time.time() - start
+
+        start = time.time()
+        CSVRowCounter().count(filepath)
+        cached = time.time() - start
+
+        logger.info(
+            "\t\tSpark count {:.3f}s, row counter {:.3f}s, cached {:.3f}s".format(
+                spark, first, cached
+            )
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.local
+class TestArrowIO:
+    def test_roundtrip(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        df = pd.DataFrame({"user": [1, 2, 3], "pid": ["a", "b", None]})
+        for io, filename in [(ArrowCSV(), "arrow.csv"), (ArrowParquet(), "arrow.parquet")]:
+            filepath = os.path.join(FOLDER, filename)
+            io.write(data=df, filepath=filepath)
+            result = io.read(filepath)
+            assert result.shape == (3, 2)
+            assert result["pid"].isna().sum() == 1
+            assert io.metadata(filepath).rows == 3
+
+        # Spark folders of part files are read by the Arrow backend
+        assert ArrowCSV().read(os.path.join(FOLDER, "iris.csv")).shape == (150, 4)
+        assert ArrowParquet().read(os.path.join(FOLDER, "iris.parquet")).shape == (150, 4)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_benchmark(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        rng = np.random.default_rng(55)
+        for rows in [1000, 100000, 1000000]:
+            df = pd.DataFrame(rng.integers(0, 1000, size=(rows, 10)), columns=list("abcdefghij"))
+            filepath = os.path.join(FOLDER, "benchmark_{}.csv".format(rows))
+            ArrowCSV().write(data=df, filepath=filepath)
+
+            start = time.time()
+            SparkCSV().read(filepath).toPandas()
+            spark = time.time() - start
+
+            start = time.time()
+            ArrowCSV().read(filepath)
+            arrow = time.time() - start
+
+            logger.info(
+                "\t\t{} rows, {} bytes: Spark {:.3f}s, Arrow {:.3f}s".format(
+                    rows, os.path.getsize(filepath), spark, arrow
+                )
+            )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.local
+class TestSparkParquetWriter:
+    def test_target_file_size(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "sized.parquet")
+        io = SparkParquet()
+        io.write(data=spark_dataframe.coalesce(1), filepath=filepath, target_file_size=1024)
+        files = [name for name in os.listdir(filepath) if name.endswith(".parquet")]
+        assert len(files) > 1
+        assert io.read(filepath).count() == 150
+
+        # Without a target size, the upstream partitioning is kept
+        io.write(data=spark_dataframe.coalesce(1), filepath=filepath)
+        files = [name for name in os.listdir(filepath) if name.endswith(".parquet")]
+        assert len(files) == 1
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_partition_by(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "partitioned.parquet")
+        io = SparkParquet()
+        io.write(data=spark_dataframe, filepath=filepath, partition_by=["petal_width"])
+        folders = [name for name in os.listdir(filepath) if name.startswith("petal_width=")]
+        assert len(folders) == spark_dataframe.select("petal_width").distinct().count()
+
+        df = io.read(filepath)
+        assert df.count() == 150
+        expected = spark_dataframe.filter(spark_dataframe.petal_width == 0.2).count()
+        assert df.filter(df.petal_width == 0.2).count() == expected
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_gzip_level(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Hadoop expects the zlib level by its enum name
+        options = _get_parquet_options(
+            compression="gzip", compression_level=9, dictionary=True, column_options=None
+        )
+        assert options["zlib.compress.level"] == "BEST_COMPRESSION"
+        with pytest.raises(ValueError):
+            _get_parquet_options(
+                compression="gzip", compression_level=10, dictionary=True, column_options=None
+            )
+
+        filepath = os.path.join(FOLDER, "gzip_level.parquet")
+        io = SparkParquet()
+        io.write(data=spark_dataframe, filepath=filepath, compression="gzip", compression_level=9)
+        assert io.read(filepath).count() == spark_dataframe.count()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_codec_benchmark(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # A Criteo-like sample: a label, integer counts and hashed categorical columns.
+        rng = np.random.default_rng(55)
+        rows = 200000
+        pdf = pd.DataFrame({"label": rng.integers(0, 2, rows)})
+        for i in range(1, 14):
+            pdf["I{}".format(i)] = rng.poisson(10, rows)
+        for i in range(1, 27):
+            cardinality = 10 ** (1 + i % 6)
+            pdf["C{}".format(i)] = ["{:08x}".format(x) for x in rng.integers(0, cardinality, rows)]
+        df = SparkSessionProvider().get_session().createDataFrame(pdf)
+
+        high_cardinality = {"C{}".format(i): {"dictionary": False} for i in range(5, 27, 6)}
+        combinations = [
+            {"compression": "snappy"},
+            {"compression": "lz4"},
+            {"compression": "zstd"},
+            {"compression": "zstd", "compression_level": 9},
+            {"compression": "zstd", "column_options": high_cardinality},
+            {"compression": "zstd", "dictionary": False},
+        ]
+        io = SparkParquet()
+        for i, options in enumerate(combinations):
+            filepath = os.path.join(FOLDER, "codec_{}.parquet".format(i))
+            io.write(data=df, filepath=filepath, **options)
+            size = sum(
+                os.path.getsize(os.path.join(filepath, name))
+                for name in os.listdir(filepath)
+                if name.endswith(".parquet")
+            )
+
+            start = time.time()
+            assert io.read(filepath).select("C1", "C5", "I1").groupBy("C1").count().count() > 0
+            scan = time.time() - start
+
+            logger.info("\t\t{}: {} bytes on disk, scan {:.3f}s".format(options, size, scan))
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+
+@pytest.mark.local
+class TestPushdown:
+    def test_spark(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "pushdown.parquet")
+        io = SparkParquet()
+        io.write(data=spark_dataframe, filepath=filepath, partition_by=["petal_width"])
+
+        filters = [["petal_width", "in", [0.1, 0.2]], ["sepal_length", ">=", 5.0]]
+        df = io.read(filepath, columns=["sepal_length"], filters=filters)
+        assert df.columns == ["sepal_length"]
+        expected = spark_dataframe.filter(
+            spark_dataframe.petal_width.isin([0.1, 0.2]) & (spark_dataframe.sepal_length >= 5.0)
+        ).count()
+        assert df.count() == expected
+
+        plan = df._jdf.queryExecution().executedPlan().toString()
+        assert "PartitionFilters" in plan and "PushedFilters" in plan
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_arrow(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        df = pd.DataFrame({"day": np.repeat([1, 2, 3, 4], 250), "x": np.arange(1000)})
+        filters = [["day", "in", [2, 3]], ["x", "<", 600]]
+        for io, filename in [(ArrowParquet(), "pushdown_arrow.parquet"), (ArrowCSV(), "pushdown.csv")]:
+            filepath = os.path.join(FOLDER, filename)
+            io.write(data=df, filepath=filepath)
+            result = io.read(filepath, columns=["x"], filters=filters)
+            assert list(result.columns) == ["x"]
+            assert len(result) == 350
+
+        with pytest.raises(ValueError):
+            ArrowCSV().read(os.path.join(FOLDER, "pushdown.csv"), filters=[["x", "~", 1]])
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
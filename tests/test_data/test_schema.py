@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_schema.py                                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 10:20:11 am                                              #
+# Modified   : Saturday October 17th 2026 10:20:11 am                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import pytest
+import logging
+import os
+import logging.config
+
+from deepctr.utils.log_config import LOG_CONFIG
+from pyspark.sql.types import IntegerType, ByteType, StringType, DecimalType
+from deepctr.data.local import SparkCSV
+from deepctr.data.schema import SchemaRegistry
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_schema"
+
+
+@pytest.mark.local
+class TestSchemaRegistry:
+    def test_get(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        registry = SchemaRegistry()
+        schema = registry.get(datasource="alibaba", dataset="vesuvio", name="raw_sample")
+        assert schema.names == ["user", "time_stamp", "adgroup_id", "pid", "nonclk", "clk"]
+        assert isinstance(schema["user"].dataType, IntegerType)
+        assert isinstance(schema["clk"].dataType, ByteType)
+
+        schema = registry.get(datasource="criteo", dataset="click_logs", name="day")
+        assert len(schema) == 40
+        assert isinstance(schema["C26"].dataType, StringType)
+
+        schema = registry.get(datasource="avazu", dataset="ctr_prediction", name="train")
+        assert schema["id"].dataType == DecimalType(20, 0)
+
+        assert registry.get(datasource="alibaba", dataset="vesuvio", name="unknown") is None
+        assert registry.get(datasource="unknown", dataset="vesuvio", name="raw_sample") is None
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_read(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        os.makedirs(FOLDER, exist_ok=True)
+        filepath = os.path.join(FOLDER, "raw_sample.csv")
+        with open(filepath, "w") as f:
+            f.write("user,time_stamp,adgroup_id,pid,nonclk,clk\n")
+            f.write("581738,1494137644,1,430548_1007,1,0\n")
+            f.write("449818,1494638778,3,430548_1007,1,0\n")
+
+        schema = SchemaRegistry().get(datasource="alibaba", dataset="vesuvio", name="raw_sample")
+        df = SparkCSV().read(filepath, schema=schema)
+        assert df.schema == schema
+        assert df.count() == 2
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_read_options(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Criteo files are tab separated without a header. Others use the reader defaults.
+        registry = SchemaRegistry()
+        options = registry.read_options(datasource="criteo", dataset="click_logs", name="day")
+        assert options == {"sep": "\t", "header": False}
+        other = registry.read_options(datasource="alibaba", dataset="vesuvio", name="user_profile")
+        assert other == {}
+
+        os.makedirs(FOLDER, exist_ok=True)
+        filepath = os.path.join(FOLDER, "day_0")
+        row = ["1", "5"] + [""] * 12 + ["68fd1e64"] + [""] * 25
+        with open(filepath, "w") as f:
+            f.write("\t".join(row) + "\n")
+            f.write("\t".join(["0"] + row[1:]) + "\n")
+
+        schema = registry.get(datasource="criteo", dataset="click_logs", name="day")
+        df = SparkCSV().read(filepath, schema=schema, **options)
+        assert df.count() == 2, logger.error("Header row was not read as data.")
+        assert df.first()["I1"] == 5 and df.first()["C1"] == "68fd1e64"
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -22,9 +22,16 @@ import shutil
 import os
 import logging.config
 
+import io
+import json
+import gzip
+import tarfile
 import time
+import threading
+import boto3
+from boto3.s3.transfer import TransferConfig
 from deepctr.utils.log_config import LOG_CONFIG
-from deepctr.data.remote import S3
+from deepctr.data.remote import S3, S3ConnectionFactory, ParallelGzipWriter, BandwidthLimiter
 from deepctr.utils.aws import upload_file, delete_file
 
 # ------------------------------------------------------------------------------------------------ #
@@ -59,6 +66,49 @@ class TestWeb:
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
 
+    def test_connection_cache(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        n = 50
+
+        # Benchmark: a new client for every call
+        start = time.perf_counter()
+        for _ in range(n):
+            boto3.client("s3")
+        uncached = (time.perf_counter() - start) / n
+
+        # Benchmark: process-wide cached client
+        factory = S3ConnectionFactory()
+        factory.clear()
+        start = time.perf_counter()
+        for _ in range(n):
+            client = factory.get_connection(connection_type="client")
+        cached = (time.perf_counter() - start) / n
+
+        assert client is factory.get_connection(connection_type="client"), logger.error(
+            "Connection cache failed."
+        )
+
+        # Resources are cached per thread
+        resource = factory.get_connection(connection_type="resource")
+        assert resource is factory.get_connection(connection_type="resource"), logger.error(
+            "Resource cache failed."
+        )
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(factory.get_connection(connection_type="resource"))
+        )
+        thread.start()
+        thread.join()
+        assert other[0] is not resource, logger.error("Resource shared across threads.")
+        logger.info(
+            "\tPer call overhead. New client: {} ms. Cached client: {} ms.".format(
+                round(uncached * 1000, 3), round(cached * 1000, 3)
+            )
+        )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
     def test_upload(self, caplog) -> None:
         caplog.set_level(logging.INFO)
         logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -103,6 +153,29 @@ class TestWeb:
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
 
+    def test_parallel_gzip(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        filepath = "tests/data/test_web/csvfile.csv"
+        with open(filepath, "rb") as f:
+            data = f.read()
+
+        # Small blocks force the file across many independently compressed blocks.
+        compressed = io.BytesIO()
+        writer = ParallelGzipWriter(sink=compressed.write, blocksize=1024, max_workers=4)
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            tar.add(filepath, arcname=os.path.basename(filepath))
+        writer.close()
+
+        # The result must be a single gzip member, readable in tarfile stream mode.
+        compressed.seek(0)
+        with tarfile.open(fileobj=compressed, mode="r|gz") as tar:
+            for member in tar:
+                assert tar.extractfile(member).read() == data, logger.error("Gzip failed.")
+        assert len(gzip.decompress(compressed.getvalue())) >= len(data)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
     def test_download_compressed(self, caplog) -> None:
         caplog.set_level(logging.INFO)
         logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -136,6 +209,205 @@ class TestWeb:
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
 
+    def test_download_stream(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        filepath = "tests/data/test_web/test_download/stream/custom.csv"
+        object_key = "test/compression/custom.csv.tar.gz"
+        s3 = S3()
+
+        s3.download_file(
+            bucket=BUCKET,
+            object_key=object_key,
+            filepath=filepath,
+            expand=True,
+            force=True,
+            stream=True,
+        )
+        assert os.path.exists(os.path.join(filepath, "csvfile.csv")), logger.error(
+            "Streaming download failed. File does not exist."
+        )
+        # No temporary archive folder is left beside the extracted data
+        assert os.listdir(os.path.dirname(filepath)) == ["custom.csv"], logger.error(
+            "Streaming download left temporary files."
+        )
+
+        shutil.rmtree(os.path.dirname(filepath), ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_download_stream_interrupted(self, caplog, monkeypatch) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        filepath = "tests/data/test_web/test_download/stream_interrupted/custom.csv"
+        member = "tests/data/test_web/csvfile.csv"
+        with open(member, "rb") as f:
+            data = f.read()
+
+        # An uncompressed gzip level puts the member's bytes at a known place in the stream.
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode="w:gz", compresslevel=0) as tar:
+            tar.add(member, arcname="csvfile.csv")
+        archive = archive.getvalue()
+
+        class Body(io.BytesIO):
+            """Response body that loses the connection after limit bytes."""
+
+            def __init__(self, data: bytes, limit: int) -> None:
+                super(Body, self).__init__(data)
+                self._limit = limit
+
+            def read(self, size: int = -1) -> bytes:
+                if self.tell() >= self._limit:
+                    raise ConnectionError("Connection lost")
+                remaining = self._limit - self.tell()
+                size = remaining if size < 0 else min(size, remaining)
+                return super(Body, self).read(size)
+
+        class Client:
+            def __init__(self, limit: int) -> None:
+                self._limit = limit
+
+            def get_object(self, Bucket: str, Key: str) -> dict:
+                return {"Body": Body(archive, self._limit)}
+
+        s3 = S3()
+        monkeypatch.setattr(s3, "_callback", lambda size: None)
+        extract = {
+            "bucket": BUCKET,
+            "object_key": "test/compression/custom.csv.tar.gz",
+            "filepath": filepath,
+            "force": False,
+        }
+
+        # The first attempt is cut off halfway through the member's data.
+        with pytest.raises(ConnectionError):
+            s3._stream_file(s3=Client(limit=512 + len(data) // 2), **extract)
+        assert not os.path.exists(os.path.join(filepath, "csvfile.csv")), logger.error(
+            "Truncated member left in place."
+        )
+
+        # The re-run replaces the partial member with the complete one.
+        s3._stream_file(s3=Client(limit=len(archive)), **extract)
+        extracted = os.path.join(filepath, "csvfile.csv", "csvfile.csv")
+        with open(extracted, "rb") as f:
+            assert f.read() == data, logger.error("Interrupted member not repaired.")
+        assert os.listdir(filepath) == ["csvfile.csv"], logger.error("Partial member not removed.")
+
+        shutil.rmtree(os.path.dirname(filepath), ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_download_manifest(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        filepath = "tests/data/test_web/test_download/manifest/custom.csv"
+        manifest = "tests/data/test_web/test_download/manifest/.manifest.json"
+        object_key = "test/no_compression/custom.csv"
+
+        s3 = S3(manifest=manifest)
+        s3.download_file(bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False)
+        assert os.path.exists(filepath), logger.error("Download failed. File does not exist.")
+        assert os.path.exists(manifest), logger.error("Download failed. Manifest does not exist.")
+        assert not os.path.exists(filepath + ".part"), logger.error("Partial file not renamed.")
+
+        # A partial file at the destination doesn't satisfy the manifest and is replaced.
+        with open(filepath, "w") as f:
+            f.write("partial")
+        s3 = S3(manifest=manifest)
+        s3.download_file(bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False)
+        assert os.path.getsize(filepath) == s3.metadata(bucket=BUCKET, object_key=object_key).size
+
+        # Unchanged objects are skipped on a re-run.
+        modified = os.path.getmtime(filepath)
+        s3 = S3(manifest=manifest)
+        s3.download_file(bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False)
+        assert os.path.getmtime(filepath) == modified, logger.error("Manifest skip failed.")
+
+        shutil.rmtree(os.path.dirname(filepath), ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_download_resume(self, caplog, monkeypatch) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        filepath = "tests/data/test_web/test_download/resume/custom.csv"
+        partpath = filepath + ".part"
+        object_key = "test/no_compression/custom.csv"
+        size = S3().metadata(bucket=BUCKET, object_key=object_key).size
+
+        # Small parts, so the object is downloaded in several ranged requests.
+        chunksize = max(1, size // 4)
+        config = TransferConfig(multipart_chunksize=chunksize, max_concurrency=2)
+        monkeypatch.setattr(S3, "_S3__transfer_config", config)
+        download_part = S3._download_part
+        requested = []
+
+        def interrupted(self, start, **kwargs):
+            requested.append(start)
+            if start >= 2 * chunksize:
+                raise ConnectionError("Connection lost")
+            return download_part(self, start=start, **kwargs)
+
+        def recorded(self, start, **kwargs):
+            requested.append(start)
+            return download_part(self, start=start, **kwargs)
+
+        # The first attempt fails after two parts, which are kept with their checkpoint.
+        monkeypatch.setattr(S3, "_download_part", interrupted)
+        with pytest.raises(ConnectionError):
+            S3().download_file(
+                bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False, force=True
+            )
+        assert os.path.exists(partpath), logger.error("Partial file not kept.")
+        assert not os.path.exists(filepath), logger.error("Partial download renamed.")
+
+        # The second attempt requests only the missing parts.
+        requested.clear()
+        monkeypatch.setattr(S3, "_download_part", recorded)
+        S3().download_file(
+            bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False, force=True
+        )
+        assert min(requested) >= 2 * chunksize, logger.error("Completed parts downloaded again.")
+        assert os.path.getsize(filepath) == size, logger.error("Resumed download failed.")
+
+        # A larger part file left by another version of the object is truncated, not reused.
+        with open(partpath, "wb") as f:
+            f.write(b"x" * (size * 2))
+        with open(partpath + ".json", "w") as f:
+            state = {"etag": '"stale"', "size": size * 2, "chunksize": chunksize, "parts": [0]}
+            json.dump(state, f)
+        S3().download_file(
+            bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False, force=True
+        )
+        assert os.path.getsize(filepath) == size, logger.error("Stale part file reused.")
+
+        shutil.rmtree(os.path.dirname(filepath), ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_bandwidth_limiter(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        rate = 1000000
+
+        # A second's worth of bytes passes at once; the rest is paced across all threads.
+        limiter = BandwidthLimiter(rate=rate)
+        start = time.perf_counter()
+        limiter.consume(rate)
+        threads = [
+            threading.Thread(target=lambda: [limiter.consume(rate // 100) for _ in range(25)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        assert 0.9 <= elapsed < 2, logger.error("Bandwidth limit not applied.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
     def test_list_object(self, caplog) -> None:
         caplog.set_level(logging.INFO)
         logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -148,6 +420,113 @@ class TestWeb:
 
         logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
 
+    def test_download_folder(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        folder = "test/no_compression/"
+        destination = "tests/data/test_web/test_download/folder"
+        s3 = S3()
+        object_keys = s3.list_objects(bucket=BUCKET, folder=folder)
+
+        # Benchmark: one object at a time
+        start = time.perf_counter()
+        for object_key in object_keys:
+            filepath = os.path.join(destination, "sequential", os.path.basename(object_key))
+            s3.download_file(
+                bucket=BUCKET, object_key=object_key, filepath=filepath, expand=False, force=True
+            )
+        sequential = time.perf_counter() - start
+
+        # Benchmark: folder listed once, objects downloaded concurrently
+        start = time.perf_counter()
+        filepaths = s3.download_folder(
+            bucket=BUCKET,
+            folder=folder,
+            destination=os.path.join(destination, "concurrent"),
+            expand=False,
+            force=True,
+        )
+        concurrent = time.perf_counter() - start
+
+        assert len(filepaths) == len(object_keys), logger.error("Download folder failed.")
+        for filepath in filepaths:
+            assert os.path.exists(filepath), logger.error("Download folder failed.")
+
+        filepaths = s3.download_many(
+            bucket=BUCKET,
+            object_keys=object_keys,
+            destination=os.path.join(destination, "many"),
+            folder=folder,
+            expand=False,
+            force=True,
+        )
+        assert len(filepaths) == len(object_keys), logger.error("Download many failed.")
+
+        logger.info(
+            "\tDownloaded {} objects. Sequential: {} seconds. Concurrent: {} seconds.".format(
+                len(object_keys), round(sequential, 2), round(concurrent, 2)
+            )
+        )
+
+        shutil.rmtree(destination, ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_download_folder_mixed(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        filepath = "tests/data/test_web/csvfile.csv"
+        folder = "test/mixed/"
+        destination = "tests/data/test_web/test_download/mixed"
+        s3 = S3()
+
+        # A folder holding an archive beside a plain object
+        s3.upload_file(
+            filepath=filepath, bucket=BUCKET, object_key=folder + "plain.csv", compress=False
+        )
+        s3.upload_file(filepath=filepath, bucket=BUCKET, object_key=folder + "archive.csv")
+
+        # Only the archive is expanded; the plain object is downloaded as it is.
+        filepaths = s3.download_folder(
+            bucket=BUCKET, folder=folder, destination=destination, expand=True, force=True
+        )
+        assert sorted(filepaths) == [
+            os.path.join(destination, "archive.csv"),
+            os.path.join(destination, "plain.csv"),
+        ], logger.error("Download folder failed.")
+        assert os.path.isdir(os.path.join(destination, "archive.csv")), logger.error(
+            "Archive not expanded."
+        )
+        with open(filepath, "rb") as f:
+            data = f.read()
+        with open(os.path.join(destination, "plain.csv"), "rb") as f:
+            assert f.read() == data, logger.error("Plain object not downloaded as is.")
+
+        s3.delete_folder(bucket=BUCKET, folder=folder)
+        shutil.rmtree(destination, ignore_errors=True)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_metadata_many(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+        folder = "test/no_compression/"
+        s3 = S3()
+        object_keys = s3.list_objects(bucket=BUCKET, folder=folder)
+
+        metadata = s3.metadata_many(bucket=BUCKET, object_keys=object_keys + [folder + "none.csv"])
+        assert sorted(metadata.keys()) == sorted(object_keys), logger.error("Metadata many failed.")
+
+        # Compare with an uncached HEAD request per object
+        client = boto3.client("s3")
+        for object_key in object_keys:
+            response = client.head_object(Bucket=BUCKET, Key=object_key)
+            assert metadata[object_key].size == response["ContentLength"], logger.error(
+                "Metadata many size mismatch for {}.".format(object_key)
+            )
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
     def test_delete_object(self, caplog) -> None:
         caplog.set_level(logging.INFO)
         logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
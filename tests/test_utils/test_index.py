@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_index.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 07:30:00 pm                                              #
+# Modified   : Saturday October 17th 2026 07:30:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.utils.index import LineIndex
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_index"
+ROWS = 100
+
+
+def write_csv(filepath: str, rows: int, header: bool = True, newline: bool = True) -> None:
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    lines = ["{},{}".format(i, i * 2) for i in range(rows)]
+    if header:
+        lines.insert(0, "id,value")
+    with open(filepath, "w") as f:
+        f.write("\n".join(lines) + ("\n" if newline else ""))
+
+
+@pytest.mark.index
+class TestLineIndex:
+    def test_read(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "header.csv")
+        write_csv(filepath, rows=ROWS)
+        index = LineIndex(filepath, blocksize=64)
+        assert len(index) == ROWS, logger.error("Line index length failed.")
+        assert os.path.exists(index.index_filepath)
+
+        df = index.read(10, 20)
+        assert list(df.columns) == ["id", "value"]
+        assert df["id"].tolist() == list(range(10, 20)), logger.error("Read failed.")
+
+        df = index.take([50, 3, 99])
+        assert df["id"].tolist() == [50, 3, 99], logger.error("Take failed.")
+        with pytest.raises(IndexError):
+            index.take([ROWS])
+
+        df = index.sample(size=10)
+        assert len(df) == 10 and df["id"].is_unique and df["id"].is_monotonic_increasing
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_no_header(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # The last line has no trailing newline
+        filepath = os.path.join(FOLDER, "noheader.csv")
+        write_csv(filepath, rows=ROWS, header=False, newline=False)
+        index = LineIndex(filepath, header=False)
+        assert len(index) == ROWS
+
+        df = index.read(ROWS - 2, ROWS)
+        assert df[0].tolist() == [ROWS - 2, ROWS - 1], logger.error("Read of last rows failed.")
+        assert index.take([ROWS - 1, 0])[0].tolist() == [ROWS - 1, 0]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_empty_range(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "header.csv")
+        write_csv(filepath, rows=ROWS)
+        df = LineIndex(filepath).read(5, 5)
+        assert df.empty and list(df.columns) == ["id", "value"], logger.error("Empty read failed.")
+
+        filepath = os.path.join(FOLDER, "noheader.csv")
+        write_csv(filepath, rows=ROWS, header=False)
+        index = LineIndex(filepath, header=False)
+        assert index.read(5, 5).empty, logger.error("Empty read without header failed.")
+        assert index.take([]).empty
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_rebuild(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "rebuild.csv")
+        write_csv(filepath, rows=ROWS)
+        index = LineIndex(filepath)
+        assert len(index) == ROWS
+
+        # A file that changes size is indexed again
+        write_csv(filepath, rows=ROWS * 2)
+        index = LineIndex(filepath)
+        assert len(index) == ROWS * 2, logger.error("Stale index not rebuilt.")
+
+        # A truncated or corrupt index file is rebuilt rather than raising
+        for content in [b"", b"\x93NUMPY\x01\x00", b"not an index"]:
+            with open(index.index_filepath, "wb") as f:
+                f.write(content)
+            index = LineIndex(filepath)
+            assert len(index) == ROWS * 2, logger.error("Corrupt index not rebuilt.")
+            assert index.read(ROWS, ROWS + 1)["id"].tolist() == [ROWS]
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_sample.py                                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 07:10:00 pm                                              #
+# Modified   : Saturday October 17th 2026 07:10:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import random
+import inspect
+import pytest
+import logging
+import logging.config
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.utils.sample import sample_from_file, _reservoir
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_sample"
+ROWS = 1000
+# Critical value of the chi-square distribution with 99 degrees of freedom at p = 0.001
+CHI2_CRITICAL = 148.23
+
+
+@pytest.fixture(scope="module")
+def csvfiles():
+    """Writes a CSV file with a header and a copy without, with a 90/10 split of the label."""
+    os.makedirs(FOLDER, exist_ok=True)
+    rows = ["{},{},{}\n".format(i, i * 2, "a" if i % 10 else "b") for i in range(ROWS)]
+    filepaths = {
+        "header": os.path.join(FOLDER, "header.csv"),
+        "noheader": os.path.join(FOLDER, "noheader.csv"),
+    }
+    with open(filepaths["header"], "w") as f:
+        f.write("id,value,label\n")
+        f.writelines(rows)
+    with open(filepaths["noheader"], "w") as f:
+        f.writelines(rows)
+    return filepaths
+
+
+@pytest.mark.sample
+class TestSample:
+    def test_size(self, caplog, csvfiles) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        df = sample_from_file(csvfiles["header"], size=100)
+        assert df.shape == (100, 3), logger.error("Sample size failed.")
+        assert df["id"].is_unique
+        assert df["id"].is_monotonic_increasing, logger.error("Sample not in file order.")
+        assert (df["value"] == df["id"] * 2).all()
+
+        # A sample larger than the file returns the whole file
+        df = sample_from_file(csvfiles["header"], size=ROWS * 2)
+        assert len(df) == ROWS
+
+        # Several files are sampled as one
+        df = sample_from_file([csvfiles["header"], csvfiles["header"]], size=ROWS + 10)
+        assert len(df) == ROWS + 10
+
+        # The same seed returns the same sample
+        a = sample_from_file(csvfiles["header"], size=100, random_state=1)
+        b = sample_from_file(csvfiles["header"], size=100, random_state=1)
+        assert a.equals(b)
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_uniformity(self, caplog) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Every item should be sampled with probability size / n
+        n, size, trials = 100, 10, 5000
+        rng = random.Random(50)
+        counts = [0] * n
+        for _ in range(trials):
+            for item in _reservoir(range(n), size=size, rng=rng):
+                counts[item] += 1
+
+        expected = trials * size / n
+        chi2 = sum((count - expected) ** 2 / expected for count in counts)
+        logger.info("\tChi-square statistic: {}".format(round(chi2, 2)))
+        assert chi2 < CHI2_CRITICAL, logger.error("Reservoir sample is not uniform.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_stratified(self, caplog, csvfiles) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # Each label is represented in proportion to its frequency
+        df = sample_from_file(csvfiles["header"], size=100, label="label")
+        assert len(df) == 100
+        assert (df["label"] == "a").sum() == 90, logger.error("Stratified sample failed.")
+        assert (df["label"] == "b").sum() == 10
+
+        df = sample_from_file(csvfiles["noheader"], size=50, header=False, label=2)
+        assert (df[2] == "a").sum() == 45
+        assert (df[2] == "b").sum() == 5
+
+        # A label name requires a header row, and must be a column
+        with pytest.raises(ValueError):
+            sample_from_file(csvfiles["noheader"], size=50, header=False, label="label")
+        with pytest.raises(ValueError):
+            sample_from_file(csvfiles["header"], size=50, label="none")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_header(self, caplog, csvfiles) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        df = sample_from_file(csvfiles["header"], size=10, header=True)
+        assert list(df.columns) == ["id", "value", "label"], logger.error("Header failed.")
+
+        # Without a header the first line is data, and columns are numbered
+        df = sample_from_file(csvfiles["noheader"], size=ROWS, header=False)
+        assert list(df.columns) == [0, 1, 2], logger.error("No header failed.")
+        assert len(df) == ROWS
+        assert df[0].iloc[0] == 0
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
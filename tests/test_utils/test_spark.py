@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : DeepCTR: Deep Learning for CTR Prediction                                           #
+# Version    : 0.1.0                                                                               #
+# Filename   : /test_spark.py                                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john.james.ai.studio@gmail.com                                                      #
+# URL        : https://github.com/john-james-ai/DeepCTR                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Saturday October 17th 2026 07:50:00 pm                                              #
+# Modified   : Saturday October 17th 2026 07:50:00 pm                                              #
+# ------------------------------------------------------------------------------------------------ #
+# License    : BSD 3-clause "New" or "Revised" License                                             #
+# Copyright  : (c) 2022 John James                                                                 #
+# ================================================================================================ #
+import os
+import inspect
+import pytest
+import logging
+import logging.config
+from types import SimpleNamespace
+import pandas as pd
+import pyarrow.parquet as pq
+
+from deepctr.utils.log_config import LOG_CONFIG
+from deepctr.utils import spark as sparkutils
+from deepctr.utils.spark import get_size_spark, UNKNOWN_SIZE
+from deepctr.data.local import SparkSessionProvider, SparkParquet
+
+# ------------------------------------------------------------------------------------------------ #
+logging.config.dictConfig(LOG_CONFIG)
+logging.getLogger("py4j").setLevel(logging.WARN)
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+FOLDER = "tests/data/test_spark"
+
+
+def plan_with_size(size: int) -> SimpleNamespace:
+    """Stands in for a DataFrame whose optimized plan reports the given size."""
+    stats = SimpleNamespace(sizeInBytes=lambda: SimpleNamespace(toString=lambda: str(size)))
+    plan = SimpleNamespace(stats=lambda: stats)
+    execution = SimpleNamespace(optimizedPlan=lambda: plan)
+    return SimpleNamespace(_jdf=SimpleNamespace(queryExecution=lambda: execution))
+
+
+@pytest.mark.spark
+class TestGetSizeSpark:
+    def test_plan(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        size = get_size_spark(spark_dataframe, method="plan")
+        assert isinstance(size, int) and size > 0, logger.error("Plan size failed.")
+        assert get_size_spark(spark_dataframe, method="auto") == size
+
+        # Spark's placeholder for an unknown size is reported as None
+        assert sparkutils._get_size_plan(plan_with_size(1024)) == 1024
+        assert sparkutils._get_size_plan(plan_with_size(UNKNOWN_SIZE)) is None
+
+        with pytest.raises(ValueError):
+            get_size_spark(spark_dataframe, method="none")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_parquet(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        filepath = os.path.join(FOLDER, "iris.parquet")
+        SparkParquet().write(data=spark_dataframe, filepath=filepath)
+        data = SparkSessionProvider().get_session().read.parquet(filepath)
+
+        expected = 0
+        for filename in os.listdir(filepath):
+            if filename.endswith(".parquet"):
+                metadata = pq.read_metadata(os.path.join(filepath, filename))
+                for i in range(metadata.num_row_groups):
+                    expected += metadata.row_group(i).total_byte_size
+
+        size = get_size_spark(data, method="parquet")
+        assert size == expected, logger.error("Parquet size failed.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_sample(self, caplog, spark_dataframe) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        expected = spark_dataframe.toPandas().memory_usage(deep=True, index=False).sum()
+        size = get_size_spark(spark_dataframe, method="sample", fraction=0.2, seed=50)
+        logger.info("\tSample size: {}. In memory size: {}.".format(size, expected))
+        assert abs(size - expected) / expected < 0.25, logger.error("Sample size failed.")
+
+        # Row sizes are counted as pandas counts them
+        df = pd.DataFrame(
+            {"a": [1, 2, 3], "b": pd.Series(["x", "yy", "zzz"], dtype=object), "c": [0.5, 1.5, 2.5]}
+        )
+        sizes = sparkutils._get_row_sizes(df)
+        assert sizes.sum() == df.memory_usage(deep=True, index=False).sum()
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+    def test_unknown_size(self, caplog, spark_dataframe, monkeypatch) -> None:
+        caplog.set_level(logging.INFO)
+        logger.info("\tStarted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))
+
+        # When the plan has no estimate, auto falls back to sampling and plan raises
+        monkeypatch.setattr(sparkutils, "_get_size_plan", lambda data: None)
+        sampled = []
+        get_size_sample = sparkutils._get_size_sample
+
+        def recorded(data, **kwargs):
+            size = get_size_sample(data, **kwargs)
+            sampled.append(size)
+            return size
+
+        monkeypatch.setattr(sparkutils, "_get_size_sample", recorded)
+        with pytest.raises(ValueError):
+            get_size_spark(spark_dataframe, method="plan")
+        assert not sampled
+
+        size = get_size_spark(spark_dataframe, method="auto", seed=50)
+        assert sampled == [size] and size > 0, logger.error("Unknown size fallback failed.")
+
+        logger.info("\tCompleted {} {}".format(self.__class__.__name__, inspect.stack()[0][3]))